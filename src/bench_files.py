@@ -0,0 +1,105 @@
+#bench_files.py    18Oct2026
+""" Data file reading throughput benchmark
+Writes a synthetic data file plain and in each compressed form,
+then times reading its lines - per line text mode open() against
+meas_files chunked reading (mmap for the plain file) - and parsing
+it into a MeasBatch, checks that every form gives the same lines
+and records, and reports MB/sec (uncompressed) and lines/sec.
+Usage: python bench_files.py [--nline N] [--repeat R] [--dir DIR]
+"""
+import argparse
+import bz2
+import gzip
+import lzma
+import os
+import tempfile
+import time
+
+import numpy as np
+
+from meas_files import open_lines
+from meas_ingest import parse_file_batch
+from meas_gen import make_data_lines
+
+
+def write_files(lines, data_dir):
+    """ Write lines plain and compressed
+    :returns: list of (form, file path)
+    """
+    text = "".join(lines).encode()
+    writes = [("plain", ".data", lambda data: data),
+              ("gzip", ".data.gz", gzip.compress),
+              ("bzip2", ".data.bz2", bz2.compress),
+              ("xz", ".data.xz", lzma.compress)]
+    try:
+        import zstandard
+        writes.append(("zstd", ".data.zst",
+                       zstandard.ZstdCompressor().compress))
+    except ImportError:
+        print("zstandard not installed - zstd form skipped")
+    files = []
+    for form, suffix, compress in writes:
+        file_name = os.path.join(data_dir, "bench" + suffix)
+        with open(file_name, "wb") as fout:
+            fout.write(compress(text))
+        files.append((form, file_name))
+    return files
+
+
+def read_text_lines(file_name):
+    with open(file_name) as finp:
+        return [line.rstrip("\n") for line in finp]
+
+
+def read_chunk_lines(file_name):
+    with open_lines(file_name) as lines:
+        return list(lines)
+
+
+def time_best(fun, file_name, repeat):
+    """ Best of repeat runs
+    :returns: (seconds, result of last run)
+    """
+    best = None
+    for _ in range(repeat):
+        time_start = time.perf_counter()
+        result = fun(file_name)
+        dur = time.perf_counter() - time_start
+        if best is None or dur < best:
+            best = dur
+    return best, result
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--nline', type=int, dest='nline', default=1000000)
+    parser.add_argument('--repeat', type=int, dest='repeat', default=3)
+    parser.add_argument('--dir', dest='dir', default=None,
+                        help="directory for the files default: temporary")
+    args = parser.parse_args()
+    lines = make_data_lines(args.nline)
+    with tempfile.TemporaryDirectory(dir=args.dir) as data_dir:
+        files = write_files(lines, data_dir)
+        plain_name = files[0][1]
+        mbytes = os.path.getsize(plain_name)/1e6
+        print(f"lines: {len(lines)}  size: {mbytes:.1f} MB")
+
+        dur, text_lines = time_best(read_text_lines, plain_name, args.repeat)
+        print(f"{'text open':10} {'':>9} {mbytes/dur:8.1f} MB/sec"
+              f" {len(lines)/dur:12,.0f} lines/sec")
+        _, plain_batch = time_best(parse_file_batch, plain_name, 1)
+        plain_arrays = plain_batch.get_arrays()
+        for form, file_name in files:
+            dur, chunk_lines = time_best(read_chunk_lines, file_name,
+                                         args.repeat)
+            if chunk_lines != text_lines:
+                raise SystemExit(f"{form} lines differ from text open")
+            parse_dur, batch = time_best(parse_file_batch, file_name,
+                                         args.repeat)
+            if not all(np.array_equal(a, b) for a, b in
+                       zip(batch.get_arrays(), plain_arrays)):
+                raise SystemExit(f"{form} records differ from plain")
+            ratio = mbytes*1e6/os.path.getsize(file_name)
+            print(f"{form:10} {ratio:6.1f}:1  {mbytes/dur:8.1f} MB/sec"
+                  f" {len(lines)/dur:12,.0f} lines/sec"
+                  f"   parse: {len(lines)/parse_dur:10,.0f} lines/sec")
@@ -0,0 +1,95 @@
+#bench_import.py    18Oct2026
+""" Import time check for the fast-start statistics entry point
+Runs python -X importtime on measure_stats.py --help (all imports,
+no data) and on each statistics module, then fails if any of
+them loaded a plotting module or took longer than the budget.
+tests/test_import_time.py runs the same checks under pytest, the
+budget only with MEAS_BENCH set.
+Usage: python bench_import.py [--budget_ms MS]
+"""
+import argparse
+import os
+import subprocess
+import sys
+
+stats_modules = ["smeasures", "meas_store", "meas_parser", "meas_ingest",
+                 "meas_cache", "meas_archive", "meas_subjects",
+                 "meas_sqlite"]
+plotting_modules = ("matplotlib", "pylab", "tkinter", "PIL")
+BUDGET_MS = 250.         # Maximum total import time, milliseconds
+
+
+def import_times(args):
+    """ Run python -X importtime with args in this directory
+    :args: python arguments after -X importtime
+    :returns: dict of module: cumulative microseconds for every
+            module imported, nested modules indented
+    """
+    src_dir = os.path.dirname(os.path.abspath(__file__))
+    env = dict(os.environ)
+    env["PYTHONPATH"] = os.pathsep.join(
+        p for p in (src_dir, env.get("PYTHONPATH")) if p)
+    proc = subprocess.run([sys.executable, "-X", "importtime"] + args,
+                          cwd=src_dir, env=env, capture_output=True,
+                          text=True)
+    if proc.returncode != 0:
+        raise SystemExit(f"{' '.join(args)} failed:\n{proc.stderr}")
+    times = {}
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:"):
+            continue
+        fields = line[len("import time:"):].split("|")
+        if len(fields) != 3 or not fields[1].strip().isdigit():
+            continue                # Header
+        times[fields[2][1:].rstrip()] = int(fields[1])   # keeps nesting
+    return times
+
+
+def get_plotting(times):
+    """ Plotting modules imported
+    :times: import_times result
+    :returns: sorted list of module names
+    """
+    return sorted(mod.strip() for mod in times
+                  if mod.strip().split(".")[0] in plotting_modules)
+
+
+def get_total_ms(times):
+    """ Total import time, top level imports, milliseconds
+    :times: import_times result
+    """
+    return sum(us for mod, us in times.items()
+               if not mod.startswith(" "))/1000
+
+
+def check_imports(name, args, budget_ms):
+    """ Check one import run
+    :name: name for report
+    :args: python arguments
+    :budget_ms: maximum total import time, milliseconds
+    :returns: True if within budget and no plotting module loaded
+    """
+    times = import_times(args)
+    plotting = get_plotting(times)
+    total_ms = get_total_ms(times)
+    ok = not plotting and total_ms <= budget_ms
+    print(f"{name:24} {total_ms:8.1f} ms  {len(times):4} modules"
+          f"  {'ok' if ok else 'FAIL'}")
+    if plotting:
+        names = ", ".join(plotting[:5])
+        print(f"    plotting modules: {names}")
+    return ok
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--budget_ms', type=float, dest='budget_ms',
+                        default=BUDGET_MS)
+    args = parser.parse_args()
+    ok = check_imports("measure_stats.py", ["measure_stats.py", "--help"],
+                       args.budget_ms)
+    for module in stats_modules:
+        ok = check_imports(module, ["-c", f"import {module}"],
+                           args.budget_ms) and ok
+    if not ok:
+        raise SystemExit(1)
@@ -0,0 +1,73 @@
+#bench_memory.py    18Oct2026
+""" Measurement memory benchmark
+Reports bytes per measurement, via tracemalloc, for N readings (meas_gen)
+held as:
+    legacy Smeasure  - __dict__ object, own date per reading
+    Smeasure         - slotted, interned mtype, shared dates
+    MeasStore        - Smeasures columnar arrays
+Usage: python bench_memory.py [--nmeas N]
+"""
+import argparse
+from datetime import date
+import gc
+import tracemalloc
+
+from smeasure import Smeasure
+from meas_store import MeasStore
+from meas_legacy import LegacySmeasure
+from meas_gen import make_readings
+
+
+def legacy_records(readings):
+    # Dates and mtype strings built per reading as when parsed
+    return [LegacySmeasure(date=date.fromordinal(ordinal),
+                           mtype="".join(mtype), value=value)
+            for ordinal, mtype, value in readings]
+
+
+def compact_records(readings):
+    dates = {}
+    records = []
+    for ordinal, mtype, value in readings:
+        meas_date = dates.get(ordinal)
+        if meas_date is None:
+            meas_date = dates[ordinal] = date.fromordinal(ordinal)
+        records.append(Smeasure(date=meas_date, mtype="".join(mtype),
+                                value=value, trace=False))
+    return records
+
+
+def store_records(readings):
+    store = MeasStore()
+    for ordinal, mtype, value in readings:
+        store.append(ordinal, mtype, value)
+    return store
+
+
+def bytes_per_meas(make, readings):
+    """ Memory held by make(readings) per reading
+    """
+    gc.collect()
+    tracemalloc.start()
+    held = make(readings)
+    gc.collect()
+    nbyte, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del held
+    return nbyte/len(readings)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--nmeas', type=int, dest='nmeas', default=1000000)
+    args = parser.parse_args()
+    readings = make_readings(args.nmeas)
+    print(f"measurements: {len(readings):,}")
+    legacy = bytes_per_meas(legacy_records, readings)
+    for name, make in (("legacy Smeasure", legacy_records),
+                       ("Smeasure", compact_records),
+                       ("MeasStore", store_records)):
+        nbyte = legacy if make is legacy_records else bytes_per_meas(make,
+                                                                     readings)
+        print(f"{name:16} {nbyte:8.1f} bytes/measurement"
+              f"   {legacy/nbyte:5.1f}x smaller than legacy")
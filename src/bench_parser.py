@@ -0,0 +1,46 @@
+#bench_parser.py    18Oct2026
+""" Parser throughput benchmark
+Times MeasParser.parse_lines against the original per line
+re.match sequence (meas_legacy) on synthetic data file lines
+(meas_gen), checks that both produce the same records, and
+reports lines/sec.
+Usage: python bench_parser.py [--nline N] [--repeat R]
+"""
+import argparse
+import time
+
+from meas_parser import MeasParser
+from meas_legacy import legacy_parse_lines
+from meas_gen import make_data_lines
+
+
+def time_lines_per_sec(fun, lines, repeat):
+    """ Best of repeat runs
+    :returns: (lines/sec, result of last run)
+    """
+    best = None
+    for _ in range(repeat):
+        time_start = time.perf_counter()
+        result = fun(lines)
+        dur = time.perf_counter() - time_start
+        if best is None or dur < best:
+            best = dur
+    return len(lines)/best, result
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--nline', type=int, dest='nline', default=200000)
+    parser.add_argument('--repeat', type=int, dest='repeat', default=3)
+    args = parser.parse_args()
+    lines = make_data_lines(args.nline)
+    legacy_rate, legacy_recs = time_lines_per_sec(legacy_parse_lines,
+                                                  lines, args.repeat)
+    new_rate, new_recs = time_lines_per_sec(
+        lambda lns: list(MeasParser().parse_lines(lns)), lines, args.repeat)
+    if new_recs != legacy_recs:
+        raise SystemExit("MeasParser records differ from legacy parse")
+    print(f"lines: {len(lines)}  records: {len(new_recs)}")
+    print(f"legacy:     {legacy_rate:12,.0f} lines/sec")
+    print(f"MeasParser: {new_rate:12,.0f} lines/sec"
+          f"   speedup: {new_rate/legacy_rate:4.2f}x")
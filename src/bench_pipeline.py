@@ -0,0 +1,204 @@
+#bench_pipeline.py    18Oct2026
+""" Ingest -> stats -> plot pipeline benchmark
+For each size (years x subjects x readings per day) synthetic data
+is written by meas_gen, then each stage is timed (best of repeat)
+over all subjects, each subject in its own Smeasures:
+    ingest      - collect_files, no cache
+    ingest_cached - collect_files, warm MeasCache
+    stats       - list_stats
+    plot        - add_plots, save_plots (Agg), close_plots
+Peak memory (tracemalloc) of each stage is measured in a separate
+traced pass.  Results may be appended to a JSON file and compared
+with the last run in a JSON file, regressions failing the run.
+Usage: python bench_pipeline.py [--sizes 1x1x2,4x1x4] [--repeat R]
+            [--results FILE] [--compare FILE] [--threshold PCT]
+"""
+import argparse
+import contextlib
+import glob
+import io
+import json
+import os
+import platform
+import shutil
+import tempfile
+import time
+import tracemalloc
+
+import matplotlib
+
+from smeasures import Smeasures
+from meas_parser import MeasParser
+from meas_ingest import collect_files
+from meas_cache import MeasCache
+from meas_gen import write_data
+
+stages = ["ingest", "ingest_cached", "stats", "plot"]
+
+
+def get_sizes(sizes_str):
+    """ Parse sizes list e.g. "1x1x2,4x1x4"
+    :returns: list of (years, subjects, readings)
+    """
+    sizes = []
+    for size in sizes_str.split(","):
+        years, subjects, readings = (int(n) for n in size.split("x"))
+        sizes.append((years, subjects, readings))
+    return sizes
+
+
+class PipelineBench:
+    """ Pipeline stages over one generated data set
+    """
+    def __init__(self, work_dir, years, subjects, readings):
+        """ Generate data
+        :work_dir: scratch directory
+        """
+        self.work_dir = work_dir
+        self.subject_dirs = write_data(os.path.join(work_dir, "data"),
+                                       years=years, subjects=subjects,
+                                       readings=readings)
+        self.file_lists = [sorted(glob.glob(os.path.join(subject_dir,
+                                                         "*.data")))
+                           for subject_dir in self.subject_dirs]
+        self.smeases = []
+        self.run_ingest(cache=True)     # Fill cache
+
+    def get_cache(self, i):
+        return MeasCache(os.path.join(self.work_dir, f"cache_{i}"))
+
+    def run_ingest(self, cache=False):
+        self.smeases = []
+        for i, file_names in enumerate(self.file_lists):
+            smeas = Smeasures()
+            smeas.add_std_plot_attrs()
+            collect_files(file_names, smeas, MeasParser(),
+                          cache=self.get_cache(i) if cache else None)
+            self.smeases.append(smeas)
+
+    def run_stage(self, stage):
+        """ Run one stage over all subjects
+        """
+        if stage == "ingest":
+            self.run_ingest()
+        elif stage == "ingest_cached":
+            self.run_ingest(cache=True)
+        elif stage == "stats":
+            with contextlib.redirect_stdout(io.StringIO()):
+                for smeas in self.smeases:
+                    smeas.list_stats()
+        elif stage == "plot":
+            plot_file = os.path.join(self.work_dir, "plot.png")
+            for smeas in self.smeases:
+                smeas.add_plots(date_axis=True)
+                smeas.save_plots(plot_file)
+                smeas.close_plots()
+
+    def get_nmeas(self):
+        return sum(smeas.store.nmeas for smeas in self.smeases)
+
+    def time_stage(self, stage, repeat):
+        """ Best of repeat runs, seconds
+        """
+        best = None
+        for _ in range(repeat):
+            time_start = time.perf_counter()
+            self.run_stage(stage)
+            dur = time.perf_counter() - time_start
+            if best is None or dur < best:
+                best = dur
+        return best
+
+    def peak_stage(self, stage):
+        """ Peak traced memory of stage, bytes
+        """
+        tracemalloc.start()
+        self.run_stage(stage)
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        return peak
+
+
+def run_bench(sizes, repeat=3, memory=True):
+    """ Benchmark sizes
+    :returns: result record
+    """
+    record = {"time": time.strftime("%Y-%m-%d %H:%M:%S"),
+              "python": platform.python_version(),
+              "sizes": {}}
+    for years, subjects, readings in sizes:
+        size_name = f"{years}x{subjects}x{readings}"
+        work_dir = tempfile.mkdtemp(prefix="bench_pipeline_")
+        try:
+            bench = PipelineBench(work_dir, years, subjects, readings)
+            size_result = {"nmeas": bench.get_nmeas()}
+            for stage in stages:
+                stage_result = {"sec": bench.time_stage(stage, repeat)}
+                if memory:
+                    stage_result["peak_mb"] = bench.peak_stage(stage)/1e6
+                size_result[stage] = stage_result
+        finally:
+            shutil.rmtree(work_dir, ignore_errors=True)
+        record["sizes"][size_name] = size_result
+    return record
+
+
+def print_record(record, base=None, threshold=20.):
+    """ Print results, with change from base record if any
+    :returns: True if no stage is slower than base by over threshold %
+    """
+    ok = True
+    for size_name, size_result in record["sizes"].items():
+        print(f"{size_name}  measurements: {size_result['nmeas']:,}")
+        base_result = None
+        if base is not None:
+            base_result = base["sizes"].get(size_name)
+        for stage in stages:
+            stage_result = size_result[stage]
+            line = f"    {stage:14} {stage_result['sec']*1000:10.1f} ms"
+            if "peak_mb" in stage_result:
+                line += f"  {stage_result['peak_mb']:8.1f} MB peak"
+            if base_result is not None and stage in base_result:
+                change = (stage_result['sec']/base_result[stage]['sec']
+                          - 1)*100
+                line += f"  {change:+6.1f}%"
+                if change > threshold:
+                    line += "  REGRESSION"
+                    ok = False
+            print(line)
+    return ok
+
+
+def load_records(file_name):
+    if not os.path.exists(file_name):
+        return []
+    with open(file_name) as finp:
+        return json.load(finp)
+
+
+if __name__ == "__main__":
+    matplotlib.use("Agg")
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--sizes', dest='sizes', default="1x1x2,4x1x4,4x4x4")
+    parser.add_argument('--repeat', type=int, dest='repeat', default=3)
+    parser.add_argument('--no_memory', action='store_true', dest='no_memory')
+    parser.add_argument('--results', dest='results', default=None)
+    parser.add_argument('--compare', dest='compare', default=None)
+    parser.add_argument('--threshold', type=float, dest='threshold',
+                        default=20.)
+    args = parser.parse_args()
+    base = None
+    if args.compare is not None:
+        base_records = load_records(args.compare)
+        if base_records:
+            base = base_records[-1]
+    record = run_bench(get_sizes(args.sizes), repeat=args.repeat,
+                       memory=not args.no_memory)
+    ok = print_record(record, base=base, threshold=args.threshold)
+    if args.results is not None:
+        records = load_records(args.results)
+        records.append(record)
+        with open(args.results, "w") as fout:
+            json.dump(records, fout, indent=1)
+    if not ok:
+        raise SystemExit(1)
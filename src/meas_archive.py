@@ -0,0 +1,89 @@
+#meas_archive.py    18Oct2026
+""" Binary columnar measurement archive
+File layout, little endian:
+    magic       8 bytes  b"SMEASAR1"
+    header_len  uint32   length of header, padded to 8 byte boundary
+    header      JSON     {"nmeas": N, "mtypes": [mtype, ...]}
+                           mtype code is index in mtypes
+    ords        N int32  date ordinals
+    codes       N int16  mtype codes
+    vals        N int16  values
+The columns are opened with numpy.memmap so queries over an archive
+read no text and create no per measurement Python objects.
+"""
+import json
+import struct
+
+import numpy as np
+
+from select_error import SelectError
+
+from meas_store import MeasStore
+
+ARCHIVE_MAGIC = b"SMEASAR1"
+ORD_DTYPE = np.dtype("<i4")
+CODE_DTYPE = np.dtype("<i2")
+VAL_DTYPE = np.dtype("<i2")
+
+
+def write_archive(file_name, store):
+    """ Write measurements to archive file
+    :file_name: archive file path
+    :store: MeasStore
+    """
+    vals = store.vals
+    val_info = np.iinfo(VAL_DTYPE)
+    if len(vals) > 0 and (vals.min() < val_info.min
+                          or vals.max() > val_info.max):
+        raise SelectError(f"Measurement value outside int16 range"
+                          f" can't archive to {file_name}")
+    header = json.dumps({"nmeas" : store.nmeas,
+                         "mtypes" : store.mtype_names}).encode()
+    header += b" " * (-(len(ARCHIVE_MAGIC) + 4 + len(header)) % 8)
+    with open(file_name, "wb") as fout:
+        fout.write(ARCHIVE_MAGIC)
+        fout.write(struct.pack("<I", len(header)))
+        fout.write(header)
+        fout.write(store.ords.astype(ORD_DTYPE).tobytes())
+        fout.write(store.codes.astype(CODE_DTYPE).tobytes())
+        fout.write(vals.astype(VAL_DTYPE).tobytes())
+
+
+def read_archive(file_name):
+    """ Open archive file, columns memory mapped read-only
+    :file_name: archive file path
+    :returns: MeasStore over the mapped columns
+    """
+    return MeasStore.from_arrays(*open_columns(file_name))
+
+
+def is_archive(file_name):
+    """ Check if file is a measurement archive
+    """
+    with open(file_name, "rb") as finp:
+        return finp.read(len(ARCHIVE_MAGIC)) == ARCHIVE_MAGIC
+
+
+def open_columns(file_name):
+    """ Open archive file's columns, memory mapped read-only
+    :file_name: archive file path
+    :returns: (mtype_names, ords, codes, vals)
+    """
+    with open(file_name, "rb") as finp:
+        magic = finp.read(len(ARCHIVE_MAGIC))
+        if magic != ARCHIVE_MAGIC:
+            raise SelectError(f"{file_name} is not a measurement archive")
+        header_len, = struct.unpack("<I", finp.read(4))
+        header = json.loads(finp.read(header_len))
+    nmeas = header["nmeas"]
+    mtype_names = header["mtypes"]
+    offset = len(ARCHIVE_MAGIC) + 4 + header_len
+    columns = []
+    for dtype in (ORD_DTYPE, CODE_DTYPE, VAL_DTYPE):
+        if nmeas == 0:
+            columns.append(np.empty(0, dtype=dtype))
+        else:
+            columns.append(np.memmap(file_name, dtype=dtype, mode="r",
+                                     offset=offset, shape=(nmeas,)))
+        offset += nmeas * dtype.itemsize
+    return (mtype_names, *columns)
@@ -0,0 +1,84 @@
+#meas_cache.py    18Oct2026
+""" Persistent per file parse cache
+Each data file's MeasBatch, before year resolution, is pickled
+under the cache directory, keyed by the file's absolute path.
+An entry is used only if the file's size and modification time
+and the parser and cache versions all match.
+"""
+import hashlib
+import os
+import pickle
+
+from select_trace import SlTrace
+
+from meas_parser import PARSER_VERSION
+
+CACHE_VERSION = 1       # Increment on change to cache entry layout
+
+
+class MeasCache:
+    """ On disk cache of parsed data files
+    """
+    def __init__(self, cache_dir, rebuild=False):
+        """ Setup cache
+        :cache_dir: cache directory, created if needed
+        :rebuild: True -> ignore existing entries, rewrite all
+        """
+        self.cache_dir = cache_dir
+        self.rebuild = rebuild
+        self.nhit = 0
+        self.nmiss = 0
+
+    def entry_path(self, file_name):
+        """ Cache entry path for data file
+        """
+        abs_path = os.path.abspath(file_name)
+        key = hashlib.sha1(abs_path.encode()).hexdigest()[:16]
+        return os.path.join(self.cache_dir,
+                            f"{os.path.basename(file_name)}_{key}.pkl")
+
+    def file_key(self, file_name):
+        """ Fingerprint of file contents and parse versions
+        """
+        st = os.stat(file_name)
+        return (CACHE_VERSION, PARSER_VERSION, os.path.abspath(file_name),
+                st.st_size, st.st_mtime_ns)
+
+    def load(self, file_name, key):
+        """ Get cached batch for file
+        :file_name: data file
+        :key: current file_key(file_name)
+        :returns: MeasBatch, None if not cached or out of date
+        """
+        if self.rebuild:
+            self.nmiss += 1
+            return None
+        entry_path = self.entry_path(file_name)
+        try:
+            with open(entry_path, "rb") as fin:
+                entry_key, batch = pickle.load(fin)
+        except FileNotFoundError:
+            entry_key = batch = None
+        except Exception as e:
+            SlTrace.lg(f"Ignoring bad cache entry {entry_path}: {e}", "cache")
+            entry_key = batch = None
+        if batch is None or entry_key != key:
+            self.nmiss += 1
+            return None
+        SlTrace.lg(f"cache hit: {file_name}", "cache")
+        self.nhit += 1
+        return batch
+
+    def store(self, file_name, key, batch):
+        """ Save batch, not yet year resolved, for file
+        :file_name: data file
+        :key: file_key(file_name) taken before parsing
+        :batch: MeasBatch from parse_file_batch
+        """
+        os.makedirs(self.cache_dir, exist_ok=True)
+        entry_path = self.entry_path(file_name)
+        tmp_path = f"{entry_path}.{os.getpid()}.tmp"   # Unique per writer
+        with open(tmp_path, "wb") as fout:
+            pickle.dump((key, batch), fout,
+                        protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_path, entry_path)
@@ -0,0 +1,56 @@
+#meas_date.py    18Oct2026, moved from Smeasures.set_date
+""" Measurement date conversion
+Shared by Smeasures and the file ingest workers
+Dates are converted to integer ordinals (date.toordinal()) via a
+month prefix table, with an LRU cache of recent (month, day, year)
+strings - data lines are mostly runs of the same few dates.
+"""
+import calendar
+from datetime import date
+from functools import lru_cache
+
+DATE_CACHE_SIZE = 1024      # Recent (month_str, day_str, year_str)
+
+month_abbrs = {}            # lower case abbreviation: month number
+for n in range(12, 0, -1):  # first month wins, as the original scan
+    month_abbrs[calendar.month_abbr[n].lower()] = n
+abbr_lens = sorted(set(len(abbr) for abbr in month_abbrs))
+
+
+def get_date(month_str=None, day_str=None, year_str=None):
+    """ Convert date component strings to date
+    :month_str: month string e.g jan, Jan, January
+    :day_str: day string 1-31
+    :year_str:  year string if < 20 add "2000"
+    :returns: date object
+    """
+    return date.fromordinal(get_ordinal(month_str, day_str, year_str))
+
+
+@lru_cache(maxsize=DATE_CACHE_SIZE)
+def get_ordinal(month_str, day_str, year_str):
+    """ Convert date component strings to date ordinal
+    :month_str: month string e.g jan, Jan, January
+    :day_str: day string 1-31
+    :year_str:  year string if < 20 add "2000"
+    :returns: date ordinal (date.toordinal())
+    """
+    month = get_month(month_str)
+    day = int(day_str)
+    year = int(year_str)
+    if year <= 20:
+        year += 2000
+    return date(year=year, month=month, day=day).toordinal()
+
+
+def get_month(month_str):
+    """ Returns month number 1-12, guess
+    :month_str: month string e.g jan, Jan, January
+    :returns: month number, 0 if not recognized
+    """
+    month = 0
+    for abbr_len in abbr_lens:
+        n = month_abbrs.get(month_str[:abbr_len].lower())
+        if n is not None and (month == 0 or n < month):
+            month = n
+    return month
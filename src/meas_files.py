@@ -0,0 +1,129 @@
+#meas_files.py    18Oct2026
+""" Data file reading - compressed and memory mapped
+Data files may be kept compressed, by suffix:
+    name.data       plain text
+    name.data.gz    gzip
+    name.data.bz2   bzip2
+    name.data.xz    xz / lzma
+    name.data.zst   zstandard (zstandard package, imported when used)
+All are read the same way: a binary stream, decompressed as it is
+read, taken READ_SIZE bytes at a time, each chunk cut after its last
+newline, decoded and split into lines in bulk - no per line I/O.
+Plain files of MMAP_MIN_SIZE or more are read through mmap.
+Line ends are as a text mode open(): \\n, \\r\\n, \\r.
+"""
+import bz2
+import contextlib
+import glob
+import gzip
+import locale
+import lzma
+import mmap
+import os
+
+from select_error import SelectError
+
+READ_SIZE = 1 << 20         # Bytes read, decompressed, split at a time
+MMAP_MIN_SIZE = 1 << 16     # Plain files this size or more are mapped
+
+DATA_SUFFIXES = [".data", ".data.gz", ".data.bz2", ".data.xz", ".data.zst"]
+
+
+def open_zstd(file_name):
+    try:
+        import zstandard
+    except ImportError:
+        raise SelectError(f"Reading {file_name} needs the zstandard"
+                          f" package (pip install zstandard)")
+    return zstandard.open(file_name, "rb")
+
+
+COMPRESSED_OPENS = {".gz": lambda file_name: gzip.open(file_name, "rb"),
+                    ".bz2": lambda file_name: bz2.open(file_name, "rb"),
+                    ".xz": lambda file_name: lzma.open(file_name, "rb"),
+                    ".zst": open_zstd}
+
+
+def glob_data_files(data_dir):
+    """ Get data files, plain or compressed, in name order
+    A file present both plain and compressed (e.g. a.data and
+    a.data.gz) is read once, in the first DATA_SUFFIXES form.
+    :data_dir: directory
+    :returns: list of file paths
+    """
+    files = {}                  # name without suffix: path
+    for suffix in DATA_SUFFIXES:
+        for file_name in glob.glob(os.path.join(data_dir, "*" + suffix)):
+            files.setdefault(file_name[:-len(suffix)], file_name)
+    return sorted(files.values())
+
+
+@contextlib.contextmanager
+def open_binary(file_name):
+    """ Open data file for binary reading, decompressing if compressed
+    :file_name: data file path
+    :returns: context manager giving a readable binary object
+            (file, decompressing file, mmap)
+    """
+    compressed_open = COMPRESSED_OPENS.get(os.path.splitext(file_name)[1])
+    if compressed_open is not None:
+        with compressed_open(file_name) as finp:
+            yield finp
+        return
+
+    with open(file_name, "rb") as finp:
+        if os.fstat(finp.fileno()).st_size < MMAP_MIN_SIZE:
+            yield finp
+            return
+        with mmap.mmap(finp.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            yield mapped
+
+
+def split_lines(text):
+    """ Split text into lines, line ends as a text mode open()
+    :text: text ending in a line end or at end of input
+    :returns: list of lines, without line ends
+    """
+    if "\r" in text:
+        text = text.replace("\r\n", "\n").replace("\r", "\n")
+    lines = text.split("\n")
+    if lines[-1] == "":
+        lines.pop()             # After the last line end
+    return lines
+
+
+def get_lines(finp, encoding=None):
+    """ Read text lines, a chunk at a time
+    :finp: readable binary object
+    :encoding: text encoding default: as open()
+    :returns: generator of lines, without line ends
+    """
+    if encoding is None:
+        encoding = locale.getpreferredencoding(False)
+    rest = []                   # Chunks since the last b"\n"
+    while True:
+        chunk = finp.read(READ_SIZE)
+        if not chunk:
+            break
+        iend = chunk.rfind(b"\n") + 1
+        if iend == 0:
+            rest.append(chunk)
+            continue
+        rest.append(chunk[:iend])
+        text = b"".join(rest).decode(encoding)
+        rest = [chunk[iend:]]
+        yield from split_lines(text)
+    text = b"".join(rest).decode(encoding)
+    if text:
+        yield from split_lines(text)
+
+
+@contextlib.contextmanager
+def open_lines(file_name, encoding=None):
+    """ Open data file, plain or compressed, for reading lines
+    :file_name: data file path
+    :encoding: text encoding default: as open()
+    :returns: context manager giving an iterator of lines
+    """
+    with open_binary(file_name) as finp:
+        yield get_lines(finp, encoding=encoding)
@@ -0,0 +1,131 @@
+#meas_follow.py    18Oct2026
+""" Follow data files, adding measurements from appended lines
+and, given a data file pattern, from new data files as they appear.
+Only the plain files listed, and new files matching the pattern,
+are read - never other data files in the same directory.
+Only bytes past each file's last read position are parsed.
+Parse state (year, month, day) at that position is rebuilt, once,
+the first time a file loaded by collect_files grows, from the year
+in effect at the start of the file.  New files start with the year
+in effect at the end of the most recent file.
+"""
+import glob
+import io
+import locale
+import os
+
+from meas_parser import MeasParser
+from meas_files import COMPRESSED_OPENS
+
+
+class FollowFile:
+    """ Read position and parse state within one data file
+    """
+    def __init__(self, file_name, offset, meas_parser=None):
+        """ Setup file
+        :file_name: data file
+        :offset: bytes already consumed
+        :meas_parser: MeasParser with state at offset
+                    default: rebuilt on first growth
+        """
+        self.file_name = file_name
+        self.offset = offset
+        self.meas_parser = meas_parser
+
+
+class MeasFollower:
+    """ Poll data files for new measurements
+    """
+    def __init__(self, file_names, meas, meas_parser, data_pattern=None):
+        """ Setup follower, before the files' initial load, via
+        collect_files(..., file_years=self.file_years)
+        :file_names: data files followed
+        :meas: Smeasures receiving new measurements
+        :meas_parser: MeasParser of the initial load, its year_str is
+                    carried into new files
+        :data_pattern: glob pattern of new data files to follow too
+                    e.g. data_dir/*.data default: file_names only
+        """
+        self.data_pattern = data_pattern
+        self.meas = meas
+        self.meas_parser = meas_parser
+        self.file_years = {}        # filled by collect_files
+        self.files = {}             # abs path: FollowFile
+        self.encoding = locale.getpreferredencoding(False)  # as open()
+        self.add_files(file_names)
+
+    def add_files(self, file_names):
+        """ Record files before their initial load, via
+        collect_files(..., file_years=self.file_years)
+        :file_names: data files
+        """
+        for file_name in file_names:
+            if os.path.splitext(file_name)[1] in COMPRESSED_OPENS:
+                continue            # Compressed files aren't appended to
+            self.files[os.path.abspath(file_name)] = FollowFile(
+                file_name, os.path.getsize(file_name))
+
+    def poll(self):
+        """ Add measurements from lines appended to data files
+        and from new data files
+        :returns: number of measurements added
+        """
+        nmeas = self.meas.store.nmeas
+        file_names = [follow_file.file_name
+                      for follow_file in self.files.values()]
+        if self.data_pattern is not None:
+            file_names += [file_name for file_name
+                           in sorted(glob.glob(self.data_pattern))
+                           if os.path.abspath(file_name) not in self.files]
+        for file_name in file_names:
+            key = os.path.abspath(file_name)
+            try:
+                size = os.path.getsize(file_name)
+            except OSError:
+                continue            # Removed
+            follow_file = self.files.get(key)
+            if follow_file is None:
+                meas_parser = MeasParser(year_str=self.meas_parser.year_str,
+                                     list_input=self.meas_parser.list_input)
+                follow_file = self.files[key] = FollowFile(file_name, 0,
+                                                           meas_parser)
+                self.read_new(follow_file)
+                self.meas_parser.year_str = meas_parser.year_str
+            elif size > follow_file.offset:
+                self.read_new(follow_file)
+        return self.meas.store.nmeas - nmeas
+
+    def read_new(self, follow_file):
+        """ Parse complete lines past the file's read position
+        :follow_file: FollowFile
+        """
+        if follow_file.meas_parser is None:
+            follow_file.meas_parser = self.get_file_state(follow_file)
+        with open(follow_file.file_name, "rb") as finp:
+            finp.seek(follow_file.offset)
+            data = finp.read()
+        iend = data.rfind(b"\n") + 1
+        if iend == 0:
+            return                  # No complete line yet
+
+        follow_file.offset += iend
+        lines = io.StringIO(data[:iend].decode(self.encoding), newline=None)
+        base_name = os.path.basename(follow_file.file_name)
+        follow_file.meas_parser.collect_lines(lines, self.meas,
+                                              base_name=base_name)
+
+    def get_file_state(self, follow_file):
+        """ Rebuild parse state at the file's read position
+        :follow_file: FollowFile
+        :returns: MeasParser with state at follow_file.offset
+        """
+        year_str = self.file_years.get(follow_file.file_name,
+                                       self.meas_parser.year_str)
+        meas_parser = MeasParser(year_str=year_str)
+        with open(follow_file.file_name, "rb") as finp:
+            data = finp.read(follow_file.offset)
+        lines = io.StringIO(data.decode(self.encoding), newline=None)
+        for _ in meas_parser.parse_lines(lines):
+            pass
+        meas_parser.list_input = self.meas_parser.list_input
+        return meas_parser
@@ -0,0 +1,198 @@
+#meas_gen.py    18Oct2026
+""" Synthetic measurement data generator
+Writes realistic .data files, in every documented line form:
+    year lines, "dd Mon" / "ddmon" / "Month d, yyyy" dates,
+    sugar morning/evening pairs with ? and night,
+    blood pressure "hi/low Pulse: pl" and "hi/low/pl", comments
+at a configurable scale: years x subjects x readings per day.
+Values drift slowly about per subject baselines so plots, rolling
+aggregates and out of range counts look like real data.
+Note: the parser's day month head pattern takes the leading digits
+of a blood pressure line as a date, so those lines currently add
+no measurements; they are generated for realistic parse load.
+Layout: data_dir/subject_NN/meas_YYYY.data
+Also the lines or readings themselves, for benchmarks and tests:
+    make_data_lines     about N lines, whole years of one subject
+    make_readings       N (date ordinal, mtype, value) readings
+Usage: python meas_gen.py --data_dir DIR [--years Y] [--subjects S]
+                          [--readings R] [--start_year YYYY] [--seed N]
+"""
+import argparse
+from collections import Counter
+from datetime import date, timedelta
+import os
+import random
+
+LINE_FORMS = ["dd Mon", "ddmon", "hi/low Pulse: pl", "hi/low/pl"]
+
+month_names = ["January", "February", "March", "April", "May", "June", "July",
+               "August", "September", "October", "November", "December"]
+
+
+class Drift:
+    """ Value drifting about a baseline, mean reverting
+    """
+    def __init__(self, rand, base, spread, low, high):
+        self.rand = rand
+        self.base = base
+        self.spread = spread
+        self.low = low
+        self.high = high
+        self.level = base
+
+    def next(self):
+        self.level += (self.base - self.level)*.05 \
+                        + self.rand.gauss(0, self.spread*.2)
+        value = round(self.level + self.rand.gauss(0, self.spread))
+        return min(max(value, self.low), self.high)
+
+
+def make_year_lines(year, readings, rand, drifts, counts=None):
+    """ Generate one year of data file lines for one subject
+    :year: year
+    :readings: data lines per day
+    :rand: random.Random
+    :drifts: dict of mtype: Drift
+    :counts: Counter receiving (line form, "lines"): lines written
+                and (line form, mtype): values written, not ?
+                default: not counted
+    :returns: list of lines (newline terminated)
+    """
+    if counts is None:
+        counts = Counter()
+    lines = [f"# Measurements {year}\n", f"{year}\n"]
+    day = date(year, 1, 1)
+    while day.year == year:
+        mth = month_names[day.month-1]
+        if day.day == 1:
+            lines.append(f"\n# {mth}\n")
+        for _ in range(readings):
+            if rand.random() < .7:
+                sg_m = drifts["sg_m"].next()
+                sg_e = drifts["sg_e"].next()
+                gap = rand.random()
+                if gap < .03:
+                    sg_m = rand.choice(["?", "night"])
+                elif gap < .06:
+                    sg_e = "?"
+                if rand.random() < .5:
+                    form = "dd Mon"
+                    date_str = f"{day.day:02} {mth[:3]}"
+                else:
+                    form = "ddmon"
+                    date_str = f"{day.day}{mth[:3].lower()}"
+                note = "   # after walk" if rand.random() < .05 else ""
+                lines.append(f"{date_str} {sg_m} {sg_e}{note}\n")
+                counts[form, "lines"] += 1
+                counts[form, "sg_m"] += type(sg_m) is int
+                counts[form, "sg_e"] += type(sg_e) is int
+            else:
+                bp_hi = drifts["bp_hi"].next()
+                bp_low = min(drifts["bp_low"].next(), bp_hi - 10)
+                pl = drifts["pl"].next()
+                lines.append(f"{mth} {day.day}, {year}\n")
+                if rand.random() < .5:
+                    form = "hi/low Pulse: pl"
+                    lines.append(f"{bp_hi}/{bp_low} Pulse: {pl}\n")
+                else:
+                    form = "hi/low/pl"
+                    lines.append(f"{bp_hi}/{bp_low}/{pl}\n")
+                counts[form, "lines"] += 1
+                for mtype in ("bp_hi", "bp_low", "pl"):
+                    counts[form, mtype] += 1
+        day += timedelta(days=1)
+    return lines
+
+
+def make_drifts(rand):
+    """ Per subject value baselines
+    """
+    return {"sg_m": Drift(rand, rand.randint(90, 130), 15, 40, 400),
+            "sg_e": Drift(rand, rand.randint(110, 160), 25, 40, 500),
+            "bp_hi": Drift(rand, rand.randint(115, 150), 10, 80, 220),
+            "bp_low": Drift(rand, rand.randint(70, 95), 7, 40, 140),
+            "pl": Drift(rand, rand.randint(60, 85), 8, 35, 160)}
+
+
+def make_data_lines(nline, readings=2, start_year=2015, seed=1):
+    """ Generate about nline data file lines, whole years of one
+    subject, as in its data files
+    :nline: minimum number of lines
+    :readings: data lines per day
+    :start_year: first year
+    :seed: random seed
+    :returns: list of lines (newline terminated)
+    """
+    rand = random.Random(seed*1000)
+    drifts = make_drifts(rand)
+    lines = []
+    year = start_year
+    while len(lines) < nline:
+        lines.extend(make_year_lines(year, readings, rand, drifts))
+        year += 1
+    return lines
+
+
+def make_readings(nmeas, start_year=2015, seed=1):
+    """ Generate readings, one of each mtype per day
+    :nmeas: number of readings
+    :start_year: year of the first day
+    :seed: random seed
+    :returns: list of (date ordinal, mtype, value)
+    """
+    rand = random.Random(seed*1000)
+    drifts = make_drifts(rand)
+    mtypes = list(drifts)
+    ord0 = date(start_year, 1, 1).toordinal()
+    readings = []
+    for i in range(nmeas):
+        mtype = mtypes[i%len(mtypes)]
+        readings.append((ord0 + i//len(mtypes), mtype, drifts[mtype].next()))
+    return readings
+
+
+def write_data(data_dir, years=1, subjects=1, readings=2,
+               start_year=2015, seed=1, counts=None):
+    """ Write synthetic data files
+    :data_dir: output directory, created if needed
+    :years: years of data per subject
+    :subjects: number of subjects
+    :readings: data lines per day
+    :start_year: first year
+    :seed: random seed
+    :counts: Counter receiving line form counts, as make_year_lines
+                default: not counted
+    :returns: list of subject directories
+    """
+    subject_dirs = []
+    for subject in range(subjects):
+        rand = random.Random(seed*1000 + subject)
+        drifts = make_drifts(rand)
+        subject_dir = os.path.join(data_dir, f"subject_{subject+1:02}")
+        os.makedirs(subject_dir, exist_ok=True)
+        for year in range(start_year, start_year+years):
+            lines = make_year_lines(year, readings, rand, drifts,
+                                    counts=counts)
+            with open(os.path.join(subject_dir, f"meas_{year}.data"),
+                      "w") as fout:
+                fout.writelines(lines)
+        subject_dirs.append(subject_dir)
+    return subject_dirs
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--data_dir', dest='data_dir', required=True)
+    parser.add_argument('--years', type=int, dest='years', default=1)
+    parser.add_argument('--subjects', type=int, dest='subjects', default=1)
+    parser.add_argument('--readings', type=int, dest='readings', default=2)
+    parser.add_argument('--start_year', type=int, dest='start_year',
+                        default=2015)
+    parser.add_argument('--seed', type=int, dest='seed', default=1)
+    args = parser.parse_args()
+    for subject_dir in write_data(args.data_dir, years=args.years,
+                                  subjects=args.subjects,
+                                  readings=args.readings,
+                                  start_year=args.start_year,
+                                  seed=args.seed):
+        print(subject_dir)
@@ -0,0 +1,239 @@
+#meas_ingest.py    18Oct2026
+""" Multi-file measurement ingestion
+Files may be parsed serially, or in parallel worker processes
+each returning a compact MeasBatch of (date ordinal, mtype, value)
+records.  Batches are merged in file order so the result matches
+the serial run exactly.
+
+Year carry-over: a file's records before its first year line use
+the year in effect at the end of the previous file.  A worker
+cannot know that year, so it leaves those leading records pending
+(month, day strings) and the merge resolves them, in file order,
+before adding the batch.
+
+With a MeasCache, unchanged files load their batch from the cache
+and only new or modified files are parsed.
+"""
+from array import array
+from concurrent.futures import ProcessPoolExecutor
+import time
+
+import numpy as np
+
+from select_error import SelectError
+
+from meas_parser import MeasParser
+from meas_date import get_ordinal
+from meas_store import get_data_columns
+import meas_profile
+
+YEAR_INHERITED = ""     # Worker year_str until the file sets a year
+
+data_mtypes = {"sg" : ["sg_m", "sg_e"],             # Smeasures.sg_mtypes
+               "bp" : ["bp_hi", "bp_low", "pl"]}    # Smeasures.bp_mtypes
+
+
+class MeasBatch:
+    """ Compact block of parsed measurements from one file
+    """
+    def __init__(self, file_name=None):
+        self.file_name = file_name
+        self.mtype_names = []       # local code -> mtype
+        self.mtype_codes = {}       # mtype -> local code
+        self.ords = array('i')      # date ordinals
+        self.codes = array('h')     # local mtype codes
+        self.vals = array('i')      # values
+        self.pending = []           # (data_type, datas, month_str, day_str)
+                                    # awaiting inherited year
+        self.end_year_str = None    # year at end of file, None - never set
+        self.parse_seconds = 0.     # Parse time, lines - for profiling
+        self.nline = 0
+
+    def add_datas(self, data_type, datas, month_str, day_str, year_str):
+        """ Add data line measurements, same arguments as
+        Smeasures.add_datas
+        """
+        if year_str == YEAR_INHERITED:
+            self.pending.append((data_type, datas, month_str, day_str))
+            return
+
+        self.add_dated(data_type, datas,
+                       get_ordinal(month_str, day_str, year_str))
+
+    def add_columns(self, data_type, ordinals, datas):
+        """ Add a block of data lines, same arguments as
+        Smeasures.add_columns
+        """
+        mtypes = data_mtypes.get(data_type)
+        if mtypes is None:
+            raise SelectError(f"Unrecognized data type:{data_type}")
+        mtype_names, ords, codes, vals = get_data_columns(mtypes, ordinals,
+                                                          datas)
+        code_map = []
+        for mtype in mtype_names:
+            code = self.mtype_codes.get(mtype)
+            if code is None:
+                code = self.mtype_codes[mtype] = len(self.mtype_names)
+                self.mtype_names.append(mtype)
+            code_map.append(code)
+        self.ords.frombytes(ords.astype(np.int32).tobytes())
+        self.codes.frombytes(np.array(code_map, dtype=np.int16)[codes]
+                             .tobytes())
+        self.vals.frombytes(vals.astype(np.int32).tobytes())
+
+    def add_dated(self, data_type, datas, ordinal):
+        """ Add data line values for a known date
+        :data_type: "sg", "bp"
+        :datas: list of value strings ? - no data
+        :ordinal: date ordinal
+        """
+        mtypes = data_mtypes.get(data_type)
+        if mtypes is None:
+            raise SelectError(f"Unrecognized data type:{data_type}")
+        for i,data in enumerate(datas):
+            if data == "?":
+                continue            # No data
+            mtype = mtypes[i]
+            code = self.mtype_codes.get(mtype)
+            if code is None:
+                code = self.mtype_codes[mtype] = len(self.mtype_names)
+                self.mtype_names.append(mtype)
+            self.ords.append(ordinal)
+            self.codes.append(code)
+            self.vals.append(int(data))
+
+    def resolve_year(self, year_str):
+        """ Resolve pending records with the inherited year
+        Pending records precede all others in the file so they
+        are placed at the front.
+        :year_str: year in effect at the end of the previous file
+        :returns: year in effect at the end of this file
+        """
+        if self.pending:
+            pending, self.pending = self.pending, []
+            ords, codes, vals = self.ords, self.codes, self.vals
+            self.ords, self.codes, self.vals = array('i'), array('h'), array('i')
+            for data_type, datas, month_str, day_str in pending:
+                self.add_datas(data_type, datas, month_str, day_str, year_str)
+            self.ords.extend(ords)
+            self.codes.extend(codes)
+            self.vals.extend(vals)
+        if self.end_year_str is None:
+            return year_str
+        return self.end_year_str
+
+    def get_arrays(self):
+        """ Get (ords, local codes, vals) numpy arrays
+        """
+        return (np.frombuffer(self.ords, dtype=np.int32),
+                np.frombuffer(self.codes, dtype=np.int16),
+                np.frombuffer(self.vals, dtype=np.int32))
+
+    def __len__(self):
+        return len(self.ords)
+
+
+def parse_file_batch(file_name, list_input=False):
+    """ Parse one file into a MeasBatch - worker process entry
+    :file_name: data file path
+    :list_input: True -> list each input line
+    :returns: MeasBatch with year not yet resolved
+    """
+    meas_parser = MeasParser(year_str=YEAR_INHERITED, list_input=list_input)
+    batch = MeasBatch(file_name)
+    time_start = time.perf_counter()
+    meas_parser.collect_file(file_name, batch)
+    batch.parse_seconds = time.perf_counter() - time_start
+    batch.nline = meas_parser.nline
+    if meas_parser.year_str != YEAR_INHERITED:
+        batch.end_year_str = meas_parser.year_str
+    return batch
+
+
+def collect_files(file_names, meas, meas_parser, jobs=1, cache=None,
+                  file_years=None):
+    """ Collect files, in order, into measures
+    :file_names: list of data file paths
+    :meas: measurement data base (Smeasures)
+    :meas_parser: MeasParser supplying and receiving the carried year
+    :jobs: number of worker processes, 1 - parse serially in process
+    :cache: MeasCache of parsed files default: no caching
+    :file_years: dict to receive file_name: year_str in effect at
+                the start of each file default: not recorded
+    Files already held by a persistent store (meas.get_resume)
+    are skipped.
+    """
+    with meas_profile.phase("ingest", len(file_names)):
+        nstored, year_str = meas.get_resume(file_names, file_years=file_years)
+        if nstored > 0:
+            file_names = file_names[nstored:]
+            meas_parser.year_str = year_str
+        if cache is None and (jobs <= 1 or len(file_names) <= 1):
+            for file_name in file_names:
+                if file_years is not None:
+                    file_years[file_name] = meas_parser.year_str
+                meas.set_file(file_name, meas_parser.year_str)
+                if meas_profile.profile is None:
+                    meas_parser.collect_file(file_name, meas)
+                    continue
+                time_start = time.perf_counter()
+                meas_parser.collect_file(file_name, meas)
+                meas_profile.profile.add_file(file_name,
+                                              time.perf_counter() - time_start,
+                                              meas_parser.nline)
+            meas.set_file(None, meas_parser.year_str)
+            return
+
+        batches = [None]*len(file_names)
+        keys = [None]*len(file_names)
+        if cache is not None:
+            with meas_profile.phase("cache_load"):
+                for i, file_name in enumerate(file_names):
+                    keys[i] = cache.file_key(file_name)
+                    batches[i] = cache.load(file_name, keys[i])
+        to_parse = [file_names[i] for i in range(len(file_names))
+                        if batches[i] is None]
+        list_inputs = [meas_parser.list_input]*len(to_parse)
+        if jobs <= 1 or len(to_parse) <= 1:
+            merge_batches(file_names, batches,
+                          map(parse_file_batch, to_parse, list_inputs),
+                          meas, meas_parser, cache=cache, keys=keys,
+                          file_years=file_years)
+            return
+
+        with ProcessPoolExecutor(max_workers=jobs) as pool:
+            merge_batches(file_names, batches,
+                          pool.map(parse_file_batch, to_parse, list_inputs),
+                          meas, meas_parser, cache=cache, keys=keys,
+                          file_years=file_years)
+
+
+def merge_batches(file_names, batches, parsed, meas, meas_parser,
+                  cache=None, keys=None, file_years=None):
+    """ Merge batches, in file order, into measures
+    :file_names: list of data file paths
+    :batches: cached batch per file, None - take next from parsed
+    :parsed: iterator of newly parsed batches, in file order
+    :meas: measurement data base (Smeasures)
+    :meas_parser: MeasParser supplying and receiving the carried year
+    :cache: MeasCache to store newly parsed batches default: none
+    :keys: cache key per file
+    :file_years: dict to receive year_str at the start of each file
+    """
+    for i, file_name in enumerate(file_names):
+        batch = batches[i]
+        if batch is None:
+            batch = next(parsed)
+            if meas_profile.profile is not None:
+                meas_profile.profile.add_file(file_name, batch.parse_seconds,
+                                              batch.nline)
+            if cache is not None:
+                cache.store(file_name, keys[i], batch)
+        if file_years is not None:
+            file_years[file_name] = meas_parser.year_str
+        meas.set_file(file_name, meas_parser.year_str)
+        with meas_profile.phase("merge", len(batch)):
+            meas_parser.year_str = batch.resolve_year(meas_parser.year_str)
+            meas.add_batch(batch)
+        batches[i] = None           # Release as merged
+    meas.set_file(None, meas_parser.year_str)
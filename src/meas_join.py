@@ -0,0 +1,84 @@
+#meas_join.py    18Oct2026
+""" Date aligned joins of measurement types
+Related series (sg_m/sg_e, bp_hi/bp_low/pl) are separate mtypes.
+For cross series questions each mtype is reduced to one value per
+day - the day mean, from the store's day aggregates - and the
+date sorted day arrays are aligned by date (searchsorted) into a
+wide table: one row per day, one column per mtype, NaN where an
+mtype has no reading that day.  No per reading scans or objects.
+Derived series are vectorized functions of joined columns, named
+like mtypes so they may be listed, correlated and plotted:
+    sg_delta    sg_e - sg_m                 evening rise
+    bp_pp       bp_hi - bp_low              pulse pressure
+    bp_map      bp_low + (bp_hi - bp_low)/3 mean arterial pressure
+"""
+from functools import reduce
+import math
+
+import numpy as np
+
+from select_error import SelectError
+
+# Derived series: name: (input mtypes, function of their day columns)
+DERIVED_SERIES = {
+    "sg_delta": (["sg_m", "sg_e"], lambda sg_m, sg_e: sg_e - sg_m),
+    "bp_pp": (["bp_hi", "bp_low"], lambda bp_hi, bp_low: bp_hi - bp_low),
+    "bp_map": (["bp_hi", "bp_low"],
+               lambda bp_hi, bp_low: bp_low + (bp_hi - bp_low)/3),
+}
+
+JOIN_HOWS = ("inner", "outer")
+
+
+def join_days(day_series, how="inner"):
+    """ Align day series by date
+    :day_series: list of (day ordinals - ascending, distinct, values)
+    :how: "inner" - days in every series, "outer" - days in any
+    :returns: (day ordinals, table) table[:, i] - series i values,
+            NaN where series i has no value that day
+    """
+    if how not in JOIN_HOWS:
+        raise SelectError(f"Unrecognized join: {how}"
+                          f" expected one of {', '.join(JOIN_HOWS)}")
+    if len(day_series) == 0:
+        return np.empty(0, dtype=np.int64), np.empty((0, 0))
+
+    series_days = [np.asarray(days, dtype=np.int64) for days, _ in day_series]
+    if how == "inner":
+        days = reduce(lambda a, b: np.intersect1d(a, b, assume_unique=True),
+                      series_days)
+    else:
+        days = reduce(np.union1d, series_days)
+    table = np.full((len(days), len(day_series)), np.nan)
+    for i, (sdays, (_, vals)) in enumerate(zip(series_days, day_series)):
+        if len(sdays) == 0:
+            continue
+        idx = np.minimum(np.searchsorted(sdays, days), len(sdays)-1)
+        hit = sdays[idx] == days
+        table[hit, i] = np.asarray(vals)[idx[hit]]
+    return days, table
+
+
+def correlate(x, y):
+    """ Correlation of two joined columns, days with both values
+    :x, y: equal length arrays, NaN - no value
+    :returns: (number of days, Pearson r, slope, intercept of the
+            least squares line y = slope*x + intercept)
+            r, slope, intercept NaN if undefined
+    """
+    both = ~(np.isnan(x) | np.isnan(y))
+    x = x[both]
+    y = y[both]
+    n = len(x)
+    if n < 2:
+        return n, math.nan, math.nan, math.nan
+
+    dx = x - x.mean()
+    dy = y - y.mean()
+    sxx = float((dx*dx).sum())
+    syy = float((dy*dy).sum())
+    sxy = float((dx*dy).sum())
+    r = sxy/math.sqrt(sxx*syy) if sxx > 0 and syy > 0 else math.nan
+    slope = sxy/sxx if sxx > 0 else math.nan
+    intercept = float(y.mean()) - slope*float(x.mean())
+    return n, r, slope, intercept
@@ -0,0 +1,70 @@
+#meas_legacy.py    18Oct2026
+""" Original implementations, kept as references
+Benchmarks time the current code against them and tests check the
+current code gives the same results:
+    legacy_parse_lines  original collect_file per line re.match
+                        sequence (bench_parser, tests/test_parser.py)
+    LegacySmeasure      original Smeasure layout (bench_memory)
+"""
+import re
+
+
+def legacy_parse_lines(lines, year_str="2020"):
+    """ Original collect_file line handling, for comparison
+    :returns: list of (data_type, datas, month_str, day_str, year_str)
+    """
+    records = []
+    for line in lines:
+        line = line.rstrip()
+        res = re.match(r"^(.*)#", line)
+        if res:
+            line = res.group(1)
+        res = re.match(r"^(.*)\s+$", line)
+        if res:
+            line = res.group(1)
+        res = re.match(r"^\s+(.*)$", line)
+        if res:
+            line = res.group(1)
+        res = re.match(r"^\s*$", line)
+        if res:
+            continue
+        res = re.match(r"^(\d+)$", line)
+        if res:
+            year_str = res.group(1)
+            continue
+        res = re.match(r"^(\d+)\s*(\w+)", line)
+        if res:
+            month_str = res.group(2)
+            day_str = res.group(1)
+            line = line[len(res.group(0)):]
+        else:
+            res = re.match(r"^(\w+)\s+(\d+)\s*,\s*(\d+)\s*$", line)
+            if res:
+                month_str = res.group(1)
+                day_str = res.group(2)
+                year_str = res.group(3)
+                line = line[len(res.group(0)):]
+        res = re.match(r"^\s*(\?|night|\d+)\s+(\?|\d+)", line)
+        if res:
+            sg_m_str = res.group(1)
+            if sg_m_str == "night":
+                sg_m_str = "?"
+            records.append(("sg", [sg_m_str, res.group(2)],
+                            month_str, day_str, year_str))
+            continue
+        line = re.sub(r"\s*;?\s*Pulse:?\s*", "/", line, flags=re.I)
+        res = re.match(r"^(\?|\d+)/(\?|\d+)/(\?|\d+)", line)
+        if res:
+            records.append(("bp", [res.group(1), res.group(2), res.group(3)],
+                            month_str, day_str, year_str))
+    return records
+
+
+
+class LegacySmeasure:
+    """ Original Smeasure layout, without its trace call
+    """
+    def __init__(self, date=None, mtype=None, value=None):
+        self.date = date
+        self.mtype = mtype
+        self.value = value
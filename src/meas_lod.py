@@ -0,0 +1,48 @@
+#meas_lod.py    18Oct2026
+""" Level of detail reduction for scatter plotting
+The plotted area is divided into a grid of cells, a few pixels
+square, and one point is kept per occupied cell.  The drawn plot is
+unchanged at that resolution, including every extreme, while the
+number of points drawn is bounded by the number of cells, not the
+number of measurements.
+(Min/max per x bucket, the usual line plot reduction, would hide all
+but the top and bottom points of each column of a scatter plot.)
+"""
+import numpy as np
+
+
+def grid_downsample(x, y, nx, ny, x_low=None, x_high=None,
+                    y_low=None, y_high=None):
+    """ Select one point per occupied grid cell
+    :x: x values (numeric)
+    :y: y values
+    :nx, ny: number of grid columns, rows
+    :x_low, x_high: gridded x range default: range of x
+    :y_low, y_high: gridded y range default: range of y
+    :returns: sorted index array of selected points
+    """
+    npoint = len(x)
+    if npoint <= nx:
+        return np.arange(npoint)    # Too few to be worth reducing
+
+    col = get_cells(x, nx, x_low, x_high)
+    row = get_cells(y, ny, y_low, y_high)
+    _, keep = np.unique(col*ny + row, return_index=True)
+    keep.sort()
+    return keep
+
+
+def get_cells(vals, ncell, v_low=None, v_high=None):
+    """ Get cell number 0..ncell-1 of each value
+    """
+    vals = np.asarray(vals, dtype=np.float64)
+    if v_low is None:
+        v_low = vals.min()
+    if v_high is None:
+        v_high = vals.max()
+    span = v_high - v_low
+    if span <= 0:
+        return np.zeros(len(vals), dtype=np.int64)
+    cells = ((vals - v_low)*(ncell/span)).astype(np.int64)
+    np.clip(cells, 0, ncell-1, out=cells)
+    return cells
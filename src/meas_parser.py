@@ -0,0 +1,175 @@
+#meas_parser.py    18Oct2026, moved from measure_plotting.py collect_file
+r""" Measurement data file parser
+Data file format:
+    Comment: # to end of line
+    Year: ^\s*\d\d\d\d
+    Date: ^\s*(\w+)\s+(\d+),?\s+(\d+) ==> month, day,  year
+          ^\s*(\d+)\s*([a-z]\w+)  => day, mth
+    sugar data: (\?|\d+)\s+(\?|\d+)
+    blood pessure, pulse: (\d+)/(\d+)/(\d+)
+            With preprocessing: \s*;?\s*Pulse:?\s* ==> /
+
+Each line is cleaned with string operations then classified by
+two precompiled alternations, one for the line head (year or date)
+and one for the data (sugar or bp), instead of trying each
+pattern in turn.
+collect_file adds the parsed lines a block at a time (add_columns)
+rather than line by line.
+"""
+import os
+import re
+
+from select_trace import SlTrace
+from select_error import SelectError
+
+from meas_date import get_ordinal
+from meas_files import open_lines
+
+PARSER_VERSION = 1      # Increment on any change to parsed results
+                        # invalidates MeasCache entries
+
+# Line head, alternatives in the order they were tried:
+#   year alone, dd mmm (or ddmmm) prefix, "July 4, 1776"
+head_pat = re.compile(r"(?P<year>\d+)$"
+                      r"|(?P<day>\d+)\s*(?P<month>\w+)"
+                      r"|(?P<month2>\w+)\s+(?P<day2>\d+)\s*,\s*(?P<year2>\d+)\s*$")
+# Line data: sugar morning evening, bp high/low/pulse
+data_pat = re.compile(r"\s*(?P<sg_m>\?|night|\d+)\s+(?P<sg_e>\?|\d+)"
+                      r"|(?P<bp_hi>\?|\d+)/(?P<bp_lo>\?|\d+)/(?P<pl>\?|\d+)")
+pulse_pat = re.compile(r"\s*;?\s*Pulse:?\s*", re.I)
+BLOCK_LINES = 4096      # Data lines per collect_file add_columns
+
+
+class MeasParser:
+    """ Measurement data file parser
+    The year carries over from line to line and from file to file,
+    the day and month carry over from line to line within a file.
+    Parse state is kept on the instance so parsing may resume with
+    lines appended to a file.
+    """
+    def __init__(self, year_str=None, list_input=False):
+        """ Setup parser
+        :year_str: starting year default: "2020"
+        :list_input: True -> list each input line
+        """
+        if year_str is None:
+            year_str = "2020"   # TBD - current year
+        self.year_str = year_str
+        self.list_input = list_input
+        self.month_str = None       # Current date within file
+        self.day_str = None
+        self.nline = 0              # Lines in last parse_lines
+        self.nskipped = 0           # Lines neither date nor data, counted
+                                    # across parse_lines calls
+
+    def start_file(self):
+        """ Reset day and month state for a new file
+        """
+        self.month_str = None
+        self.day_str = None
+
+    def collect_file(self, file_name, meas):
+        """ Collect file and add to measures
+        :file_name:  file to process
+        :meas: measurement data base (Smeasures, MeasBatch)
+        """
+        self.start_file()
+        with open_lines(file_name) as lines:
+            self.collect_lines(lines, meas,
+                               base_name=os.path.basename(file_name))
+
+    def collect_lines(self, lines, meas, base_name=""):
+        """ Parse lines, continuing from current state, and add
+        them to measures, a block of lines of one data type at a time
+        :lines: iterable of text lines e.g. open file
+        :meas: measurement data base (Smeasures, MeasBatch)
+        :base_name: name for listing/error messages
+        """
+        block_type = None
+        ordinals = []
+        datas_rows = []
+        for data_type, datas, month_str, day_str, year_str in (
+                self.parse_lines(lines, base_name=base_name)):
+            if ordinals and (data_type != block_type
+                             or len(ordinals) >= BLOCK_LINES):
+                meas.add_columns(block_type, ordinals, datas_rows)
+                ordinals = []
+                datas_rows = []
+            if not year_str:        # Year inherited, not yet known
+                meas.add_datas(data_type, datas=datas, month_str=month_str,
+                               day_str=day_str, year_str=year_str)
+                continue
+            block_type = data_type
+            ordinals.append(get_ordinal(month_str, day_str, year_str))
+            datas_rows.append(datas)
+        if ordinals:
+            meas.add_columns(block_type, ordinals, datas_rows)
+
+    def parse_lines(self, lines, base_name=""):
+        """ Parse measurement lines, continuing from current state
+        :lines: iterable of text lines e.g. open file
+        :base_name: name for listing/error messages
+        :returns: generator of (data_type, datas, month_str, day_str, year_str)
+                suitable for Smeasures.add_datas
+        """
+        month_str = self.month_str
+        day_str = self.day_str
+        head_match = head_pat.match
+        data_match = data_pat.match
+        line_no = 0
+        for line in lines:
+            line = line.rstrip()    # Remove white space esp newline
+            line_no += 1
+            if self.list_input:
+                SlTrace.lg(f"{base_name}:{line_no:4}:  {line}")
+            ic = line.rfind("#")
+            if ic >= 0:
+                line = line[:ic]
+                # Historically only one trailing white space char is removed
+                if line[-1:].isspace():
+                    line = line[:-1]
+            line = line.lstrip()
+            if not line:
+                continue                            # Ignore blank lines
+
+            res = head_match(line)
+            if res:
+                if res.lastgroup == "year":         # year on line
+                    self.year_str = res.group("year")
+                    continue
+                if res.group("day") is not None:    # dd mmm or ddmmm
+                    day_str = res.group("day")
+                    month_str = res.group("month")
+                else:                               # July 4, 1776
+                    month_str = res.group("month2")
+                    day_str = res.group("day2")
+                    self.year_str = res.group("year2")
+                self.month_str = month_str
+                self.day_str = day_str
+                line = line[res.end():]             # rest of line
+
+            # Check for data on line
+            res = data_match(line)
+            if res is None:
+                pulse_line = pulse_pat.sub("/", line)
+                if pulse_line != line:
+                    res = data_match(pulse_line)
+                    if res is not None and res.lastgroup != "pl":
+                        res = None
+                if res is None:
+                    if line.strip():
+                        self.nskipped += 1      # Not date, not data
+                    continue
+            if month_str is None:
+                raise SelectError(f"{base_name}:{line_no}: data before date")
+            if res.lastgroup == "sg_e":
+                sg_m_str = res.group("sg_m")
+                if sg_m_str == "night":
+                    sg_m_str = "?"
+                yield ("sg", [sg_m_str, res.group("sg_e")],
+                       month_str, day_str, self.year_str)
+            else:
+                yield ("bp", [res.group("bp_hi"), res.group("bp_lo"),
+                              res.group("pl")],
+                       month_str, day_str, self.year_str)
+        self.nline = line_no
@@ -0,0 +1,197 @@
+#meas_profile.py    18Oct2026
+""" Run phase profiling
+A MeasProfile, while started, records wall time, call count and
+items (lines, measurements, points) of each phase:
+    ingest, parse (per file, lines/sec), cache_load, merge,
+    add_datas, add_columns, get_meas, list_stats, add_plot <mtype>,
+    render, show
+and optionally runs cProfile and tracemalloc over the same span.
+Results are listed as a table (SlTrace) and/or written as JSON.
+cProfile, pstats and tracemalloc are imported only when used.
+Instrumented code checks the module variable profile, so with
+profiling off each site costs one global lookup:
+    if meas_profile.profile is not None: ...
+    with meas_profile.phase("list_stats"): ...
+"""
+import contextlib
+import json
+import time
+
+from select_trace import SlTrace
+
+profile = None          # Started MeasProfile, None - profiling off
+
+NULL_PHASE = contextlib.nullcontext()
+
+
+def phase(name, items=0):
+    """ Context manager timing a phase, if profiling
+    :name: phase name
+    :items: items processed, for rate
+    """
+    if profile is None:
+        return NULL_PHASE
+    return profile.phase(name, items)
+
+
+class PhaseStat:
+    """ Accumulated phase time
+    """
+    def __init__(self, name):
+        self.name = name
+        self.count = 0
+        self.seconds = 0.
+        self.items = 0
+
+    def to_dict(self):
+        return {"count": self.count, "seconds": self.seconds,
+                "items": self.items}
+
+
+class PhaseTimer:
+    """ Time one phase occurrence
+    """
+    def __init__(self, meas_profile, name, items):
+        self.meas_profile = meas_profile
+        self.name = name
+        self.items = items
+        self.time_start = None
+
+    def __enter__(self):
+        self.time_start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self.meas_profile.add(self.name, time.perf_counter() - self.time_start,
+                              self.items)
+        return False
+
+
+class MeasProfile:
+    """ Phase profile of a run
+    """
+    def __init__(self, cprofile=False, memory=False):
+        """ Setup profile
+        :cprofile: True -> also run cProfile
+        :memory: True -> also trace memory (tracemalloc)
+        """
+        self.phases = {}            # name: PhaseStat, in first use order
+        self.files = []             # (file_name, seconds, lines) parsed
+        self.cprofile = None
+        if cprofile:
+            import cProfile
+            self.cprofile = cProfile.Profile()
+        self.memory = memory
+        self.memory_peak = None
+        self.memory_top = []        # (location, bytes)
+        self.time_start = None
+        self.seconds = None
+
+    def start(self):
+        """ Start profiling - instrumented code records to us
+        """
+        global profile
+        profile = self
+        if self.memory:
+            import tracemalloc
+            tracemalloc.start()
+        if self.cprofile is not None:
+            self.cprofile.enable()
+        self.time_start = time.perf_counter()
+
+    def stop(self):
+        """ Stop profiling
+        """
+        global profile
+        self.seconds = time.perf_counter() - self.time_start
+        if self.cprofile is not None:
+            self.cprofile.disable()
+        if self.memory:
+            import tracemalloc
+            _, self.memory_peak = tracemalloc.get_traced_memory()
+            snapshot = tracemalloc.take_snapshot()
+            tracemalloc.stop()
+            self.memory_top = [(str(stat.traceback), stat.size)
+                               for stat in snapshot.statistics("lineno")[:10]]
+        if profile is self:
+            profile = None
+
+    def add(self, name, seconds, items=0):
+        """ Record one phase occurrence
+        """
+        phase_stat = self.phases.get(name)
+        if phase_stat is None:
+            phase_stat = self.phases[name] = PhaseStat(name)
+        phase_stat.count += 1
+        phase_stat.seconds += seconds
+        phase_stat.items += items
+
+    def count(self, name, items=0):
+        """ Count untimed phase call e.g. per line add_datas
+        """
+        self.add(name, 0., items)
+
+    def add_file(self, file_name, seconds, lines):
+        """ Record a file's parse, also as phase "parse"
+        """
+        self.files.append((file_name, seconds, lines))
+        self.add("parse", seconds, lines)
+
+    def phase(self, name, items=0):
+        """ Context manager timing a phase
+        """
+        return PhaseTimer(self, name, items)
+
+    def to_dict(self):
+        """ Machine readable results
+        """
+        return {"seconds": self.seconds,
+                "phases": {name: phase_stat.to_dict()
+                           for name, phase_stat in self.phases.items()},
+                "files": [{"file": file_name, "seconds": seconds,
+                           "lines": lines}
+                          for file_name, seconds, lines in self.files],
+                "memory_peak": self.memory_peak,
+                "memory_top": [{"location": location, "bytes": size}
+                               for location, size in self.memory_top]}
+
+    def write_json(self, file_name):
+        """ Write results as JSON
+        """
+        with open(file_name, "w") as fout:
+            json.dump(self.to_dict(), fout, indent=1)
+
+    def list_profile(self, nfile=10, nfunction=20):
+        """ List results table
+        :nfile: number of slowest files listed
+        :nfunction: number of cProfile functions listed
+        """
+        SlTrace.lg(f"Profile: {self.seconds:.3f} sec")
+        SlTrace.lg(f"    {'phase':24} {'calls':>8} {'sec':>9} {'%':>5}"
+                   f" {'items':>10} {'items/sec':>11}")
+        for name, phase_stat in self.phases.items():
+            pct = phase_stat.seconds/self.seconds*100 if self.seconds else 0
+            rate = ""
+            if phase_stat.items and phase_stat.seconds > 0:
+                rate = f"{phase_stat.items/phase_stat.seconds:11,.0f}"
+            SlTrace.lg(f"    {name:24} {phase_stat.count:8}"
+                       f" {phase_stat.seconds:9.3f} {pct:5.1f}"
+                       f" {phase_stat.items:10} {rate:>11}")
+        if self.files:
+            SlTrace.lg("  Slowest files:")
+            for file_name, seconds, lines in sorted(
+                    self.files, key=lambda f: -f[1])[:nfile]:
+                rate = lines/seconds if seconds > 0 else 0
+                SlTrace.lg(f"    {file_name}: {seconds:.3f} sec"
+                           f" {lines} lines {rate:,.0f} lines/sec")
+        if self.memory_peak is not None:
+            SlTrace.lg(f"  Memory peak: {self.memory_peak/1e6:.1f} MB")
+            for location, size in self.memory_top:
+                SlTrace.lg(f"    {size/1e6:8.2f} MB  {location}")
+        if self.cprofile is not None:
+            import io
+            import pstats
+            stream = io.StringIO()
+            pstats.Stats(self.cprofile, stream=stream).sort_stats(
+                "cumulative").print_stats(nfunction)
+            SlTrace.lg(stream.getvalue())
@@ -0,0 +1,307 @@
+#meas_pyramid.py    18Oct2026
+""" Multi-resolution aggregate pyramid
+Per mtype, measurements are aggregated into calendar buckets at
+three tiers, updated as measurements are added:
+    day     bucket is the date ordinal
+    week    bucket is the ordinal of the week's Monday
+    month   bucket is the ordinal of the month's first day
+Each bucket holds count, sum, sum of squares, min, max and in
+range count, from which mean, stdev and in range percent follow.
+Long range plots and statistics read the coarsest tier fine enough
+for the request (choose_tier) instead of the raw measurements; a
+date range summary is built from the whole months within it plus
+the days at its ends.
+Each tier of an mtype is a sorted bucket array with a fields array,
+a block of measurements is aggregated and merged into it with numpy.
+Single measurements are buffered per mtype and merged as a block
+when the buffer fills or the mtype is queried.
+"""
+from datetime import date
+import math
+
+import numpy as np
+
+TIERS = ["day", "week", "month"]
+TIER_DAYS = {"day": 1, "week": 7, "month": 30}  # nominal bucket length
+
+COUNT, TOTAL, SUMSQ, LOW, HIGH, NIN = range(6)     # bucket fields
+PENDING_SIZE = 4096         # Single measurements buffered per mtype
+
+EPOCH_ORD = date(1970, 1, 1).toordinal()        # datetime64[D] zero
+
+
+def get_bucket_keys(tier, ords):
+    """ Bucket of each date ordinal
+    :tier: "day", "week", "month"
+    :ords: array of date ordinals
+    :returns: int64 array of bucket ordinals
+    """
+    ords = np.asarray(ords, dtype=np.int64)
+    if tier == "day":
+        return ords
+    if tier == "week":
+        return ords - (ords - 1) % 7        # ordinal 1 is a Monday
+    days = (ords - EPOCH_ORD).astype("datetime64[D]")
+    return (days.astype("datetime64[M]").astype("datetime64[D]")
+            .astype(np.int64) + EPOCH_ORD)
+
+
+def get_bucket(tier, ordinal):
+    """ Bucket of one date ordinal
+    """
+    if tier == "day":
+        return ordinal
+    if tier == "week":
+        return ordinal - (ordinal - 1) % 7
+    return date.fromordinal(ordinal).replace(day=1).toordinal()
+
+
+def get_bucket_end(tier, bucket):
+    """ Last date ordinal in a bucket
+    """
+    if tier == "day":
+        return bucket
+    if tier == "week":
+        return bucket + 6
+    first = date.fromordinal(bucket)
+    if first.month == 12:
+        return date(first.year+1, 1, 1).toordinal() - 1
+    return date(first.year, first.month+1, 1).toordinal() - 1
+
+
+def reduce_buckets(keys, fields):
+    """ Combine fields of equal bucket keys
+    :keys: int64 array of bucket ordinals
+    :fields: int64 array, row per key, columns COUNT...NIN
+    :returns: (sorted distinct keys, combined fields)
+    """
+    order = np.argsort(keys, kind="stable")
+    keys = keys[order]
+    fields = fields[order]
+    starts = np.flatnonzero(np.concatenate(([True], keys[1:] != keys[:-1])))
+    combined = np.add.reduceat(fields, starts, axis=0)
+    combined[:, LOW] = np.minimum.reduceat(fields[:, LOW], starts)
+    combined[:, HIGH] = np.maximum.reduceat(fields[:, HIGH], starts)
+    return keys[starts], combined
+
+
+def choose_tier(days_per_point):
+    """ Coarsest tier whose buckets are no longer than days_per_point
+    :days_per_point: resolution wanted e.g. date span / axes pixels
+    :returns: tier, None if finer than a day - use raw measurements
+    """
+    chosen = None
+    for tier in TIERS:
+        if TIER_DAYS[tier] <= days_per_point:
+            chosen = tier
+    return chosen
+
+
+class MeasSummary:
+    """ Statistics of a set of buckets
+    """
+    def __init__(self, mtype, count=0, total=0, sumsq=0, low=None,
+                 high=None, nin=0, has_limits=False):
+        self.mtype = mtype
+        self.count = count
+        self.min = low
+        self.max = high
+        self.mean = total/count if count > 0 else 0.
+        self.stdev = 0.
+        if count > 1:
+            self.stdev = math.sqrt(max(sumsq - total*total/count, 0)
+                                   / (count-1))
+        self.in_range = None            # percent, None if no limits
+        if has_limits and count > 0:
+            self.in_range = nin/count*100
+
+
+class MeasPyramid:
+    """ Day, week, month aggregates of each mtype code
+    """
+    def __init__(self):
+        self.tiers = {tier: {} for tier in TIERS}   # tier: code:
+                                                    #   (buckets, fields)
+        self.limits = {}            # code: (ms_low, ms_high)
+        self.pending = {}           # code: ([ords], [vals], [in_range])
+                                    #   not yet merged
+        self.changed = False        # Since saved
+
+    def set_limits(self, code, low=None, high=None):
+        """ Note limits in range counts were made with
+        :returns: True if changed - caller rebuilds code
+        """
+        if self.limits.get(code, (None, None)) == (low, high):
+            return False
+        self.limits[code] = (low, high)
+        return True
+
+    def has_limits(self, code):
+        return self.limits.get(code, (None, None)) != (None, None)
+
+    def clear_code(self, code):
+        """ Drop code's buckets e.g. before rebuilding
+        """
+        self.pending.pop(code, None)
+        for tier in TIERS:
+            self.tiers[tier].pop(code, None)
+        self.changed = True
+
+    def add(self, code, ordinal, value, in_range=True):
+        """ Add one measurement, buffered
+        :code: mtype code
+        :ordinal: date ordinal
+        :value: value
+        :in_range: True if within code's limits
+        """
+        pending = self.pending.get(code)
+        if pending is None:
+            pending = self.pending[code] = ([], [], [])
+        pending[0].append(ordinal)
+        pending[1].append(value)
+        pending[2].append(in_range)
+        self.changed = True
+        if len(pending[0]) >= PENDING_SIZE:
+            self.merge_pending(code)
+
+    def merge_pending(self, code=None):
+        """ Merge buffered single measurements
+        :code: mtype code default: all codes
+        """
+        codes = list(self.pending) if code is None else [code]
+        for code in codes:
+            pending = self.pending.pop(code, None)
+            if pending is not None:
+                ords, vals, in_range = pending
+                self.add_values(code, np.array(ords, dtype=np.int64),
+                                np.array(vals, dtype=np.int64),
+                                np.array(in_range, dtype=bool))
+
+    def add_values(self, code, ords, vals, in_range=None):
+        """ Add a block of measurements of one code
+        :code: mtype code
+        :ords: date ordinals
+        :vals: values
+        :in_range: bool array, True - within limits default: all
+        """
+        if len(ords) == 0:
+            return
+        vals = np.asarray(vals, dtype=np.int64)
+        if in_range is None:
+            in_range = np.ones(len(vals), dtype=bool)
+        fields = np.column_stack((np.ones(len(vals), dtype=np.int64), vals,
+                                  vals*vals, vals, vals,
+                                  in_range.astype(np.int64)))
+        for tier in TIERS:
+            self.merge(tier, code, get_bucket_keys(tier, ords), fields)
+        self.changed = True
+
+    def merge(self, tier, code, keys, fields):
+        """ Merge bucket fields into tier
+        :keys: bucket ordinals, any order, repeats combined
+        :fields: row per key
+        """
+        old = self.tiers[tier].get(code)
+        if old is not None:
+            keys = np.concatenate((old[0], keys))
+            fields = np.concatenate((old[1], fields))
+        self.tiers[tier][code] = reduce_buckets(keys, fields)
+
+    def get_arrays(self, tier, code):
+        """ Get tier's buckets of code as sorted arrays
+        :returns: (buckets, fields) - fields[:, COUNT...NIN] int64
+        """
+        if code in self.pending:
+            self.merge_pending(code)
+        arrays = self.tiers[tier].get(code)
+        if arrays is None:
+            return (np.empty(0, dtype=np.int64),
+                    np.empty((0, 6), dtype=np.int64))
+        return arrays
+
+    def get_tier(self, code, tier, start=None, end=None):
+        """ Get code's aggregates at tier
+        :code: mtype code
+        :tier: "day", "week", "month"
+        :start: earliest date ordinal default: no limit
+        :end: latest date ordinal default: no limit
+                buckets overlapping start..end are included
+        :returns: (bucket ordinals, counts, lows, highs, means,
+                    in range percents - NaN if no limits) arrays
+        """
+        buckets, fields = self.get_arrays(tier, code)
+        i_start = 0
+        i_end = len(buckets)
+        if start is not None:
+            i_start = np.searchsorted(buckets, get_bucket_keys(tier, [start])[0])
+        if end is not None:
+            i_end = np.searchsorted(buckets, end, side='right')
+        buckets = buckets[i_start:i_end]
+        fields = fields[i_start:i_end]
+        counts = fields[:, COUNT]
+        means = fields[:, TOTAL]/np.maximum(counts, 1)
+        if self.has_limits(code):
+            in_range = fields[:, NIN]*100./np.maximum(counts, 1)
+        else:
+            in_range = np.full(len(buckets), np.nan)
+        return (buckets, counts, fields[:, LOW], fields[:, HIGH], means,
+                in_range)
+
+    def get_summary(self, code, mtype, start=None, end=None):
+        """ Statistics of code over a date range, from whole months
+        within start..end and days at its ends
+        :code: mtype code
+        :mtype: measurement type, for the summary
+        :start: earliest date ordinal default: no limit
+        :end: latest date ordinal default: no limit
+        :returns: MeasSummary
+        """
+        months, month_fields = self.get_arrays("month", code)
+        days, day_fields = self.get_arrays("day", code)
+        whole = np.ones(len(months), dtype=bool)
+        if start is not None:
+            whole &= months >= start
+        if end is not None:
+            month_ends = np.array([get_bucket_end("month", month)
+                                   for month in months.tolist()],
+                                  dtype=np.int64)
+            whole &= month_ends <= end
+        in_days = ~np.isin(get_bucket_keys("month", days), months[whole])
+        if start is not None:
+            in_days &= days >= start
+        if end is not None:
+            in_days &= days <= end
+        fields = np.concatenate([month_fields[whole], day_fields[in_days]])
+        if len(fields) == 0:
+            return MeasSummary(mtype)
+        return MeasSummary(mtype, count=int(fields[:, COUNT].sum()),
+                           total=int(fields[:, TOTAL].sum()),
+                           sumsq=int(fields[:, SUMSQ].sum()),
+                           low=int(fields[:, LOW].min()),
+                           high=int(fields[:, HIGH].max()),
+                           nin=int(fields[:, NIN].sum()),
+                           has_limits=self.has_limits(code))
+
+    def to_rows(self):
+        """ All buckets, for saving
+        :returns: list of (tier index, code, bucket, count, total,
+                    sumsq, low, high, nin)
+        """
+        self.merge_pending()
+        rows = []
+        for itier, tier in enumerate(TIERS):
+            for code, (buckets, fields) in self.tiers[tier].items():
+                rows.extend((itier, code, bucket, *bucket_fields)
+                            for bucket, bucket_fields in zip(
+                                buckets.tolist(), fields.tolist()))
+        return rows
+
+    def add_rows(self, rows):
+        """ Restore buckets saved by to_rows
+        """
+        rows = np.array(list(rows), dtype=np.int64).reshape(-1, 9)
+        for itier, tier in enumerate(TIERS):
+            tier_rows = rows[rows[:, 0] == itier]
+            for code in np.unique(tier_rows[:, 1]).tolist():
+                code_rows = tier_rows[tier_rows[:, 1] == code]
+                self.merge(tier, code, code_rows[:, 2], code_rows[:, 3:])
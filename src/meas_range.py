@@ -0,0 +1,155 @@
+#meas_range.py    18Oct2026
+""" Out of range classification, at ingest
+Each measurement is classified once, as it is added, against its
+mtype's limits (PlotAttr ms_low, ms_high):
+    RANGE_LOW   below ms_low
+    RANGE_IN    within limits, or mtype without limits
+    RANGE_HIGH  above ms_high
+A MeasRange per mtype keeps counts of each class and streaks -
+runs of consecutive out of range readings, in reading (insertion)
+order - the current one and the longest so far.
+Blocks of measurements are classified and streaks stitched with
+numpy, single measurements by the scalar add.
+"""
+import numpy as np
+
+RANGE_LOW = -1
+RANGE_IN = 0
+RANGE_HIGH = 1
+
+CLASS_DTYPE = np.int8
+
+
+def classify(vals, low=None, high=None):
+    """ Classify values against limits
+    :vals: array of values
+    :low: lowest in range value default: no limit
+    :high: highest in range value default: no limit
+    :returns: array of RANGE_LOW, RANGE_IN, RANGE_HIGH
+    """
+    classes = np.zeros(len(vals), dtype=CLASS_DTYPE)
+    if low is not None:
+        classes[vals < low] = RANGE_LOW
+    if high is not None:
+        classes[vals > high] = RANGE_HIGH
+    return classes
+
+
+def get_runs(ob):
+    """ Find runs of True
+    :ob: bool array e.g. out of range
+    :returns: (starts, ends) arrays, ends exclusive
+    """
+    edges = np.diff(np.concatenate(([0], ob.view(np.int8), [0])))
+    return np.flatnonzero(edges == 1), np.flatnonzero(edges == -1)
+
+
+def get_excursions(ords, classes, min_len=1):
+    """ Out of range streaks of readings
+    :ords: date ordinals, in reading order
+    :classes: range classes of the readings
+    :min_len: shortest streak reported
+    :returns: list of (start ordinal, end ordinal, number of readings)
+    """
+    starts, ends = get_runs(classes != RANGE_IN)
+    lengths = ends - starts
+    keep = lengths >= min_len
+    return list(zip(ords[starts[keep]].tolist(), ords[ends[keep]-1].tolist(),
+                    lengths[keep].tolist()))
+
+
+class MeasRange:
+    """ Out of range counts and streaks for one mtype
+    """
+    def __init__(self, mtype, low=None, high=None):
+        """ Setup tracker
+        :mtype: measurement type
+        :low: lowest in range value default: no limit
+        :high: highest in range value default: no limit
+        """
+        self.mtype = mtype
+        self.low = low
+        self.high = high
+        self.clear()
+
+    def clear(self):
+        self.nlow = 0
+        self.nhigh = 0
+        self.nin = 0
+        self.streak = 0             # Current out of range streak length
+        self.streak_start = None    # Its first date ordinal
+        self.longest = 0            # Longest streak
+        self.longest_start = None   # Its first, last date ordinals
+        self.longest_end = None
+
+    @property
+    def count(self):
+        return self.nlow + self.nin + self.nhigh
+
+    @property
+    def nout(self):
+        return self.nlow + self.nhigh
+
+    def has_limits(self):
+        return self.low is not None or self.high is not None
+
+    def add(self, ordinal, value):
+        """ Classify one reading
+        :ordinal: date ordinal
+        :value: measurement value
+        :returns: range class
+        """
+        if self.low is not None and value < self.low:
+            self.nlow += 1
+            range_class = RANGE_LOW
+        elif self.high is not None and value > self.high:
+            self.nhigh += 1
+            range_class = RANGE_HIGH
+        else:
+            self.nin += 1
+            self.streak = 0
+            return RANGE_IN
+
+        if self.streak == 0:
+            self.streak_start = ordinal
+        self.streak += 1
+        if self.streak > self.longest:
+            self.longest = self.streak
+            self.longest_start = self.streak_start
+            self.longest_end = ordinal
+        return range_class
+
+    def add_values(self, ords, vals):
+        """ Classify a block of readings, in reading order
+        :ords: date ordinals
+        :vals: values
+        :returns: array of range classes
+        """
+        classes = classify(vals, self.low, self.high)
+        nlow = int(np.count_nonzero(classes == RANGE_LOW))
+        nhigh = int(np.count_nonzero(classes == RANGE_HIGH))
+        self.nlow += nlow
+        self.nhigh += nhigh
+        self.nin += len(vals) - nlow - nhigh
+        if nlow + nhigh == 0:
+            if len(vals) > 0:
+                self.streak = 0
+            return classes
+
+        starts, ends = get_runs(classes != RANGE_IN)
+        lengths = ends - starts
+        run_starts = ords[starts]
+        if starts[0] == 0 and self.streak > 0:     # Continues current
+            lengths[0] += self.streak
+            run_starts[0] = self.streak_start
+        i = int(np.argmax(lengths))
+        if lengths[i] > self.longest:
+            self.longest = int(lengths[i])
+            self.longest_start = int(run_starts[i])
+            self.longest_end = int(ords[ends[i]-1])
+        if ends[-1] == len(vals):
+            self.streak = int(lengths[-1])
+            self.streak_start = int(run_starts[-1])
+        else:
+            self.streak = 0
+        return classes
@@ -0,0 +1,131 @@
+#meas_report.py    18Oct2026
+""" Headless report rendering
+A report is a plot of one subject's (data directory's) measurements,
+optionally limited to a date range and set of mtypes, rendered to a
+file (.png, .svg, .pdf ...) with the Agg backend.
+Batch file: one report per line, fields key=value
+    output=FILE data_dir=DIR [start=YYYY-MM-DD] [end=YYYY-MM-DD]
+        [mtypes=sg_m,sg_e] [date_axis=true|false]
+        [rolling=mean:7,in_range:30]
+    # comments
+Batch reports are rendered in parallel worker processes.
+"""
+from concurrent.futures import ProcessPoolExecutor
+from datetime import date
+import os
+
+from select_error import SelectError
+from crs_funs import str2bool
+
+from smeasures import Smeasures
+from meas_parser import MeasParser
+from meas_ingest import collect_files
+from meas_cache import MeasCache
+from meas_files import glob_data_files
+from meas_rolling import get_rolling_specs
+
+
+class MeasReport:
+    """ One report to render
+    """
+    def __init__(self, output, data_dir, start=None, end=None,
+                 mtypes=None, date_axis=True, rolling=None):
+        """ Setup report
+        :output: output file, format from extension
+        :data_dir: subject's data directory, *.data files
+                    plain or compressed
+        :start: earliest date default: no limit
+        :end: latest date default: no limit
+        :mtypes: list of mtypes default: all
+        :date_axis: True -> show date on x axis else day number
+        :rolling: list of (stat, window days) overlays default: none
+        """
+        self.output = output
+        self.data_dir = data_dir
+        self.start = start
+        self.end = end
+        self.mtypes = mtypes
+        self.date_axis = date_axis
+        self.rolling = rolling
+
+
+def read_batch(file_name):
+    """ Read batch file of reports
+    :file_name: batch file
+    :returns: list of MeasReport
+    """
+    reports = []
+    with open(file_name) as finp:
+        for line_no, line in enumerate(finp, start=1):
+            line = line.split("#", 1)[0].strip()
+            if not line:
+                continue
+            fields = {}
+            for field in line.split():
+                key, eq, val = field.partition("=")
+                if not eq:
+                    raise SelectError(f"{file_name}:{line_no}:"
+                                      f" expected key=value: {field}")
+                fields[key] = val
+            try:
+                kwargs = {}
+                for key, val in fields.items():
+                    if key in ("output", "data_dir"):
+                        kwargs[key] = val
+                    elif key in ("start", "end"):
+                        kwargs[key] = date.fromisoformat(val)
+                    elif key == "mtypes":
+                        kwargs[key] = val.split(",")
+                    elif key == "date_axis":
+                        kwargs[key] = str2bool(val)
+                    elif key == "rolling":
+                        kwargs[key] = get_rolling_specs(val)
+                    else:
+                        raise SelectError(f"unknown report field {key}")
+                reports.append(MeasReport(**kwargs))
+            except (ValueError, TypeError, SelectError) as e:
+                raise SelectError(f"{file_name}:{line_no}: {e}")
+    return reports
+
+
+def render_report(report, use_cache=True):
+    """ Render one report - worker process entry
+    :report: MeasReport
+    :use_cache: True -> use data_dir/.meas_cache parse cache
+    :returns: output file name
+    """
+    import matplotlib
+    matplotlib.use("Agg")
+    smeas = Smeasures()
+    smeas.add_std_plot_attrs()
+    smeas.set_vert_label("Measurements")
+    if report.date_axis:
+        smeas.set_horz_label("Measurement Date")
+    else:
+        smeas.set_horz_label("Day Number")
+    file_names = glob_data_files(report.data_dir)
+    meas_cache = None
+    if use_cache:
+        meas_cache = MeasCache(os.path.join(report.data_dir, ".meas_cache"))
+    collect_files(file_names, smeas, MeasParser(), cache=meas_cache)
+    smeas.add_plots(mtypes=report.mtypes, date_axis=report.date_axis,
+                    start=report.start, end=report.end,
+                    overlays=report.rolling)
+    smeas.save_plots(report.output)
+    smeas.close_plots()
+    return report.output
+
+
+def render_reports(reports, jobs=1, use_cache=True):
+    """ Render reports
+    :reports: list of MeasReport
+    :jobs: number of worker processes
+    :use_cache: True -> use parse cache
+    :returns: list of output files, in order
+    """
+    use_caches = [use_cache]*len(reports)
+    if jobs <= 1 or len(reports) <= 1:
+        return list(map(render_report, reports, use_caches))
+
+    with ProcessPoolExecutor(max_workers=jobs) as pool:
+        return list(pool.map(render_report, reports, use_caches))
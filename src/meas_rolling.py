@@ -0,0 +1,111 @@
+#meas_rolling.py    18Oct2026
+""" Rolling (moving window) measurement aggregates
+Windows are calendar days: the value on day d covers readings on
+days d-window+1 .. d.  Readings are first reduced to per-day arrays
+over the day range, then
+    mean, time in range - windowed differences of prefix sums
+    min, max            - van Herk/Gil-Werman block prefix/suffix
+                          running extremes
+so each aggregate is O(N + ndays) vectorized, not O(N*window).
+Results are given for each day with at least one reading.
+"""
+import numpy as np
+
+from select_error import SelectError
+
+ROLLING_STATS = ("mean", "min", "max", "in_range")
+
+
+def get_rolling_specs(specs_str):
+    """ Parse rolling aggregate list e.g. "mean:7,mean:30,in_range:90"
+    :specs_str: comma separated stat:window_days
+    :returns: list of (stat, window)
+    """
+    specs = []
+    for spec in specs_str.split(","):
+        stat, _, window = spec.strip().partition(":")
+        if stat not in ROLLING_STATS or not window.isdigit():
+            raise SelectError(f"Bad rolling spec: {spec}"
+                              f" expected stat:days, stat one of"
+                              f" {', '.join(ROLLING_STATS)}")
+        specs.append((stat, int(window)))
+    return specs
+
+
+def rolling(ords, vals, window, stat="mean", ms_low=None, ms_high=None):
+    """ Rolling aggregate of measurements
+    :ords: date ordinals, ascending
+    :vals: values
+    :window: window length, days
+    :stat: "mean", "min", "max",
+            "in_range" - percent of readings within ms_low..ms_high
+    :ms_low: in_range low limit default: no limit
+    :ms_high: in_range high limit default: no limit
+    :returns: (day ordinals, aggregate values) arrays
+    """
+    if stat not in ROLLING_STATS:
+        raise SelectError(f"Unrecognized rolling stat: {stat}")
+    if window < 1:
+        raise SelectError(f"Rolling window must be >= 1 day: {window}")
+    ords = np.asarray(ords)
+    vals = np.asarray(vals)
+    if len(ords) == 0:
+        return np.empty(0, dtype=ords.dtype), np.empty(0, dtype=np.float64)
+
+    days, starts = np.unique(ords, return_index=True)
+    day_idx = days - days[0]
+    ndays = int(day_idx[-1]) + 1
+    if stat in ("min", "max"):
+        fill = np.inf if stat == "min" else -np.inf
+        reduce = np.minimum if stat == "min" else np.maximum
+        by_day = np.full(ndays, fill)
+        by_day[day_idx] = reduce.reduceat(vals.astype(np.float64), starts)
+        return days, sliding_extreme(by_day, window, reduce, fill)[day_idx]
+
+    if stat == "mean":
+        sums = np.add.reduceat(vals.astype(np.float64), starts)
+    else:
+        in_range = np.ones(len(vals), dtype=np.float64)
+        if ms_low is not None:
+            in_range[vals < ms_low] = 0
+        if ms_high is not None:
+            in_range[vals > ms_high] = 0
+        sums = np.add.reduceat(in_range, starts)
+    counts = np.diff(np.append(starts, len(vals)))
+    window_sums = window_total(day_idx, sums, ndays, window)
+    window_counts = window_total(day_idx, counts, ndays, window)
+    result = window_sums/window_counts
+    if stat == "in_range":
+        result *= 100
+    return days, result
+
+
+def window_total(day_idx, day_vals, ndays, window):
+    """ Window sums at each day with a value, via prefix sums
+    :day_idx: day index (0..ndays-1) of each day_vals entry
+    :day_vals: per day values
+    :returns: sum over days day_idx-window+1..day_idx for each entry
+    """
+    by_day = np.zeros(ndays + 1, dtype=np.float64)
+    by_day[day_idx + 1] = day_vals
+    cum = np.cumsum(by_day)
+    return cum[day_idx + 1] - cum[np.maximum(day_idx + 1 - window, 0)]
+
+
+def sliding_extreme(vals, window, reduce, fill):
+    """ Sliding window minimum or maximum, van Herk/Gil-Werman
+    :vals: array
+    :window: window length
+    :reduce: np.minimum or np.maximum
+    :fill: identity of reduce (inf or -inf)
+    :returns: array, entry i is extreme of vals[i-window+1..i]
+    """
+    n = len(vals)
+    nblock = -(-(n + window - 1)//window)
+    padded = np.full(nblock*window, fill)
+    padded[window-1:window-1+n] = vals
+    blocks = padded.reshape(nblock, window)
+    prefix = reduce.accumulate(blocks, axis=1).ravel()
+    suffix = reduce.accumulate(blocks[:, ::-1], axis=1)[:, ::-1].ravel()
+    i = np.arange(n)
+    return reduce(suffix[i], prefix[i + window - 1])
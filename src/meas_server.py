@@ -0,0 +1,321 @@
+#meas_server.py    18Oct2026
+""" Measurement ingestion service - asyncio, line oriented TCP
+Instead of phone note -> email -> paste into data/*.data, clients
+send measurement lines, in the data file formats, to a local port:
+    2021                        year
+    26 July 109 231             sugar, with date
+    September 16, 2020          date
+    night 140                   sugar, on the current date
+Each connection keeps its own date and year, as a data file does,
+starting in the current year.  Every line is answered in order:
+    ok N            accepted, N measurements
+    error reason    rejected, date state unchanged
+Lines are checked by MeasParser and date conversion, exactly as the
+data files will be read; lines the parser would skip, giving neither
+date nor measurement, are rejected rather than silently lost.
+Accepted measurement lines go, through one bounded queue, to a
+single writer task which appends them, in batches, to the month's
+data file (data_dir/meas_YYYY_MM.data, kept open) and adds them to
+a live Smeasures.  A full queue stops reading from clients
+(backpressure) until the writer catches up.
+A date line is written ahead of each line whose date differs from
+the last written to its file, so every data file reads alone;
+measure_plotting.py --follow picks up the appended lines.
+Usage: python meas_server.py [--data_dir DIR] [--port P]
+       python meas_server.py --send FILE [--port P]   post FILE's lines
+"""
+import argparse
+import asyncio
+from collections import OrderedDict
+import calendar
+from datetime import date
+import os
+
+from select_trace import SlTrace
+from select_error import SelectError
+from crs_funs import str2bool
+
+from smeasures import Smeasures
+from meas_parser import MeasParser
+from meas_ingest import collect_files
+from meas_date import get_ordinal
+from meas_files import glob_data_files
+
+HOST = "127.0.0.1"          # Local only
+PORT = 8747
+FILE_FORMAT = "meas_{year:04}_{month:02}.data"  # Monthly data file
+
+
+class MeasServer:
+    """ Accept measurement lines from clients, append them to data
+    files and add them to measures
+    """
+    def __init__(self, data_dir, meas=None, file_format=FILE_FORMAT,
+                 queue_size=1000, batch_size=500, max_open=8, year_str=None):
+        """ Setup server
+        :data_dir: directory of data files, created if needed
+        :meas: Smeasures receiving accepted measurements default: none
+        :file_format: data file name, from year, month of the reading
+        :queue_size: accepted lines waiting to be written, at most
+        :batch_size: lines written per batch, at most
+        :max_open: data files kept open, least recently used closed
+        :year_str: year of each connection until it sends one
+                default: current year
+        """
+        self.data_dir = data_dir
+        self.meas = meas
+        self.file_format = file_format
+        self.queue_size = queue_size
+        self.batch_size = batch_size
+        self.max_open = max_open
+        if year_str is None:
+            year_str = str(date.today().year)
+        self.year_str = year_str
+        self.queue = None           # (ordinal, line, records) to write
+        self.server = None
+        self.writer_task = None
+        self.files = OrderedDict()  # file_name: open file, in use order
+        self.file_ords = {}         # file_name: last date ordinal written
+        self.nline = 0              # Lines accepted
+        self.nmeas = 0              # Measurements accepted
+        self.nerror = 0             # Lines rejected
+        self.nbatch = 0             # Batches written
+        os.makedirs(data_dir, exist_ok=True)
+
+    async def start(self, host=HOST, port=PORT):
+        """ Start listening and the writer task
+        :returns: port listened on, e.g. if port 0 - any free port
+        """
+        self.queue = asyncio.Queue(maxsize=self.queue_size)
+        self.writer_task = asyncio.create_task(self.write_batches())
+        self.server = await asyncio.start_server(self.handle_client,
+                                                 host, port)
+        return self.server.sockets[0].getsockname()[1]
+
+    async def stop(self):
+        """ Stop accepting connections, write all accepted lines,
+        close data files
+        """
+        self.server.close()
+        await self.server.wait_closed()
+        await self.queue.put(None)
+        await self.writer_task
+        self.close_files()
+
+    async def handle_client(self, reader, writer):
+        """ Read, check and queue one client's lines
+        """
+        peer = writer.get_extra_info("peername")
+        SlTrace.lg(f"Client {peer} connected", "server")
+        meas_parser = MeasParser(year_str=self.year_str)
+        meas_parser.start_file()
+        try:
+            while True:
+                raw = await reader.readline()
+                if not raw:
+                    break
+                try:
+                    line = raw.decode("utf-8").rstrip("\r\n")
+                    ordinal, records = self.check_line(meas_parser, line)
+                except (SelectError, UnicodeDecodeError) as e:
+                    self.nerror += 1
+                    writer.write(f"error {e}\n".encode())
+                else:
+                    nmeas = sum(len(datas) - datas.count("?")
+                                for _, datas, *_ in records)
+                    if records:
+                        self.nline += 1
+                        self.nmeas += nmeas
+                        await self.queue.put((ordinal, line, records))
+                    writer.write(f"ok {nmeas}\n".encode())
+                await writer.drain()
+        except ConnectionError:
+            pass                    # Client went away
+        finally:
+            writer.close()
+            SlTrace.lg(f"Client {peer} disconnected", "server")
+
+    def check_line(self, meas_parser, line):
+        """ Parse one line, restoring parse state if rejected
+        A line changing the date is rejected if the new date is
+        invalid, as are records on invalid dates.
+        :meas_parser: connection's MeasParser
+        :line: text line
+        :returns: (date ordinal, None if no records,
+                    list of records (data_type, datas, month_str,
+                                      day_str, year_str))
+        """
+        state = (meas_parser.month_str, meas_parser.day_str,
+                 meas_parser.year_str, meas_parser.nskipped)
+        try:
+            records = list(meas_parser.parse_lines([line]))
+            if meas_parser.nskipped != state[3]:
+                raise SelectError(f"not a date or measurement line: {line}")
+            ordinal = None
+            for _, _, month_str, day_str, year_str in records:
+                ordinal = get_ordinal(month_str, day_str, year_str)
+            if (meas_parser.month_str is not None
+                    and (meas_parser.month_str, meas_parser.day_str,
+                         meas_parser.year_str) != state[:3]):
+                get_ordinal(meas_parser.month_str,      # Date, year lines
+                            meas_parser.day_str, meas_parser.year_str)
+        except (SelectError, ValueError) as e:
+            (meas_parser.month_str, meas_parser.day_str,
+             meas_parser.year_str, meas_parser.nskipped) = state
+            raise SelectError(str(e))
+        return ordinal, records
+
+    async def write_batches(self):
+        """ Writer task - append queued lines, a batch at a time,
+        until the stop marker (None)
+        """
+        stopping = False
+        while not stopping:
+            items = [await self.queue.get()]
+            while len(items) < self.batch_size and not self.queue.empty():
+                items.append(self.queue.get_nowait())
+            if items[-1] is None:
+                stopping = True
+                items.pop()
+            if items:
+                try:
+                    self.write_batch(items)
+                except OSError as e:
+                    SlTrace.lg(f"Write failed, {len(items)} lines lost: {e}")
+
+    def write_batch(self, items):
+        """ Append lines to their data files, add their measurements
+        :items: list of (ordinal, line, records)
+        """
+        written = set()
+        for ordinal, line, records in items:
+            day = date.fromordinal(ordinal)
+            file_name = os.path.join(self.data_dir, self.file_format.format(
+                                     year=day.year, month=day.month))
+            fout = self.get_file(file_name)
+            if self.file_ords.get(file_name) != ordinal:
+                fout.write(f"{calendar.month_name[day.month]} {day.day},"
+                           f" {day.year}\n")
+                self.file_ords[file_name] = ordinal
+            fout.write(line + "\n")
+            written.add(fout)
+        for fout in written:
+            if not fout.closed:         # else flushed as closed
+                fout.flush()
+        if self.meas is not None:
+            self.add_meas(items)
+        self.nbatch += 1
+        SlTrace.lg(f"Wrote {len(items)} lines to {len(written)} files",
+                   "server")
+
+    def add_meas(self, items):
+        """ Add lines' measurements, a block of lines of one data
+        type at a time
+        :items: list of (ordinal, line, records)
+        """
+        block_type = None
+        ordinals = []
+        datas_rows = []
+        for ordinal, _, records in items:
+            for data_type, datas, *_ in records:
+                if ordinals and data_type != block_type:
+                    self.meas.add_columns(block_type, ordinals, datas_rows)
+                    ordinals = []
+                    datas_rows = []
+                block_type = data_type
+                ordinals.append(ordinal)
+                datas_rows.append(datas)
+        if ordinals:
+            self.meas.add_columns(block_type, ordinals, datas_rows)
+
+    def get_file(self, file_name):
+        """ Get open data file, appending
+        """
+        fout = self.files.get(file_name)
+        if fout is not None:
+            self.files.move_to_end(file_name)
+            return fout
+
+        if len(self.files) >= self.max_open:
+            _, old_file = self.files.popitem(last=False)
+            old_file.close()
+        fout = self.files[file_name] = open(file_name, "a")
+        return fout
+
+    def close_files(self):
+        for fout in self.files.values():
+            fout.close()
+        self.files = OrderedDict()
+
+
+async def send_lines(lines, host=HOST, port=PORT):
+    """ Send lines to a MeasServer
+    :lines: iterable of text lines
+    :returns: list of response lines, one per line sent
+    """
+    reader, writer = await asyncio.open_connection(host, port)
+    lines = [line.rstrip("\r\n") for line in lines]
+    writer.write("".join(line + "\n" for line in lines).encode())
+    await writer.drain()
+    responses = [(await reader.readline()).decode().rstrip("\n")
+                 for _ in lines]
+    writer.close()
+    await writer.wait_closed()
+    return responses
+
+
+async def serve(args):
+    """ Load data_dir's files into measures and serve until interrupted
+    """
+    smeas = Smeasures()
+    smeas.add_std_plot_attrs()
+    meas_parser = MeasParser()
+    collect_files(glob_data_files(args.data_dir), smeas, meas_parser)
+    meas_server = MeasServer(args.data_dir, meas=smeas,
+                             queue_size=args.queue_size,
+                             batch_size=args.batch_size, year_str=args.year)
+    port = await meas_server.start(host=args.host, port=args.port)
+    SlTrace.lg(f"Serving {args.data_dir} on {args.host}:{port}"
+               f"  measurements loaded: {smeas.store.nmeas}")
+    try:
+        await asyncio.Event().wait()
+    finally:
+        await meas_server.stop()
+        SlTrace.lg(f"Lines: {meas_server.nline}"
+                   f"  measurements: {meas_server.nmeas}"
+                   f"  rejected: {meas_server.nerror}"
+                   f"  batches: {meas_server.nbatch}")
+        smeas.list_stats()
+
+
+async def send_file(args):
+    with open(args.send) as finp:
+        lines = finp.readlines()
+    for line, response in zip(lines, await send_lines(lines, host=args.host,
+                                                       port=args.port)):
+        if not response.startswith("ok") or args.list_input:
+            SlTrace.lg(f"{response:10}  {line.rstrip()}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--data_dir', dest='data_dir', default="../data")
+    parser.add_argument('--host', dest='host', default=HOST)
+    parser.add_argument('--port', type=int, dest='port', default=PORT)
+    parser.add_argument('--queue_size', type=int, dest='queue_size',
+                        default=1000)
+    parser.add_argument('--batch_size', type=int, dest='batch_size',
+                        default=500)
+    parser.add_argument('--year', dest='year', default=None)
+    parser.add_argument('--send', dest='send', default=None)
+    parser.add_argument('--list_input', type=str2bool, dest='list_input',
+                        default=False)
+    parser.add_argument('--trace', dest='trace', default="")
+    args = parser.parse_args()
+    if args.trace:
+        SlTrace.setFlags(args.trace)
+    try:
+        asyncio.run(send_file(args) if args.send is not None
+                    else serve(args))
+    except KeyboardInterrupt:
+        pass
@@ -0,0 +1,473 @@
+#meas_sqlite.py    18Oct2026
+""" SQLite measurement store - persistent alternative to MeasStore
+Tables:
+    mtypes  code, name          code is the store mtype code
+    meas    id, date, code, value, file
+            date - date ordinal, file - files.seq or NULL
+            indexed on (code, date) and file
+    files   seq, name, key, start_year, end_year
+            data files loaded, in order, with their fingerprint
+            and the years in effect at their start and end
+    agg     tier, code, bucket, count, total, sumsq, low, high, nin
+            day, week, month aggregates (MeasPyramid), saved on close
+    meta    key, value
+            agg_nmeas - measurements in agg, agg_limits - limits
+            its in range counts were made with
+Inserts are buffered and written with executemany, one transaction
+per block.  Queries are SQL: columns filtered by mtype and date
+range through the index, day and mtype counts by COUNT(DISTINCT),
+statistics from a GROUP BY value histogram, out of range counts
+and streaks (MeasRange) from the mtype's values in insertion order.
+Aggregates are read from agg when it matches the measurements,
+else rebuilt from them, and are updated as measurements are added.
+Saved aggregates are dropped when get_resume deletes measurements.
+A later run resumes at the first data file that was added or
+changed (get_resume), so unchanged history is not reparsed.
+Measurements not from a data file (file NULL, e.g. --follow
+additions) are dropped on resume, to be reread from their files.
+"""
+import json
+import os
+import sqlite3
+
+import numpy as np
+
+from select_error import SelectError
+
+from meas_parser import PARSER_VERSION
+from meas_stats import MeasStat
+from meas_range import MeasRange, classify, RANGE_IN
+from meas_pyramid import MeasPyramid
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS mtypes (
+    code INTEGER PRIMARY KEY,
+    name TEXT UNIQUE NOT NULL);
+CREATE TABLE IF NOT EXISTS meas (
+    id INTEGER PRIMARY KEY,
+    date INTEGER NOT NULL,
+    code INTEGER NOT NULL,
+    value INTEGER NOT NULL,
+    file INTEGER);
+CREATE INDEX IF NOT EXISTS meas_code_date ON meas (code, date);
+CREATE INDEX IF NOT EXISTS meas_file ON meas (file);
+CREATE TABLE IF NOT EXISTS files (
+    seq INTEGER PRIMARY KEY,
+    name TEXT NOT NULL,
+    key TEXT NOT NULL,
+    start_year TEXT,
+    end_year TEXT);
+CREATE TABLE IF NOT EXISTS agg (
+    tier INTEGER NOT NULL,
+    code INTEGER NOT NULL,
+    bucket INTEGER NOT NULL,
+    count INTEGER NOT NULL,
+    total INTEGER NOT NULL,
+    sumsq INTEGER NOT NULL,
+    low INTEGER NOT NULL,
+    high INTEGER NOT NULL,
+    nin INTEGER NOT NULL);
+CREATE TABLE IF NOT EXISTS meta (
+    key TEXT PRIMARY KEY,
+    value TEXT);
+"""
+
+
+class MeasSqliteStore:
+    """ Measurement store in an SQLite database file
+    """
+    PERSISTENT = True
+    KEEPS_MEAS = True
+    ORD_DTYPE = np.int32        # As MeasStore
+    CODE_DTYPE = np.int16
+    VAL_DTYPE = np.int64        # SQLite INTEGER
+    BATCH_SIZE = 10000          # Buffered appends per transaction
+
+    def __init__(self, db_file):
+        """ Open, creating if needed, store database
+        :db_file: database file, ":memory:" - not persistent
+        """
+        self.db_file = db_file
+        self.conn = sqlite3.connect(db_file)
+        with self.conn:
+            self.conn.executescript(SCHEMA)
+        self.mtype_names = []       # code -> mtype
+        self.mtype_codes = {}       # mtype -> code
+        for code, name in self.conn.execute(
+                "SELECT code, name FROM mtypes ORDER BY code"):
+            if code != len(self.mtype_names):
+                raise SelectError(f"{db_file}: mtype codes out of sequence")
+            self.mtype_names.append(name)
+            self.mtype_codes[name] = code
+        self.nmeas = self.count_meas()
+        self.file_seq = None        # files.seq of measurements being added
+        self.pending = []           # Buffered (date, code, value, file)
+        self.stats = {}             # mtype: MeasStat, until data changes
+        self.limits = {}            # mtype: (ms_low, ms_high)
+        self.ranges = {}            # mtype: MeasRange, until data changes
+        self.pyramid = None         # MeasPyramid, loaded on first use
+
+    def count_meas(self):
+        return self.conn.execute("SELECT COUNT(*) FROM meas").fetchone()[0]
+
+    def close(self):
+        """ Write buffered measurements and changed aggregates,
+        close database
+        """
+        self.flush()
+        self.save_pyramid()
+        self.conn.close()
+
+    def flush(self):
+        """ Write buffered measurements in one transaction
+        """
+        if not self.pending:
+            return
+        with self.conn:
+            self.conn.executemany(
+                "INSERT INTO meas (date, code, value, file) VALUES (?,?,?,?)",
+                self.pending)
+        self.pending = []
+
+    def get_code(self, mtype, create=False):
+        """ Get code for mtype
+        :mtype: measurement type
+        :create: True -> add mtype if not yet known
+        :returns: code, None if unknown and not create
+        """
+        code = self.mtype_codes.get(mtype)
+        if code is None and create:
+            code = len(self.mtype_names)
+            with self.conn:
+                self.conn.execute(
+                    "INSERT INTO mtypes (code, name) VALUES (?,?)",
+                    (code, mtype))
+            self.mtype_names.append(mtype)
+            self.mtype_codes[mtype] = code
+        return code
+
+    def append(self, ordinal, mtype, value):
+        """ Add one measurement
+        :ordinal: date ordinal
+        :mtype: measurement type
+        :value: measurement value
+        """
+        code = self.get_code(mtype, create=True)
+        self.pending.append((ordinal, code, value, self.file_seq))
+        if self.pyramid is not None and self.check_limits(code):
+            low, high = self.pyramid.limits.get(code, (None, None))
+            self.pyramid.add(code, ordinal, value,
+                             (low is None or value >= low)
+                             and (high is None or value <= high))
+        self.nmeas += 1
+        self.stats = {}
+        self.ranges = {}
+        if len(self.pending) >= self.BATCH_SIZE:
+            self.flush()
+
+    def extend_mapped(self, mtype_names, ordinals, codes, values):
+        """ Add a block of measurements, one transaction
+        :mtype_names: code -> mtype for codes
+        :ordinals: date ordinals
+        :codes: mtype codes, indexes into mtype_names
+        :values: measurement values
+        """
+        if len(ordinals) == 0:
+            return
+        self.flush()
+        code_map = [self.get_code(mtype, create=True) for mtype in mtype_names]
+        store_codes = np.array(code_map, dtype=np.int64)[codes]
+        files = [self.file_seq]*len(ordinals)
+        with self.conn:
+            self.conn.executemany(
+                "INSERT INTO meas (date, code, value, file) VALUES (?,?,?,?)",
+                zip(np.asarray(ordinals).tolist(), store_codes.tolist(),
+                    np.asarray(values).tolist(), files))
+        self.nmeas += len(ordinals)
+        self.stats = {}
+        self.ranges = {}
+        if self.pyramid is not None:
+            self.add_pyramid(np.asarray(ordinals), store_codes,
+                             np.asarray(values))
+
+    def set_file(self, file_name, year_str=None):
+        """ Record data file whose measurements follow
+        :file_name: data file, None - measurements not from a file
+        :year_str: year in effect at the start of the file, so at
+                the end of the previous file
+        """
+        self.flush()
+        with self.conn:
+            if self.file_seq is not None:
+                self.conn.execute(
+                    "UPDATE files SET end_year = ? WHERE seq = ?",
+                    (year_str, self.file_seq))
+            self.file_seq = None
+            if file_name is not None:
+                self.file_seq = self.conn.execute(
+                    "INSERT INTO files (name, key, start_year) VALUES (?,?,?)",
+                    (os.path.abspath(file_name), self.file_key(file_name),
+                     year_str)).lastrowid
+
+    def file_key(self, file_name):
+        """ Fingerprint of file contents and parser version
+        """
+        st = os.stat(file_name)
+        return json.dumps([PARSER_VERSION, st.st_size, st.st_mtime_ns])
+
+    def get_resume(self, file_names, file_years=None):
+        """ Find where loading file_names can resume, dropping
+        measurements of files added or changed since stored
+        :file_names: data files, in load order
+        :file_years: dict to receive file_name: year_str at the start
+                    of each stored file default: not recorded
+        :returns: (index of first file to load,
+                    year_str at its start, None - caller's start year)
+        """
+        self.set_file(None)
+        stored = self.conn.execute(
+            "SELECT seq, name, key, start_year, end_year FROM files"
+            " ORDER BY seq").fetchall()
+        nsame = 0
+        for file_name, (_, name, key, _, end_year) in zip(file_names, stored):
+            if (end_year is None or os.path.abspath(file_name) != name
+                    or self.file_key(file_name) != key):
+                break           # Changed, or load was not completed
+            nsame += 1
+        ndelete = 0
+        with self.conn:
+            if nsame < len(stored):
+                first_seq = stored[nsame][0]
+                ndelete += self.conn.execute(
+                    "DELETE FROM meas WHERE file >= ?", (first_seq,)).rowcount
+                self.conn.execute("DELETE FROM files WHERE seq >= ?",
+                                  (first_seq,))
+            ndelete += self.conn.execute(
+                "DELETE FROM meas WHERE file IS NULL").rowcount
+            if ndelete > 0:
+                # Replacement rows may restore the count, so saved
+                # aggregates can't be matched by agg_nmeas
+                self.conn.execute("DELETE FROM agg")
+                self.conn.execute("DELETE FROM meta WHERE key IN"
+                                  " ('agg_nmeas', 'agg_limits')")
+        if file_years is not None:
+            for i in range(nsame):
+                file_years[file_names[i]] = stored[i][3]
+        year_str = stored[nsame-1][4] if nsame > 0 else None
+        nmeas = self.count_meas()
+        if ndelete > 0:
+            self.pyramid = None     # Rebuilt when next used
+        self.nmeas = nmeas
+        self.stats = {}
+        self.ranges = {}
+        return nsame, year_str
+
+    def get_columns(self, mtypes, date_sorted=True, start=None, end=None):
+        """ Get measurement columns of mtypes
+        :mtypes: list of mtypes
+        :date_sorted: True -> ascending date, else insertion order
+        :start: earliest date ordinal default: no limit
+        :end: latest date ordinal default: no limit
+        :returns: (ords, codes, vals) arrays
+        """
+        self.flush()
+        codes = [self.mtype_codes[mtype] for mtype in mtypes
+                    if mtype in self.mtype_codes]
+        sql = (f"SELECT date, code, value FROM meas"
+               f" WHERE code IN ({','.join('?'*len(codes))})")
+        params = list(codes)
+        if start is not None:
+            sql += " AND date >= ?"
+            params.append(start)
+        if end is not None:
+            sql += " AND date <= ?"
+            params.append(end)
+        sql += " ORDER BY date, id" if date_sorted else " ORDER BY id"
+        return self.rows_to_columns(self.conn.execute(sql, params).fetchall())
+
+    def get_added(self, start):
+        """ Get measurements added after the first start
+        :start: number of measurements already seen
+        :returns: (ords, codes, vals) arrays, in insertion order
+        """
+        self.flush()
+        return self.rows_to_columns(self.conn.execute(
+            "SELECT date, code, value FROM meas ORDER BY id LIMIT -1 OFFSET ?",
+            (start,)).fetchall())
+
+    @classmethod
+    def rows_to_columns(cls, rows):
+        """ (date, code, value) rows to (ords, codes, vals) arrays
+        """
+        if not rows:
+            return (np.empty(0, dtype=cls.ORD_DTYPE),
+                    np.empty(0, dtype=cls.CODE_DTYPE),
+                    np.empty(0, dtype=cls.VAL_DTYPE))
+        cols = np.array(rows, dtype=np.int64)
+        return (cols[:, 0].astype(cls.ORD_DTYPE),
+                cols[:, 1].astype(cls.CODE_DTYPE),
+                cols[:, 2].astype(cls.VAL_DTYPE))
+
+    @property
+    def ords(self):
+        """ Date ordinals, in insertion order
+        """
+        return self.get_added(0)[0]
+
+    @property
+    def codes(self):
+        return self.get_added(0)[1]
+
+    @property
+    def vals(self):
+        return self.get_added(0)[2]
+
+    def get_stat(self, mtype):
+        """ Get statistics for mtype, from the value histogram
+        :returns: MeasStat, None if mtype unknown
+        """
+        code = self.mtype_codes.get(mtype)
+        if code is None:
+            return None
+        stat = self.stats.get(mtype)
+        if stat is None:
+            self.flush()
+            hist = np.array(self.conn.execute(
+                "SELECT value, COUNT(*) FROM meas WHERE code = ?"
+                " GROUP BY value", (code,)).fetchall(),
+                dtype=np.int64).reshape(-1, 2)
+            stat = self.stats[mtype] = MeasStat(mtype)
+            stat.add_counts(hist[:, 0], hist[:, 1])
+        return stat
+
+    def set_limits(self, mtype, low=None, high=None):
+        """ Set mtype's in range limits
+        """
+        self.limits[mtype] = (low, high)
+        self.ranges.pop(mtype, None)
+        code = self.mtype_codes.get(mtype)
+        if self.pyramid is not None and code is not None:
+            self.check_limits(code)
+
+    def get_pyramid(self):
+        """ Get aggregates, loading or rebuilding on first use
+        """
+        if self.pyramid is None:
+            self.flush()
+            meta = dict(self.conn.execute("SELECT key, value FROM meta"))
+            if meta.get("agg_nmeas") == str(self.nmeas):
+                self.pyramid = MeasPyramid()
+                for code, limits in json.loads(meta["agg_limits"]).items():
+                    self.pyramid.set_limits(int(code), *limits)
+                self.pyramid.add_rows(self.conn.execute(
+                    "SELECT tier, code, bucket, count, total, sumsq, low, high,"
+                    " nin FROM agg"))
+                self.pyramid.changed = False
+                for code in range(len(self.mtype_names)):
+                    if not self.check_limits(code):
+                        break
+            if self.pyramid is None:        # Limits changed, rebuild
+                self.pyramid = MeasPyramid()
+                self.add_pyramid(*self.get_added(0))
+        return self.pyramid
+
+    def add_pyramid(self, ords, codes, vals):
+        """ Add measurements to loaded aggregates
+        """
+        for code in np.unique(codes).tolist():
+            if not self.check_limits(code):
+                return
+            sel = codes == code
+            code_vals = vals[sel]
+            low, high = self.pyramid.limits.get(code, (None, None))
+            self.pyramid.add_values(code, ords[sel], code_vals,
+                                    classify(code_vals, low, high) == RANGE_IN)
+
+    def check_limits(self, code):
+        """ Check aggregates' in range counts of code were made with
+        its current limits, else drop aggregates, to be rebuilt
+        :returns: True if aggregates are still loaded
+        """
+        limits = self.limits.get(self.mtype_names[code], (None, None))
+        if code not in self.pyramid.limits:
+            self.pyramid.set_limits(code, *limits)      # New code
+        elif self.pyramid.limits[code] != limits:
+            self.pyramid = None
+            return False
+        return True
+
+    def save_pyramid(self):
+        """ Write changed aggregates
+        """
+        if self.pyramid is None or not self.pyramid.changed:
+            return
+        with self.conn:
+            self.conn.execute("DELETE FROM agg")
+            self.conn.executemany(
+                "INSERT INTO agg VALUES (?,?,?,?,?,?,?,?,?)",
+                self.pyramid.to_rows())
+            self.conn.executemany(
+                "INSERT OR REPLACE INTO meta (key, value) VALUES (?,?)",
+                [("agg_nmeas", str(self.nmeas)),
+                 ("agg_limits", json.dumps(self.pyramid.limits))])
+        self.pyramid.changed = False
+
+    def get_tier(self, mtype, tier, start=None, end=None):
+        """ Get mtype's day, week or month aggregates
+        :returns: MeasPyramid.get_tier arrays, None if mtype unknown
+        """
+        code = self.mtype_codes.get(mtype)
+        if code is None:
+            return None
+        return self.get_pyramid().get_tier(code, tier, start=start, end=end)
+
+    def get_summary(self, mtype, start=None, end=None):
+        """ Get mtype's statistics over a date range, from aggregates
+        :returns: MeasSummary, None if mtype unknown
+        """
+        code = self.mtype_codes.get(mtype)
+        if code is None:
+            return None
+        return self.get_pyramid().get_summary(code, mtype, start=start,
+                                              end=end)
+
+    def get_range(self, mtype):
+        """ Get out of range counts and streaks for mtype
+        :returns: MeasRange, None if mtype unknown
+        """
+        code = self.mtype_codes.get(mtype)
+        if code is None:
+            return None
+        meas_range = self.ranges.get(mtype)
+        if meas_range is None:
+            self.flush()
+            ords, _, vals = self.rows_to_columns(self.conn.execute(
+                "SELECT date, code, value FROM meas WHERE code = ?"
+                " ORDER BY id", (code,)).fetchall())
+            meas_range = self.ranges[mtype] = MeasRange(
+                    mtype, *self.limits.get(mtype, (None, None)))
+            meas_range.add_values(ords, vals)
+        return meas_range
+
+    def get_range_columns(self, mtype, date_sorted=True, start=None, end=None):
+        """ Get measurements of mtype with their range classes
+        :returns: (ords, vals, classes) arrays
+        """
+        ords, _, vals = self.get_columns([mtype], date_sorted=date_sorted,
+                                         start=start, end=end)
+        return ords, vals, classify(vals, *self.limits.get(mtype,
+                                                           (None, None)))
+
+    def get_mtypes(self):
+        """ Return set of mtypes with at least one measurement
+        """
+        self.flush()
+        return {self.mtype_names[code] for (code,) in self.conn.execute(
+                    "SELECT DISTINCT code FROM meas")}
+
+    def get_nday(self):
+        """ Number of distinct measurement dates
+        """
+        self.flush()
+        return self.conn.execute(
+            "SELECT COUNT(DISTINCT date) FROM meas").fetchone()[0]
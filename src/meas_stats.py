@@ -0,0 +1,183 @@
+#meas_stats.py    18Oct2026
+""" Running measurement statistics
+Updated as each measurement, or block of measurements, is added
+so statistics cost O(1) (median/percentiles O(value range))
+regardless of the number of measurements.
+Measurement values are integers so an integer histogram gives
+exact median/percentiles in memory bounded by the value range,
+not the history length.
+"""
+import math
+
+import numpy as np
+
+
+class IntHist:
+    """ Count of each integer value, range grown as needed
+    """
+    def __init__(self):
+        self.low = 0                # value of counts[0]
+        self.counts = np.zeros(0, dtype=np.int64)
+        self.nnonzero = 0           # Number of distinct values
+
+    def add(self, value):
+        """ Count one value
+        """
+        i = value - self.low
+        if i < 0 or i >= len(self.counts):
+            self._cover(value, value)
+            i = value - self.low
+        count = self.counts[i]
+        if count == 0:
+            self.nnonzero += 1
+        self.counts[i] = count + 1
+
+    def add_values(self, values):
+        """ Count array of values
+        """
+        if len(values) == 0:
+            return
+
+        self._cover(int(values.min()), int(values.max()))
+        self.counts += np.bincount(values.astype(np.int64) - self.low,
+                                   minlength=len(self.counts))
+        self.nnonzero = int(np.count_nonzero(self.counts))
+
+    def add_counts(self, values, counts):
+        """ Count distinct values, each counts times
+        :values: array of distinct values
+        :counts: array of counts
+        """
+        if len(values) == 0:
+            return
+
+        self._cover(int(values.min()), int(values.max()))
+        self.counts[values - self.low] += counts
+        self.nnonzero = int(np.count_nonzero(self.counts))
+
+    def _cover(self, vmin, vmax):
+        """ Extend range to include vmin..vmax, with room to grow
+        """
+        if len(self.counts) == 0:
+            self.low = vmin
+            self.counts = np.zeros(vmax - vmin + 1, dtype=np.int64)
+            return
+
+        high = self.low + len(self.counts) - 1
+        if vmin >= self.low and vmax <= high:
+            return
+        slack = len(self.counts)
+        new_low = min(self.low, vmin - slack) if vmin < self.low else self.low
+        new_high = max(high, vmax + slack) if vmax > high else high
+        counts = np.zeros(new_high - new_low + 1, dtype=np.int64)
+        start = self.low - new_low
+        counts[start:start+len(self.counts)] = self.counts
+        self.low = new_low
+        self.counts = counts
+
+    def value_at(self, rank):
+        """ Value at rank (0 - lowest) in sorted order
+        """
+        cum = np.cumsum(self.counts)
+        return self.low + int(np.searchsorted(cum, rank, side='right'))
+
+
+class MeasStat:
+    """ Running statistics for one measurement type
+    """
+    def __init__(self, mtype):
+        self.mtype = mtype
+        self.count = 0
+        self.min = None
+        self.max = None
+        self.sum = 0                # Exact integer sums
+        self.sumsq = 0
+        self.hist = IntHist()
+
+    def add(self, value):
+        """ Add one measurement value
+        """
+        value = int(value)
+        self.count += 1
+        if self.min is None or value < self.min:
+            self.min = value
+        if self.max is None or value > self.max:
+            self.max = value
+        self.sum += value
+        self.sumsq += value*value
+        self.hist.add(value)
+
+    def add_values(self, values):
+        """ Add array of measurement values
+        """
+        if len(values) == 0:
+            return
+
+        values = values.astype(np.int64)
+        vmin = int(values.min())
+        vmax = int(values.max())
+        self.count += len(values)
+        self.min = vmin if self.min is None else min(self.min, vmin)
+        self.max = vmax if self.max is None else max(self.max, vmax)
+        self.sum += int(values.sum())
+        self.sumsq += int((values*values).sum())
+        self.hist.add_values(values)
+
+    def add_counts(self, values, counts):
+        """ Add value histogram e.g. from a GROUP BY value query
+        :values: array of distinct values
+        :counts: array of counts
+        """
+        if len(values) == 0:
+            return
+
+        values = values.astype(np.int64)
+        counts = counts.astype(np.int64)
+        vmin = int(values.min())
+        vmax = int(values.max())
+        self.count += int(counts.sum())
+        self.min = vmin if self.min is None else min(self.min, vmin)
+        self.max = vmax if self.max is None else max(self.max, vmax)
+        self.sum += int((values*counts).sum())
+        self.sumsq += int((values*values*counts).sum())
+        self.hist.add_counts(values, counts)
+
+    @property
+    def mean(self):
+        if self.count == 0:
+            return None
+        return self.sum/self.count
+
+    @property
+    def variance(self):
+        """ Sample variance, 0 if fewer than 2 values
+        """
+        n = self.count
+        if n < 2:
+            return 0.0
+        return (n*self.sumsq - self.sum*self.sum)/(n*(n-1))
+
+    @property
+    def stdev(self):
+        return math.sqrt(self.variance)
+
+    @property
+    def median(self):
+        return self.percentile(50)
+
+    def percentile(self, pct):
+        """ Exact percentile, linear interpolation between
+        closest ranks (as numpy.percentile, statistics.median)
+        :pct: percent 0-100
+        :returns: value, None if no values
+        """
+        if self.count == 0:
+            return None
+        pos = pct/100*(self.count-1)
+        rank_low = math.floor(pos)
+        rank_high = math.ceil(pos)
+        v_low = self.hist.value_at(rank_low)
+        if rank_high == rank_low:
+            return float(v_low)
+        v_high = self.hist.value_at(rank_high)
+        return v_low + (v_high-v_low)*(pos-rank_low)
@@ -0,0 +1,444 @@
+#meas_store.py    18Oct2026, columnar storage for Smeasures
+""" Columnar measurement storage
+Measurements are held in three parallel typed arrays:
+    ords  - date ordinal (date.toordinal())
+    codes - mtype code (index into mtype_names)
+    vals  - measurement value
+Per-mtype, date sorted, index views, with their date ordinals
+for bisected date range lookup, are built on demand and dropped
+whenever measurements are added.
+Per-mtype running statistics and the distinct day count are
+updated as measurements are added.
+Each measurement is also classified against its mtype's limits
+(set_limits) as it is added, into a fourth column:
+    classes - range class (meas_range RANGE_LOW, RANGE_IN, RANGE_HIGH)
+with per-mtype out of range counts and streaks (MeasRange).
+Day, week and month aggregates (MeasPyramid) are brought up to date,
+from the measurements added since, when next queried.
+"""
+from datetime import date
+import sys
+
+import numpy as np
+
+from select_error import SelectError
+
+from meas_stats import MeasStat, IntHist
+from meas_range import MeasRange, CLASS_DTYPE, RANGE_IN
+from meas_pyramid import MeasPyramid
+
+MAX_ORD = date.max.toordinal()
+
+
+def get_data_columns(mtypes, ordinals, datas, val_dtype=np.int32):
+    """ Unpack a block of data line values into measurement columns,
+    checked, in one step
+    :mtypes: mtype of each datas column
+    :ordinals: date ordinal of each line
+    :datas: values of each line, one column per mtype - strings,
+            "?" - no data (e.g. parser datas lists), or integers
+    :val_dtype: store value type, values must fit
+    :returns: (mtype_names, ords, codes, vals) for extend_mapped, in
+            line order, no data entries dropped, mtype_names those
+            with values, in order of first value
+    """
+    ordinals = np.asarray(ordinals, dtype=np.int64)
+    datas = np.asarray(datas)
+    if datas.size == 0:
+        datas = np.empty((len(datas), len(mtypes)), dtype=np.int64)
+    if (datas.ndim != 2 or len(datas) != len(ordinals)
+            or datas.shape[1] != len(mtypes)):
+        raise SelectError(f"Data block shape {datas.shape} doesn't match"
+                          f" {len(ordinals)} dates, {len(mtypes)} mtypes")
+    if datas.dtype.kind in "US":
+        present = datas != "?"
+        try:
+            vals = np.where(present, datas, "0").astype(np.int64)
+        except ValueError as e:
+            raise SelectError(f"Bad measurement value: {e}")
+    elif datas.dtype.kind in "iu":
+        present = np.ones(datas.shape, dtype=bool)
+        vals = datas.astype(np.int64)
+    else:
+        raise SelectError(f"Measurement values must be strings or"
+                          f" integers, not {datas.dtype}")
+    if len(ordinals) > 0 and (ordinals.min() < 1 or ordinals.max() > MAX_ORD):
+        raise SelectError("Date ordinal out of range")
+    rows, cols = np.nonzero(present)       # line order
+    vals = vals[rows, cols]
+    val_info = np.iinfo(val_dtype)
+    if len(vals) > 0 and (vals.min() < val_info.min
+                          or vals.max() > val_info.max):
+        raise SelectError(f"Measurement value outside {val_info.dtype} range")
+    used, first = np.unique(cols, return_index=True)
+    used = used[np.argsort(first)]
+    col_codes = np.zeros(len(mtypes), dtype=np.int16)
+    col_codes[used] = np.arange(len(used))
+    return ([mtypes[col] for col in used.tolist()], ordinals[rows],
+            col_codes[cols], vals)
+
+
+class MeasStore:
+    """ Growable columnar measurement arrays
+    """
+    ORD_DTYPE = np.int32
+    CODE_DTYPE = np.int16
+    VAL_DTYPE = np.int32
+    INIT_SIZE = 1024            # Initial array allocation
+    PERSISTENT = False          # In memory only (see MeasSqliteStore)
+    KEEPS_MEAS = True           # Measurements queryable (see MeasStatsStore)
+
+    def __init__(self):
+        self.mtype_names = []       # code -> mtype
+        self.mtype_codes = {}       # mtype -> code
+        self.nmeas = 0              # Number of measurements held
+        self.stats = []             # code -> MeasStat
+        self.day_hist = IntHist()   # Measurements per date ordinal
+        self.limits = {}            # mtype: (ms_low, ms_high)
+        self.ranges = []            # code -> MeasRange
+        self.pyramid = MeasPyramid()
+        self.npyramid = 0           # Measurements in pyramid
+        self._ords = np.empty(self.INIT_SIZE, dtype=self.ORD_DTYPE)
+        self._codes = np.empty(self.INIT_SIZE, dtype=self.CODE_DTYPE)
+        self._vals = np.empty(self.INIT_SIZE, dtype=self.VAL_DTYPE)
+        self._classes = np.empty(self.INIT_SIZE, dtype=CLASS_DTYPE)
+        self._views = None          # code -> date sorted index array
+        self._view_ords = None      # code -> date ordinals of view
+
+    @classmethod
+    def from_arrays(cls, mtype_names, ords, codes, vals):
+        """ Create store over existing column arrays, without copying
+        e.g. numpy.memmap columns of a MeasArchive.  Arrays are
+        copied, not modified, if measurements are added.
+        :mtype_names: code -> mtype list
+        :ords, codes, vals: equal length column arrays
+        """
+        store = cls()
+        for mtype in mtype_names:
+            store.get_code(mtype, create=True)
+        store._ords, store._codes, store._vals = ords, codes, vals
+        store._classes = np.empty(len(ords), dtype=CLASS_DTYPE)
+        store.nmeas = len(ords)
+        store._add_stats(ords, codes, vals, store._classes)
+        return store
+
+    @property
+    def ords(self):
+        """ Date ordinals, in insertion order
+        """
+        return self._ords[:self.nmeas]
+
+    @property
+    def codes(self):
+        """ mtype codes, in insertion order
+        """
+        return self._codes[:self.nmeas]
+
+    @property
+    def vals(self):
+        """ Measurement values, in insertion order
+        """
+        return self._vals[:self.nmeas]
+
+    @property
+    def classes(self):
+        """ Range classes, in insertion order
+        """
+        return self._classes[:self.nmeas]
+
+    def get_code(self, mtype, create=False):
+        """ Get code for mtype
+        :mtype: measurement type
+        :create: True -> add mtype if not yet known
+        :returns: code, None if unknown and not create
+        """
+        code = self.mtype_codes.get(mtype)
+        if code is None and create:
+            code = len(self.mtype_names)
+            if code > np.iinfo(self.CODE_DTYPE).max:
+                raise SelectError(f"Too many mtypes adding {mtype}")
+            mtype = sys.intern(mtype)
+            self.mtype_names.append(mtype)
+            self.mtype_codes[mtype] = code
+            self.stats.append(MeasStat(mtype))
+            self.ranges.append(MeasRange(mtype,
+                                         *self.limits.get(mtype, (None, None))))
+        return code
+
+    def set_limits(self, mtype, low=None, high=None):
+        """ Set mtype's in range limits, reclassifying any
+        measurements already held
+        :mtype: measurement type
+        :low: lowest in range value default: no limit
+        :high: highest in range value default: no limit
+        """
+        if self.limits.get(mtype, (None, None)) == (low, high):
+            return
+        self.limits[mtype] = (low, high)
+        code = self.mtype_codes.get(mtype)
+        if code is None:
+            return
+        meas_range = self.ranges[code] = MeasRange(mtype, low, high)
+        sel = self.codes == code
+        self.classes[sel] = meas_range.add_values(self.ords[sel],
+                                                  self.vals[sel])
+        self.pyramid.clear_code(code)
+        sel[self.npyramid:] = False     # rest added by update_pyramid
+        self.pyramid.set_limits(code, low, high)
+        self.pyramid.add_values(code, self.ords[sel], self.vals[sel],
+                                self.classes[sel] == RANGE_IN)
+
+    def get_range(self, mtype):
+        """ Get out of range counts and streaks for mtype
+        :returns: MeasRange, None if mtype unknown
+        """
+        code = self.mtype_codes.get(mtype)
+        if code is None:
+            return None
+        return self.ranges[code]
+
+    def update_pyramid(self):
+        """ Add measurements added since last query to aggregates
+        :returns: MeasPyramid
+        """
+        n = self.npyramid
+        if n < self.nmeas:
+            ords = self.ords[n:]
+            codes = self.codes[n:]
+            vals = self.vals[n:]
+            in_range = self.classes[n:] == RANGE_IN
+            for code in np.unique(codes).tolist():
+                if code not in self.pyramid.limits:
+                    self.pyramid.set_limits(code, *self.limits.get(
+                                            self.mtype_names[code],
+                                            (None, None)))
+                sel = codes == code
+                self.pyramid.add_values(code, ords[sel], vals[sel],
+                                        in_range[sel])
+            self.npyramid = self.nmeas
+        return self.pyramid
+
+    def get_tier(self, mtype, tier, start=None, end=None):
+        """ Get mtype's day, week or month aggregates
+        :returns: MeasPyramid.get_tier arrays, None if mtype unknown
+        """
+        code = self.mtype_codes.get(mtype)
+        if code is None:
+            return None
+        return self.update_pyramid().get_tier(code, tier, start=start,
+                                              end=end)
+
+    def get_summary(self, mtype, start=None, end=None):
+        """ Get mtype's statistics over a date range, from aggregates
+        :start: earliest date ordinal default: no limit
+        :end: latest date ordinal default: no limit
+        :returns: MeasSummary, None if mtype unknown
+        """
+        code = self.mtype_codes.get(mtype)
+        if code is None:
+            return None
+        return self.update_pyramid().get_summary(code, mtype, start=start,
+                                                 end=end)
+
+    def get_stat(self, mtype):
+        """ Get running statistics for mtype
+        :returns: MeasStat, None if mtype unknown
+        """
+        code = self.mtype_codes.get(mtype)
+        if code is None:
+            return None
+        return self.stats[code]
+
+    def append(self, ordinal, mtype, value):
+        """ Add one measurement
+        :ordinal: date ordinal
+        :mtype: measurement type
+        :value: measurement value
+        """
+        code = self.get_code(mtype, create=True)
+        self._reserve(1)
+        n = self.nmeas
+        self._ords[n] = ordinal
+        self._codes[n] = code
+        self._vals[n] = value
+        self._classes[n] = self.ranges[code].add(ordinal, value)
+        self.nmeas = n + 1
+        self._views = None
+        self.stats[code].add(value)
+        self.day_hist.add(ordinal)
+
+    def extend(self, ordinals, codes, values):
+        """ Add a block of measurements
+        :ordinals: date ordinals
+        :codes: mtype codes (from get_code)
+        :values: measurement values
+        """
+        nadd = len(ordinals)
+        if nadd == 0:
+            return
+        self._reserve(nadd)
+        n = self.nmeas
+        self._ords[n:n+nadd] = ordinals
+        self._codes[n:n+nadd] = codes
+        self._vals[n:n+nadd] = values
+        self.nmeas = n + nadd
+        self._views = None
+        self._add_stats(self._ords[n:n+nadd], self._codes[n:n+nadd],
+                        self._vals[n:n+nadd], self._classes[n:n+nadd])
+
+    def _add_stats(self, ords, codes, vals, classes):
+        """ Update running statistics and classify a block of
+        measurements
+        :classes: receives the block's range classes
+        """
+        self.day_hist.add_values(ords)
+        if len(codes) == 0:
+            return
+        for code in np.unique(codes).tolist():
+            sel = codes == code
+            code_vals = vals[sel]
+            self.stats[code].add_values(code_vals)
+            classes[sel] = self.ranges[code].add_values(ords[sel], code_vals)
+
+    def extend_mapped(self, mtype_names, ordinals, codes, values):
+        """ Add a block of measurements coded with another mtype list
+        :mtype_names: code -> mtype for codes
+        :ordinals: date ordinals
+        :codes: mtype codes, indexes into mtype_names
+        :values: measurement values
+        """
+        if len(mtype_names) > 0:
+            code_map = np.array([self.get_code(mtype, create=True)
+                                 for mtype in mtype_names],
+                                dtype=self.CODE_DTYPE)
+            codes = code_map[codes]
+        self.extend(ordinals, codes, values)
+
+    def _reserve(self, nadd):
+        """ Ensure room for nadd more measurements, doubling as needed
+        Read-only (e.g. mapped) columns are copied first
+        """
+        need = self.nmeas + nadd
+        size = len(self._ords)
+        if need <= size and self._ords.flags.writeable:
+            return
+        size = max(size, self.INIT_SIZE)
+        while size < need:
+            size *= 2
+        self._ords = self._grow(self._ords, size, self.ORD_DTYPE)
+        self._codes = self._grow(self._codes, size, self.CODE_DTYPE)
+        self._vals = self._grow(self._vals, size, self.VAL_DTYPE)
+        self._classes = self._grow(self._classes, size, CLASS_DTYPE)
+
+    def _grow(self, arr, size, dtype):
+        new_arr = np.empty(size, dtype=dtype)
+        new_arr[:self.nmeas] = arr[:self.nmeas]
+        return new_arr
+
+    def _build_views(self):
+        """ Build per-mtype index arrays, sorted by date then
+        insertion order, in one pass
+        """
+        order = np.lexsort((self.ords, self.codes))
+        sorted_codes = self.codes[order]
+        ncode = len(self.mtype_names)
+        bounds = np.searchsorted(sorted_codes, np.arange(ncode+1))
+        sorted_ords = self.ords[order]
+        self._views = {}
+        self._view_ords = {}
+        for code in range(ncode):
+            self._views[code] = order[bounds[code]:bounds[code+1]]
+            self._view_ords[code] = sorted_ords[bounds[code]:bounds[code+1]]
+
+    def get_index(self, mtypes, date_sorted=True, start=None, end=None):
+        """ Get index array of measurements of mtypes
+        :mtypes: list of mtypes
+        :date_sorted: True -> ascending date, else insertion order
+                    ties are always in insertion order
+        :start: earliest date ordinal default: no limit
+        :end: latest date ordinal default: no limit
+        :returns: index array into ords, codes, vals
+        """
+        if self._views is None:
+            self._build_views()
+        parts = []
+        for mtype in mtypes:
+            code = self.mtype_codes.get(mtype)
+            if code is not None:
+                view = self._views[code]
+                if start is not None or end is not None:
+                    view_ords = self._view_ords[code]   # bisect date range
+                    i_start = 0 if start is None else np.searchsorted(
+                                            view_ords, start, side='left')
+                    i_end = len(view) if end is None else np.searchsorted(
+                                            view_ords, end, side='right')
+                    view = view[i_start:i_end]
+                parts.append(view)
+        if len(parts) == 0:
+            return np.empty(0, dtype=np.intp)
+        if len(parts) == 1:
+            idx = parts[0]
+            return idx if date_sorted else np.sort(idx)
+        idx = np.sort(np.concatenate(parts))   # Insertion order
+        if date_sorted:
+            idx = idx[np.argsort(self.ords[idx], kind="stable")]
+        return idx
+
+    def get_columns(self, mtypes, date_sorted=True, start=None, end=None):
+        """ Get measurement columns of mtypes
+        :mtypes: list of mtypes
+        :date_sorted: True -> ascending date, else insertion order
+        :start: earliest date ordinal default: no limit
+        :end: latest date ordinal default: no limit
+        :returns: (ords, codes, vals) arrays
+        """
+        idx = self.get_index(mtypes, date_sorted=date_sorted,
+                             start=start, end=end)
+        return self.ords[idx], self.codes[idx], self.vals[idx]
+
+    def get_range_columns(self, mtype, date_sorted=True, start=None, end=None):
+        """ Get measurements of mtype with their range classes
+        :mtype: measurement type
+        :date_sorted: True -> ascending date, else insertion order
+        :start: earliest date ordinal default: no limit
+        :end: latest date ordinal default: no limit
+        :returns: (ords, vals, classes) arrays
+        """
+        idx = self.get_index([mtype], date_sorted=date_sorted,
+                             start=start, end=end)
+        return self.ords[idx], self.vals[idx], self.classes[idx]
+
+    def get_added(self, start):
+        """ Get measurements added after the first start
+        :start: number of measurements already seen
+        :returns: (ords, codes, vals) arrays, in insertion order
+        """
+        return (self.ords[start:], self.codes[start:], self.vals[start:])
+
+    def set_file(self, file_name, year_str=None):
+        """ Note data file whose measurements follow - only
+        persistent stores track files
+        """
+        pass
+
+    def get_resume(self, file_names, file_years=None):
+        """ Find where loading file_names can resume - only
+        persistent stores hold files between runs
+        :returns: (0 - load all files, None - caller's start year)
+        """
+        return 0, None
+
+    def close(self):
+        """ Release store - nothing to write
+        """
+        pass
+
+    def get_mtypes(self):
+        """ Return set of mtypes with at least one measurement
+        """
+        return {stat.mtype for stat in self.stats if stat.count > 0}
+
+    def get_nday(self):
+        """ Number of distinct measurement dates
+        """
+        return self.day_hist.nnonzero
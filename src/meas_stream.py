@@ -0,0 +1,324 @@
+#meas_stream.py    18Oct2026
+""" Streaming measurement pipeline
+Input is read as a stream of typed records, MeasRecord(ordinal,
+mtype, value), passed through generator stages, one record at a
+time, into a sink:
+    records = read_files(file_names)        # data files, archives, "-"
+    records = select(records, mtypes=["sg_m"], start=start, end=end)
+    records = dedupe(records)
+    smeas = Smeasures(store=MeasStatsStore())
+    smeas.add_records(records)              # sink
+    smeas.list_stats()
+Nothing holds more than a block of records, so statistics over any
+amount of input - many or large data files, concatenated archives,
+stdin - run in memory bounded by the value and date ranges, not by
+the number of readings:
+    MeasStatsStore  Smeasures store keeping running statistics, out
+                    of range counts and day, week, month aggregates
+                    but not the measurements
+    aggregate       stage yielding each mtype's day, week or month
+                    summaries as its buckets complete
+Only a MeasStore sink (e.g. for plotting) holds every measurement.
+"""
+from collections import namedtuple, OrderedDict
+from datetime import date
+import itertools
+import sys
+
+import numpy as np
+
+from select_error import SelectError
+
+from meas_parser import MeasParser
+from meas_ingest import data_mtypes
+from meas_date import get_ordinal
+from meas_archive import is_archive, open_columns
+from meas_files import open_lines
+from meas_store import MeasStore
+from meas_range import MeasRange, CLASS_DTYPE, RANGE_IN
+from meas_pyramid import MeasSummary, get_bucket
+
+BLOCK_SIZE = 4096           # Records per block added to a store
+
+MeasRecord = namedtuple("MeasRecord", ["ordinal", "mtype", "value"])
+
+
+def read_lines(lines, meas_parser=None, base_name=""):
+    """ Parse data file lines into records
+    :lines: iterable of text lines e.g. open file, sys.stdin
+    :meas_parser: MeasParser, its year carried over
+                default: new parser
+    :base_name: name for listing/error messages
+    :returns: generator of MeasRecord, in line order
+    """
+    if meas_parser is None:
+        meas_parser = MeasParser()
+    for data_type, datas, month_str, day_str, year_str in (
+            meas_parser.parse_lines(lines, base_name=base_name)):
+        mtypes = data_mtypes.get(data_type)
+        if mtypes is None:
+            raise SelectError(f"Unrecognized data type:{data_type}")
+        ordinal = get_ordinal(month_str, day_str, year_str)
+        for mtype, data in zip(mtypes, datas):
+            if data != "?":
+                yield MeasRecord(ordinal, mtype, int(data))
+
+
+def read_archive_records(file_name):
+    """ Read an archive's records, a block at a time from its
+    memory mapped columns
+    :file_name: archive file path
+    :returns: generator of MeasRecord, in archive order
+    """
+    mtype_names, ords, codes, vals = open_columns(file_name)
+    for start in range(0, len(ords), BLOCK_SIZE):
+        end = start + BLOCK_SIZE
+        for ordinal, code, value in zip(ords[start:end].tolist(),
+                                        codes[start:end].tolist(),
+                                        vals[start:end].tolist()):
+            yield MeasRecord(ordinal, mtype_names[code], value)
+
+
+def read_files(file_names, meas_parser=None):
+    """ Read records of files, in order
+    :file_names: data files, plain or compressed, or archives,
+                "-" - data lines from stdin
+    :meas_parser: MeasParser supplying and receiving the year carried
+                from file to file default: new parser
+    :returns: generator of MeasRecord
+    """
+    if meas_parser is None:
+        meas_parser = MeasParser()
+    for file_name in file_names:
+        meas_parser.start_file()
+        if file_name == "-":
+            yield from read_lines(sys.stdin, meas_parser, base_name="stdin")
+        elif is_archive(file_name):
+            yield from read_archive_records(file_name)
+        else:
+            with open_lines(file_name) as lines:
+                yield from read_lines(lines, meas_parser, base_name=file_name)
+
+
+def select(records, mtypes=None, start=None, end=None):
+    """ Pass records of mtypes within a date range
+    :records: iterable of MeasRecord
+    :mtypes: list of mtypes default: all
+    :start: earliest date default: no limit
+    :end: latest date default: no limit
+    :returns: generator of MeasRecord
+    """
+    mtypes = None if mtypes is None else set(mtypes)
+    start_ord = None if start is None else start.toordinal()
+    end_ord = None if end is None else end.toordinal()
+    for record in records:
+        if mtypes is not None and record.mtype not in mtypes:
+            continue
+        if start_ord is not None and record.ordinal < start_ord:
+            continue
+        if end_ord is not None and record.ordinal > end_ord:
+            continue
+        yield record
+
+
+def dedupe(records, ndays=None):
+    """ Drop repeated days e.g. from overlapping files or archives
+    Records are taken a day at a time - a run of records of one date
+    - and a day's run is dropped if the same readings, in the same
+    order, were already passed for that date.  Repeated readings
+    within a day are kept.  Memory grows with the number of dates,
+    as the store's day counts do, not with repeats.
+    :records: iterable of MeasRecord
+    :ndays: remember only the ndays dates most recently seen,
+                repeats further apart pass default: all dates
+    :returns: generator of MeasRecord
+    """
+    seen = OrderedDict()        # ordinal: set of day runs, recent last
+    day = []                    # Current run of one date
+    for record in itertools.chain(records, [None]):
+        if day and (record is None or record.ordinal != day[0].ordinal):
+            ordinal = day[0].ordinal
+            run = tuple((mtype, value) for _, mtype, value in day)
+            day_runs = seen.get(ordinal)
+            if day_runs is None:
+                day_runs = seen[ordinal] = set()
+                if ndays is not None and len(seen) > ndays:
+                    seen.popitem(last=False)
+            else:
+                seen.move_to_end(ordinal)
+            if run not in day_runs:
+                day_runs.add(run)
+                yield from day
+            day = []
+        if record is not None:
+            day.append(record)
+
+
+def aggregate(records, tier, limits=None):
+    """ Summarize each mtype's records by day, week or month
+    A bucket's summary is yielded when a record of the mtype falls in
+    another bucket, and at the end, so date ordered input gives one
+    summary per bucket; out of order records start a new summary.
+    :records: iterable of MeasRecord
+    :tier: "day", "week", "month"
+    :limits: dict of mtype: (low, high) for in range percents
+                default: none
+    :returns: generator of (bucket date, MeasSummary)
+    """
+    if limits is None:
+        limits = {}
+    open_buckets = {}           # mtype: [bucket, count, total, sumsq,
+                                #           low, high, nin]
+    for ordinal, mtype, value in records:
+        bucket = get_bucket(tier, ordinal)
+        acc = open_buckets.get(mtype)
+        if acc is not None and acc[0] != bucket:
+            yield get_bucket_summary(mtype, acc, limits)
+            acc = None
+        if acc is None:
+            acc = open_buckets[mtype] = [bucket, 0, 0, 0, value, value, 0]
+        acc[1] += 1
+        acc[2] += value
+        acc[3] += value*value
+        if value < acc[4]:
+            acc[4] = value
+        if value > acc[5]:
+            acc[5] = value
+        low, high = limits.get(mtype, (None, None))
+        if (low is None or value >= low) and (high is None or value <= high):
+            acc[6] += 1
+    for mtype, acc in open_buckets.items():
+        yield get_bucket_summary(mtype, acc, limits)
+
+
+def get_bucket_summary(mtype, acc, limits):
+    """ Summary of an aggregate stage bucket
+    :returns: (bucket date, MeasSummary)
+    """
+    bucket, count, total, sumsq, low, high, nin = acc
+    return (date.fromordinal(bucket),
+            MeasSummary(mtype, count=count, total=total, sumsq=sumsq,
+                        low=low, high=high, nin=nin,
+                        has_limits=limits.get(mtype, (None, None))
+                                   != (None, None)))
+
+
+def get_blocks(records, block_size=BLOCK_SIZE):
+    """ Group records into column blocks
+    :records: iterable of MeasRecord
+    :block_size: records per block, at most
+    :returns: generator of (mtype_names, ords, codes, vals), codes
+                indexes into mtype_names, for store extend_mapped
+    """
+    mtype_names = []
+    mtype_codes = {}
+    ords = []
+    codes = []
+    vals = []
+    for ordinal, mtype, value in records:
+        code = mtype_codes.get(mtype)
+        if code is None:
+            code = mtype_codes[mtype] = len(mtype_names)
+            mtype_names.append(mtype)
+        ords.append(ordinal)
+        codes.append(code)
+        vals.append(value)
+        if len(ords) >= block_size:
+            yield (mtype_names, np.array(ords, dtype=np.int32),
+                   np.array(codes, dtype=np.int16),
+                   np.array(vals, dtype=np.int32))
+            ords = []
+            codes = []
+            vals = []
+    if ords:
+        yield (mtype_names, np.array(ords, dtype=np.int32),
+               np.array(codes, dtype=np.int16), np.array(vals, dtype=np.int32))
+
+
+class MeasStatsStore(MeasStore):
+    """ Statistics only store - a pipeline sink
+    Keeps running statistics, day counts, out of range counts and
+    streaks, and day, week, month aggregates of the measurements
+    added, but not the measurements themselves.  Queries needing
+    the measurements raise SelectError.
+    """
+    KEEPS_MEAS = False
+
+    def __init__(self):
+        super().__init__()
+        self._ords = self._codes = self._vals = self._classes = None
+
+    def set_limits(self, mtype, low=None, high=None):
+        """ Set mtype's in range limits, before its measurements
+        are added - they are not kept for reclassifying
+        """
+        if self.limits.get(mtype, (None, None)) == (low, high):
+            return
+        code = self.mtype_codes.get(mtype)
+        if code is not None and self.stats[code].count > 0:
+            raise SelectError(f"Can't change {mtype} limits"
+                              f" after its measurements")
+        self.limits[mtype] = (low, high)
+        if code is not None:
+            self.ranges[code] = MeasRange(mtype, low, high)
+            self.pyramid.set_limits(code, low, high)
+
+    def get_code(self, mtype, create=False):
+        is_new = create and mtype not in self.mtype_codes
+        code = super().get_code(mtype, create=create)
+        if is_new:
+            self.pyramid.set_limits(code, *self.limits.get(mtype,
+                                                           (None, None)))
+        return code
+
+    def update_pyramid(self):
+        return self.pyramid         # Aggregated as added
+
+    def append(self, ordinal, mtype, value):
+        """ Add one measurement
+        """
+        code = self.get_code(mtype, create=True)
+        range_class = self.ranges[code].add(ordinal, value)
+        self.pyramid.add(code, ordinal, value, range_class == RANGE_IN)
+        self.stats[code].add(value)
+        self.day_hist.add(ordinal)
+        self.nmeas += 1
+
+    def extend(self, ordinals, codes, values):
+        """ Add a block of measurements
+        """
+        nadd = len(ordinals)
+        if nadd == 0:
+            return
+        ordinals = np.asarray(ordinals)
+        codes = np.asarray(codes)
+        values = np.asarray(values)
+        classes = np.empty(nadd, dtype=CLASS_DTYPE)
+        self._add_stats(ordinals, codes, values, classes)
+        for code in np.unique(codes).tolist():
+            sel = codes == code
+            self.pyramid.add_values(code, ordinals[sel], values[sel],
+                                    classes[sel] == RANGE_IN)
+        self.nmeas += nadd
+
+    @property
+    def ords(self):
+        raise SelectError("Statistics only store keeps no measurements")
+
+    @property
+    def codes(self):
+        raise SelectError("Statistics only store keeps no measurements")
+
+    @property
+    def vals(self):
+        raise SelectError("Statistics only store keeps no measurements")
+
+    @property
+    def classes(self):
+        raise SelectError("Statistics only store keeps no measurements")
+
+    def get_index(self, mtypes, date_sorted=True, start=None, end=None):
+        raise SelectError("Statistics only store keeps no measurements")
+
+    def get_added(self, start):
+        raise SelectError("Statistics only store keeps no measurements")
@@ -0,0 +1,294 @@
+#meas_subjects.py    18Oct2026
+""" Subject partitioned measurements
+Each subject's data files are a partition: one directory of *.data
+files, plain or compressed (*.data.gz etc. see meas_files), with its
+own parse cache (dir/.meas_cache) and Smeasures.
+Subjects under a data directory are either listed in a manifest,
+data_dir/subjects.txt, one per line:
+    name  directory [file ...]  # directory relative to data_dir
+                                # files default: all its data files
+or, without a manifest, are each subdirectory holding *.data files,
+named by the subdirectory, plus data_dir itself, named by its base
+name, if it holds *.data files.  The original layout's subject,
+jenifer (jen/bp_1.data, jen/bp_2.data), is built in, in place of
+its subdirectory.
+The default subject, "dad" as originally, is data_dir's own files,
+else the only subject, else data_dir, with no files.
+Partitions are loaded only when a query needs them.  Statistics for
+many subjects are computed in parallel worker processes, each
+ingesting one subject and returning its running statistics.
+"""
+from concurrent.futures import ProcessPoolExecutor
+import os
+
+from select_trace import SlTrace
+from select_error import SelectError
+
+from smeasures import Smeasures
+from meas_parser import MeasParser
+from meas_ingest import collect_files
+from meas_cache import MeasCache
+from meas_files import glob_data_files
+
+MANIFEST_NAME = "subjects.txt"
+DEFAULT_SUBJECT = "dad"     # data_dir's own files, as originally
+BUILTIN_SUBJECTS = [        # Used without a manifest, if directory exists
+    ("jenifer", "jen", ["bp_1.data", "bp_2.data"]),     # name, dir, files
+]
+
+
+class SubjectSummary:
+    """ One subject's statistics, as returned by a worker
+    """
+    def __init__(self, subject, nday, stats):
+        """ Setup summary
+        :subject: subject name
+        :nday: number of measurement days
+        :stats: list of MeasStat, one per mtype
+        """
+        self.subject = subject
+        self.nday = nday
+        self.stats = stats
+
+
+def load_subject(subject_dir, file_names=None, use_cache=True,
+                 list_input=False):
+    """ Ingest one subject's data files
+    :subject_dir: subject partition directory
+    :file_names: data files default: all in subject_dir
+    :use_cache: True -> use subject_dir/.meas_cache parse cache
+    :list_input: True -> list each input line
+    :returns: Smeasures
+    """
+    if file_names is None:
+        file_names = get_data_files(subject_dir)
+    smeas = Smeasures()
+    meas_cache = None
+    if use_cache:
+        meas_cache = MeasCache(os.path.join(subject_dir, ".meas_cache"))
+    collect_files(file_names, smeas, MeasParser(list_input=list_input),
+                  cache=meas_cache)
+    return smeas
+
+
+def summarize_subject(subject, subject_dir, file_names=None, use_cache=True):
+    """ Ingest one subject, returning its statistics
+    - worker process entry
+    :subject: subject name
+    :subject_dir: subject partition directory
+    :file_names: data files default: all in subject_dir
+    :use_cache: True -> use parse cache
+    :returns: SubjectSummary
+    """
+    return get_summary(subject, load_subject(subject_dir,
+                                             file_names=file_names,
+                                             use_cache=use_cache))
+
+
+def get_summary(subject, smeas):
+    """ Get subject's statistics
+    :subject: subject name
+    :smeas: subject's Smeasures
+    :returns: SubjectSummary
+    """
+    stats = [smeas.get_stat(mtype) for mtype in sorted(smeas.get_mtypes())]
+    return SubjectSummary(subject, smeas.get_nday(), stats)
+
+
+def get_data_files(subject_dir):
+    """ Get subject's data files, plain or compressed, in name order
+    """
+    return glob_data_files(subject_dir)
+
+
+class MeasSubjects:
+    """ Subjects under a data directory, partitions loaded on demand
+    """
+    def __init__(self, data_dir, use_cache=True, list_input=False):
+        """ Find subjects
+        :data_dir: data directory
+        :use_cache: True -> use per subject parse caches
+        :list_input: True -> list each input line
+        """
+        self.data_dir = data_dir
+        self.use_cache = use_cache
+        self.list_input = list_input
+        self.subject_dirs = {}      # subject: directory
+        self.subject_files = {}     # subject: listed files, else all
+        self.smeases = {}           # subject: loaded Smeasures
+        if not os.path.isdir(data_dir):
+            raise SelectError(f"{data_dir} was not found"
+                              f" ({os.path.abspath(data_dir)})")
+        manifest = os.path.join(data_dir, MANIFEST_NAME)
+        if os.path.exists(manifest):
+            self.read_manifest(manifest)
+        else:
+            self.find_subjects()
+
+    def read_manifest(self, manifest):
+        """ Read subject manifest
+        """
+        with open(manifest) as finp:
+            for line_no, line in enumerate(finp, start=1):
+                fields = line.split("#", 1)[0].split()
+                if not fields:
+                    continue
+                if len(fields) < 2:
+                    raise SelectError(f"{manifest}:{line_no}:"
+                                      f" expected name directory [file ...]")
+                name, subject_dir, *files = fields
+                self.add_subject(name, os.path.join(self.data_dir,
+                                                    subject_dir), files)
+
+    def find_subjects(self):
+        """ Find subject directories holding data files
+        """
+        builtin_dirs = set()
+        for name, subject_dir, files in BUILTIN_SUBJECTS:
+            subject_dir = os.path.join(self.data_dir, subject_dir)
+            if os.path.isdir(subject_dir):
+                self.add_subject(name, subject_dir, files)
+                builtin_dirs.add(os.path.normpath(subject_dir))
+        if get_data_files(self.data_dir):
+            name = os.path.basename(os.path.abspath(self.data_dir))
+            self.add_subject(name, self.data_dir)
+        for entry in sorted(os.listdir(self.data_dir)):
+            subject_dir = os.path.join(self.data_dir, entry)
+            if (os.path.normpath(subject_dir) not in builtin_dirs
+                    and os.path.isdir(subject_dir)
+                    and get_data_files(subject_dir)):
+                self.add_subject(entry, subject_dir)
+
+    def add_subject(self, name, subject_dir, files=None):
+        """ Add subject
+        :name: subject name
+        :subject_dir: subject's directory
+        :files: subject's data files, in subject_dir
+                default: all its data files
+        """
+        self.subject_dirs[name] = subject_dir
+        if files:
+            self.subject_files[name] = [os.path.join(subject_dir, file_name)
+                                        for file_name in files]
+
+    def get_subjects(self):
+        """ Get subject names, in order
+        """
+        return list(self.subject_dirs)
+
+    def find(self, who=None):
+        """ Find subject by name or name prefix, case insensitive
+        :who: name or prefix, DEFAULT_SUBJECT - data_dir's own files,
+                else the only subject, else data_dir, with no files
+                default: DEFAULT_SUBJECT
+        :returns: subject name
+        """
+        if who is None:
+            who = DEFAULT_SUBJECT
+        if who in self.subject_dirs:
+            return who
+        matches = [subject for subject in self.subject_dirs
+                   if subject.lower().startswith(who.lower())]
+        if len(matches) == 1:
+            return matches[0]
+        if matches or who.lower() != DEFAULT_SUBJECT:
+            problem = "is ambiguous" if matches else "was not found"
+            raise SelectError(f"Subject {who} {problem} in {self.data_dir},"
+                              f" subjects: {', '.join(self.get_subjects())}")
+
+        for subject, subject_dir in self.subject_dirs.items():
+            if subject_dir == self.data_dir:
+                return subject
+        if len(self.subject_dirs) == 1:
+            return self.get_subjects()[0]
+        SlTrace.lg(f"No data files in {self.data_dir},"
+                   f" subjects: {', '.join(self.get_subjects())}")
+        self.subject_dirs[DEFAULT_SUBJECT] = self.data_dir
+        return DEFAULT_SUBJECT
+
+    def get_dir(self, subject):
+        """ Get subject's partition directory
+        """
+        return self.subject_dirs[subject]
+
+    def has_file_list(self, subject):
+        """ Check if subject's data files are listed (built in or
+        manifest), rather than all data files in its directory
+        """
+        return subject in self.subject_files
+
+    def get_files(self, subject):
+        """ Get subject's data files
+        """
+        file_names = self.subject_files.get(subject)
+        if file_names is None:
+            return get_data_files(self.get_dir(subject))
+        for file_name in file_names:
+            if not os.path.exists(file_name):
+                raise SelectError(f"{file_name} was not found"
+                                  f" ({os.path.abspath(file_name)})")
+        return file_names
+
+    def get_smeas(self, subject):
+        """ Get subject's measurements, loading the partition
+        on first use
+        :subject: subject name
+        :returns: Smeasures
+        """
+        smeas = self.smeases.get(subject)
+        if smeas is None:
+            smeas = self.smeases[subject] = load_subject(
+                                        self.get_dir(subject),
+                                        file_names=self.get_files(subject),
+                                        use_cache=self.use_cache,
+                                        list_input=self.list_input)
+        return smeas
+
+    def summarize(self, subjects=None, jobs=1):
+        """ Statistics for subjects, ingested concurrently
+        Loaded partitions are summarized in process.
+        :subjects: subject names default: all
+        :jobs: number of worker processes
+        :returns: list of SubjectSummary, in subjects order
+        """
+        if subjects is None:
+            subjects = self.get_subjects()
+        summaries = {}
+        to_load = []
+        for subject in subjects:
+            smeas = self.smeases.get(subject)
+            if smeas is None:
+                to_load.append(subject)
+                continue
+            summaries[subject] = get_summary(subject, smeas)
+        dirs = [self.get_dir(subject) for subject in to_load]
+        files = [self.get_files(subject) for subject in to_load]
+        use_caches = [self.use_cache]*len(to_load)
+        if jobs <= 1 or len(to_load) <= 1:
+            loaded = map(summarize_subject, to_load, dirs, files, use_caches)
+            summaries.update((summary.subject, summary) for summary in loaded)
+        else:
+            with ProcessPoolExecutor(max_workers=jobs) as pool:
+                loaded = pool.map(summarize_subject, to_load, dirs, files,
+                                  use_caches)
+                summaries.update((summary.subject, summary)
+                                 for summary in loaded)
+        return [summaries[subject] for subject in subjects]
+
+    def list_summary(self, subjects=None, jobs=1):
+        """ List cross subject summary table
+        :subjects: subject names default: all
+        :jobs: number of worker processes
+        """
+        summaries = self.summarize(subjects=subjects, jobs=jobs)
+        width = max([len("subject")] + [len(summary.subject)
+                                        for summary in summaries])
+        SlTrace.lg(f"{'subject':{width}} {'days':>5} {'mtype':6}"
+                   f" {'count':>7} {'low':>4} {'high':>4} {'avg':>6}"
+                   f" {'median':>6} {'stdev':>6}")
+        for summary in summaries:
+            for stat in summary.stats:
+                SlTrace.lg(f"{summary.subject:{width}} {summary.nday:5}"
+                           f" {stat.mtype:6} {stat.count:7}"
+                           f" {stat.min:4} {stat.max:4} {stat.mean:6.1f}"
+                           f" {stat.median:6.1f} {stat.stdev:6.1f}")
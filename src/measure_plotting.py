@@ -30,196 +30,261 @@ comments: #....
 Ignore anything else
 """
 import os
-import glob
-import re
 from datetime import date
 import argparse
 
-import statistics
-from matplotlib import pyplot as plt
-
 from select_trace import SlTrace
 from select_error import SelectError
-from crs_funs import str2bool, str2val
-from smeasure import Smeasure
-from smeasures import Smeasures, PlotAttr
-
-data_files = ["sugar_01.data", "sugar_02.data"]
-morning_low = None      # low moring value
-morning_high = None     # high morning value
-morning_sum = 0         # Sum of morning values
-evening_low = None      # low evening value
-evening_high = None     # high evening value
-evening_sum = 0         # Sum of evening values
-data_count = 0          # Count of measured days
+from crs_funs import str2bool
+from smeasures import Smeasures
+from meas_parser import MeasParser
+from meas_ingest import collect_files
+from meas_cache import MeasCache
+from meas_sqlite import MeasSqliteStore
+from meas_follow import MeasFollower
+from meas_report import read_batch, render_reports
+from meas_rolling import get_rolling_specs
+from meas_subjects import MeasSubjects
+from meas_profile import MeasProfile
 
-who = "dad"
+who = "dad"             # Subject name or prefix, "dad" - data_dir's own
+                        # files, else the only subject (meas_subjects)
+summary = False         # True - cross subject statistics (--jobs) only
 
 list_input = False
 list_data = False
 data_dir = "../data"
 date_axis=True
+jobs = 1                # Parallel file parsing processes
+no_cache = False        # True - parse all files, no cache use
+rebuild_cache = False   # True - parse all files, rewrite cache
+cache_dir = None        # Parse cache default: data_dir/.meas_cache
+archive = None          # Binary archive to read instead of data files
+save_archive = None     # Binary archive to write after collection
+db = None               # SQLite database holding measurements between runs
+follow = False          # True - keep adding new data to open plot
+follow_interval = 2.    # Seconds between checks for new data
+plot = True             # False - statistics only, no plot
+output = None           # Plot file (.png, .svg, .pdf) instead of display
+batch = None            # Report batch file, render reports (--jobs) only
+start = None            # Earliest date plotted YYYY-MM-DD default: all
+end = None              # Latest date plotted YYYY-MM-DD default: all
+rolling = None          # Rolling overlays e.g. mean:7,mean:30,in_range:90
+resolution = None       # Plot day, week, month aggregates, auto - by
+                        # date span per pixel default: measurements
+excursions = None       # List out of range streaks of at least N readings
+derived = None          # Derived series plotted too e.g. sg_delta,bp_pp
+correlate = None        # List day mean correlations e.g. sg_m,sg_e,sg_delta
+profile = False         # True - list per phase times (meas_profile)
+profile_json = None     # File to receive per phase times as JSON
+cprofile = False        # True - also run cProfile, list top functions
+tracemalloc = False     # True - also trace memory, list peak, top lines
 trace = ""
-parser = argparse.ArgumentParser()
-parser.add_argument('--list_data', type=str2bool, dest='list_data', default=list_data)
-parser.add_argument('--list_input', type=str2bool, dest='list_input', default=list_input)
-parser.add_argument('--date_axis', type=str2bool, dest='date_axis', default=date_axis)
-parser.add_argument('--trace', dest='trace', default=trace)
-parser.add_argument('--data_dir', dest='data_dir', default=data_dir)
-parser.add_argument('--who', dest='who', default=who)
-args = parser.parse_args()             # or die "Illegal options"
-SlTrace.lg("args: %s\n" % args)
-data_dir = args.data_dir
-date_axis = args.date_axis
-list_input= args.list_input
-list_data = args.list_data
-trace = args.trace
-who = args.who
-if trace:
-    SlTrace.setFlags(trace)
-
-if who.lower() == "jenifer"[:len(who)]:
-    data_dir = "../data/jen"
-    data_files = [
-        "bp_1.data",
-        "bp_2.data"]
-else:
-    data_dir = "..\\data"
-    data_files = []
-    data_path = os.path.join(data_dir, "*.data")
-    for file in glob.glob(data_path):
-        data_files.append(file)
-    data_files_str = '\n\t'.join(data_files)
-SlTrace.lg(f"Data files:\n\t{data_files_str}")    
-        
-smeas = Smeasures()
-year_str = None
-smeas.set_vert_label("Measurements")
-if date_axis:
-    smeas.set_horz_label("Measurement Date")
-else:
-    smeas.set_horz_label("Day Number")
 
-"""
-Setup default measurement plotting attributes
-"""
-smeas.add_plot_attr(
-            PlotAttr("sg_m", ib_marker='*', ib_label='morning in', ib_color='green',
-                    ob_marker='^', ob_label='morning out', ob_color='pink',
-                    ms_low=80, ms_high=120))
-smeas.add_plot_attr( 
-            PlotAttr("sg_e",ib_marker='.', ib_label='evening in', ib_color='blue',
-                    ob_marker='x', ob_label='evening out', ob_color='red',
-                    ms_low=80, ms_high=150))
-
-smeas.add_plot_attr(
-            PlotAttr("bp_low", ib_marker='v', ib_label='BP low', ib_color='blue',
-                    ob_marker='x', ob_label='bp_low out', ob_color='pink',
-                    ms_low=None, ms_high=None))
-
-smeas.add_plot_attr(
-            PlotAttr("bp_hi", ib_marker='^', ib_label='BP high', ib_color='blue',
-                    ob_marker='x', ob_label='bp_hi out', ob_color='pink',
-                    ms_low=None, ms_high=None))
-
-smeas.add_plot_attr(
-            PlotAttr("pl", ib_marker='+', ib_label='pulse', ib_color='green',
-                    ob_marker='x', ob_label='pl out', ob_color='pink',
-                    ms_low=None, ms_high=None))
-
-def collect_file(file_name, meas=None):
-    """ Collect file and add to measures
-    :file_name:  file to process
-    :meas: measurement data base
-            default: smeas
+
+def get_parser():
+    """ Command line parser, defaults from the settings above
     """
-    global year_str
-    
-    if meas is None:
-        meas = smeas
-        
-    comment_pat = re.compile(r"^(.*)#.*")
-    blank_line_pat = re.compile(r'\s*$')
-    line_pat = re.compile(r"^\s*(\d\d)\s+([a-z]+)"
-                          r"\s+(\S+)\s+(\d+)",
-                          re.I)
-    if year_str is None:
-        year_str = "2020"   # TBD - current year
-    line_no = 0
-    with open(file_name) as finp:
-        base_name = os.path.basename(file_name)
-        for line in finp:
-            line = line.rstrip()    # Remove white space esp newline
-            line_no += 1
-            if list_input:
-                SlTrace.lg(f"{base_name}:{line_no:4}:  {line}")
-            res = re.match(r"^(.*)#", line)
-            if res:
-                line = res.group(1)
-            res = re.match(r"^(.*)\s+$", line)    # Remove trailing white space
-            if res:
-                line = res.group(1)
-            res = re.match(r"^\s+(.*)$", line)    # Remove leading white space
-            if res:
-                line = res.group(1)
-            res = re.match(r"^\s*$", line)
-            if res:
-                continue                            # Ignore blank lines
-
-            # Check for date component
-            res = re.match(r"^(\d+)$", line)   # year on line
-            if res:
-                year_str = res.group(1)
-                continue
-            
-            res = re.match(r"^(\d+)\s*(\w+)", line) # day month beginning line
-                                                    # dd mmm or ddmmm
-            if res:
-                month_str = res.group(2)
-                day_str = res.group(1)
-                line = line[len(res.group(0)):]     # rest of line
-            else:
-                res = re.match(r"^(\w+)\s+(\d+)\s*,\s*(\d+)\s*$", line)   # July 4, 1776
-                if res:
-                    month_str = res.group(1)
-                    day_str = res.group(2)
-                    year_str = res.group(3)
-                    line = line[len(res.group(0)):]     # rest of line
-            
-            # Check for data on line    
-            res = re.match(r"^\s*(\?|night|\d+)\s+(\?|\d+)", line) # sg_m, sg_e
-            if res:
-                sg_m_str = res.group(1)
-                sg_e_str = res.group(2)
-                if sg_m_str == "night":
-                    sg_m_str = "?"
-                meas.add_datas("sg", datas=[sg_m_str, sg_e_str], month_str=month_str,
-                             day_str=day_str,
-                             year_str=year_str)
-                continue
-            line = re.sub(r"\s*;?\s*Pulse:?\s*", "/", line,flags=re.I)
-            res = re.match(r"^(\?|\d+)/(\?|\d+)/(\?|\d+)", line) # bp_h, bp_l, pl
-            if res:
-                bp_hi_str = res.group(1)
-                bp_lo_str = res.group(2)
-                pl_str = res.group(3)
-                meas.add_datas("bp", datas=[bp_hi_str, bp_lo_str, pl_str],
-                          month_str=month_str,
-                          day_str=day_str,
-                          year_str=year_str)
-                continue
-
-for file_name in data_files:
-    if not os.path.isabs(file_name):
-            fn = os.path.join(data_dir, file_name)
-            if not os.path.exists(fn):
-                abs_path = os.path.abspath(fn)
-                raise SelectError(f"{fn} was not found"
-                                  f" ({abs_path})")
-                                
-    collect_file(fn, smeas)
-
-smeas.list_stats()
-smeas.add_plots(date_axis=date_axis)
-smeas.show_plots(date_axis=date_axis)
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--list_data', type=str2bool, dest='list_data',
+                        default=list_data)
+    parser.add_argument('--list_input', type=str2bool, dest='list_input',
+                        default=list_input)
+    parser.add_argument('--date_axis', type=str2bool, dest='date_axis',
+                        default=date_axis)
+    parser.add_argument('--trace', dest='trace', default=trace)
+    parser.add_argument('--data_dir', dest='data_dir', default=data_dir)
+    parser.add_argument('--who', dest='who', default=who)
+    parser.add_argument('--jobs', type=int, dest='jobs', default=jobs)
+    parser.add_argument('--no_cache', '--no-cache', action='store_true',
+                        dest='no_cache', default=no_cache)
+    parser.add_argument('--rebuild_cache', '--rebuild-cache',
+                        action='store_true', dest='rebuild_cache',
+                        default=rebuild_cache)
+    parser.add_argument('--cache_dir', dest='cache_dir', default=cache_dir)
+    parser.add_argument('--archive', dest='archive', default=archive)
+    parser.add_argument('--save_archive', dest='save_archive',
+                        default=save_archive)
+    parser.add_argument('--db', dest='db', default=db)
+    parser.add_argument('--follow', type=str2bool, dest='follow',
+                        default=follow)
+    parser.add_argument('--follow_interval', type=float, dest='follow_interval',
+                        default=follow_interval)
+    parser.add_argument('--plot', type=str2bool, dest='plot', default=plot)
+    parser.add_argument('--output', dest='output', default=output)
+    parser.add_argument('--batch', dest='batch', default=batch)
+    parser.add_argument('--summary', type=str2bool, dest='summary',
+                        default=summary)
+    parser.add_argument('--start', type=date.fromisoformat, dest='start',
+                        default=start)
+    parser.add_argument('--end', type=date.fromisoformat, dest='end',
+                        default=end)
+    parser.add_argument('--rolling', type=get_rolling_specs, dest='rolling',
+                        default=rolling)
+    parser.add_argument('--resolution', dest='resolution', default=resolution,
+                        choices=["raw", "day", "week", "month", "auto"])
+    parser.add_argument('--excursions', type=int, dest='excursions',
+                        default=excursions)
+    parser.add_argument('--derived', dest='derived', default=derived)
+    parser.add_argument('--correlate', dest='correlate', default=correlate)
+    parser.add_argument('--profile', type=str2bool, dest='profile',
+                        default=profile)
+    parser.add_argument('--profile_json', dest='profile_json',
+                        default=profile_json)
+    parser.add_argument('--cprofile', type=str2bool, dest='cprofile',
+                        default=cprofile)
+    parser.add_argument('--tracemalloc', type=str2bool, dest='tracemalloc',
+                        default=tracemalloc)
+    return parser
+
+
+def main():
+    """ Collect, list and plot measurements, as directed by the
+    command line
+    """
+    args = get_parser().parse_args()    # or die "Illegal options"
+    SlTrace.lg("args: %s\n" % args)
+    data_dir = args.data_dir
+    date_axis = args.date_axis
+    list_input= args.list_input
+    list_data = args.list_data
+    trace = args.trace
+    who = args.who
+    jobs = args.jobs
+    no_cache = args.no_cache
+    rebuild_cache = args.rebuild_cache
+    cache_dir = args.cache_dir
+    archive = args.archive
+    save_archive = args.save_archive
+    db = args.db
+    follow = args.follow
+    follow_interval = args.follow_interval
+    plot = args.plot
+    output = args.output
+    batch = args.batch
+    summary = args.summary
+    start = args.start
+    end = args.end
+    rolling = args.rolling
+    resolution = args.resolution
+    excursions = args.excursions
+    derived = args.derived
+    if derived is not None:
+        derived = derived.split(",")
+    correlate = args.correlate
+    if correlate is not None:
+        correlate = correlate.split(",")
+    profile = args.profile
+    profile_json = args.profile_json
+    cprofile = args.cprofile
+    tracemalloc = args.tracemalloc
+    if trace:
+        SlTrace.setFlags(trace)
+    if follow and plot and (rolling is not None or derived is not None
+                            or resolution not in (None, "raw")):
+        raise SelectError("--follow updates measurement plots only,"
+                          " not --rolling, --derived or --resolution")
+    if output is not None or batch is not None:
+        import matplotlib
+        matplotlib.use("Agg")       # Render to file, no display needed
+
+    if batch is not None:
+        for report_file in render_reports(read_batch(batch), jobs=jobs,
+                                          use_cache=not no_cache):
+            SlTrace.lg(f"Report: {report_file}")
+        return
+
+    if archive is None or summary:
+        meas_subjects = MeasSubjects(data_dir, use_cache=not no_cache,
+                                     list_input=list_input)
+    if summary:
+        meas_subjects.list_summary(jobs=jobs)
+        return
+
+    if archive is None:
+        subject = meas_subjects.find(who)
+        data_dir = meas_subjects.get_dir(subject)
+        data_files = meas_subjects.get_files(subject)
+        data_files_str = '\n\t'.join(data_files)
+        SlTrace.lg(f"Subject: {subject}  Data files:\n\t{data_files_str}")
+
+    if db is not None:
+        smeas = Smeasures(store=MeasSqliteStore(db))
+    else:
+        smeas = Smeasures()
+    meas_parser = MeasParser(list_input=list_input)
+    smeas.set_vert_label("Measurements")
+    if date_axis:
+        smeas.set_horz_label("Measurement Date")
+    else:
+        smeas.set_horz_label("Day Number")
+
+    smeas.add_std_plot_attrs()      # Default measurement plotting attributes
+
+    meas_prof = None
+    if profile or profile_json is not None or cprofile or tracemalloc:
+        meas_prof = MeasProfile(cprofile=cprofile, memory=tracemalloc)
+        meas_prof.start()
+
+    meas_follower = None
+    if archive is not None:
+        if follow:
+            raise SelectError("--follow requires data files, not --archive")
+        smeas.import_archive(archive)
+    else:
+        file_paths = data_files
+
+        meas_cache = None
+        if not no_cache:
+            if cache_dir is None:
+                cache_dir = os.path.join(data_dir, ".meas_cache")
+            meas_cache = MeasCache(cache_dir, rebuild=rebuild_cache)
+        file_years = None
+        if follow:
+            # The subject's files and, unless its files are listed,
+            # new plain files in its directory
+            data_pattern = None
+            if not meas_subjects.has_file_list(subject):
+                data_pattern = os.path.join(data_dir, "*.data")
+            meas_follower = MeasFollower(file_paths, smeas, meas_parser,
+                                         data_pattern=data_pattern)
+            file_years = meas_follower.file_years
+        collect_files(file_paths, smeas, meas_parser, jobs=jobs,
+                      cache=meas_cache, file_years=file_years)
+        if meas_cache is not None:
+            SlTrace.lg(f"Parse cache: {meas_cache.nhit} loaded"
+                       f" {meas_cache.nmiss} parsed")
+    if save_archive is not None:
+        smeas.export_archive(save_archive)
+
+    smeas.list_stats(start=start, end=end)
+    if excursions is not None:
+        smeas.list_excursions(min_len=excursions, start=start, end=end)
+    if correlate is not None:
+        smeas.list_correlations(correlate, start=start, end=end)
+    if plot:
+        plot_mtypes = None
+        if derived is not None:
+            plot_mtypes = sorted(smeas.get_mtypes()) + derived
+        smeas.add_plots(mtypes=plot_mtypes, date_axis=date_axis, start=start,
+                        end=end, overlays=rolling, resolution=resolution)
+        if output is not None:
+            smeas.save_plots(output)
+        elif meas_follower is None:
+            smeas.show_plots(date_axis=date_axis)
+        else:
+            smeas.show_plots(date_axis=date_axis, block=False)
+            smeas.follow_plots()
+            while smeas.plot_pause(follow_interval):
+                if meas_follower.poll() > 0:
+                    smeas.update_plots()
+    smeas.close()
+    if meas_prof is not None:
+        meas_prof.stop()
+        meas_prof.list_profile()
+        if profile_json is not None:
+            meas_prof.write_json(profile_json)
+
 
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,222 @@
+# measure_stats.py   18Oct2026, from measure_plotting.py
+"""
+Measurement statistics / export - fast start
+Same data files, parse cache and archives as measure_plotting.py
+but imports only the parser and data store, never matplotlib,
+so a quick statistics check starts in a fraction of the time.
+bench_import.py checks the import graph and time stay so.
+With --stream, records flow through the meas_stream pipeline into
+a statistics only store, so any amount of input - data files,
+archives, stdin ("--input -") - is summarized in bounded memory:
+    cat */*.data | python measure_stats.py --stream --input -
+"""
+import os
+import argparse
+from datetime import date
+
+from select_trace import SlTrace
+from select_error import SelectError
+from crs_funs import str2bool
+
+from smeasures import Smeasures
+from meas_parser import MeasParser
+from meas_ingest import collect_files
+from meas_cache import MeasCache
+from meas_sqlite import MeasSqliteStore
+from meas_subjects import MeasSubjects
+from meas_profile import MeasProfile
+from meas_stream import (read_files, select, dedupe, aggregate,
+                         MeasStatsStore)
+from meas_pyramid import TIERS
+
+list_input = False
+data_dir = "../data"
+who = "dad"             # Subject name or prefix, "dad" - data_dir's own
+                        # files, else the only subject (meas_subjects)
+summary = False         # True - cross subject statistics table
+jobs = 1                # Parallel file parsing processes
+no_cache = False        # True - parse all files, no cache use
+rebuild_cache = False   # True - parse all files, rewrite cache
+cache_dir = None        # Parse cache default: data_dir/.meas_cache
+archive = None          # Binary archive to read instead of data files
+save_archive = None     # Binary archive to write after collection
+db = None               # SQLite database holding measurements between runs
+excursions = None       # List out of range streaks of at least N readings
+profile = False         # True - list per phase times (meas_profile)
+profile_json = None     # File to receive per phase times as JSON
+cprofile = False        # True - also run cProfile, list top functions
+tracemalloc = False     # True - also trace memory, list peak, top lines
+stream = False          # True - streaming pipeline, measurements not kept
+input_files = None      # --stream input files, archives, - stdin
+                        # default: subject's data files
+mtypes = None           # --stream mtypes e.g. sg_m,sg_e default: all
+start = None            # --stream earliest date YYYY-MM-DD default: all
+end = None              # --stream latest date YYYY-MM-DD default: all
+dedupe_records = False  # True - --stream drops repeated readings
+tier = None             # --stream list day, week or month summaries
+correlate = None        # List day mean correlations e.g. sg_m,sg_e,sg_delta
+trace = ""
+
+
+def get_parser():
+    """ Command line parser, defaults from the settings above
+    """
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--list_input', type=str2bool, dest='list_input',
+                        default=list_input)
+    parser.add_argument('--trace', dest='trace', default=trace)
+    parser.add_argument('--data_dir', dest='data_dir', default=data_dir)
+    parser.add_argument('--who', dest='who', default=who)
+    parser.add_argument('--summary', type=str2bool, dest='summary',
+                        default=summary)
+    parser.add_argument('--jobs', type=int, dest='jobs', default=jobs)
+    parser.add_argument('--no_cache', '--no-cache', action='store_true',
+                        dest='no_cache', default=no_cache)
+    parser.add_argument('--rebuild_cache', '--rebuild-cache',
+                        action='store_true', dest='rebuild_cache',
+                        default=rebuild_cache)
+    parser.add_argument('--cache_dir', dest='cache_dir', default=cache_dir)
+    parser.add_argument('--archive', dest='archive', default=archive)
+    parser.add_argument('--save_archive', dest='save_archive',
+                        default=save_archive)
+    parser.add_argument('--db', dest='db', default=db)
+    parser.add_argument('--excursions', type=int, dest='excursions',
+                        default=excursions)
+    parser.add_argument('--profile', type=str2bool, dest='profile',
+                        default=profile)
+    parser.add_argument('--profile_json', dest='profile_json',
+                        default=profile_json)
+    parser.add_argument('--cprofile', type=str2bool, dest='cprofile',
+                        default=cprofile)
+    parser.add_argument('--tracemalloc', type=str2bool, dest='tracemalloc',
+                        default=tracemalloc)
+    parser.add_argument('--stream', type=str2bool, dest='stream',
+                        default=stream)
+    parser.add_argument('--input', nargs='+', dest='input_files',
+                        default=input_files)
+    parser.add_argument('--mtypes', dest='mtypes', default=mtypes)
+    parser.add_argument('--start', type=date.fromisoformat, dest='start',
+                        default=start)
+    parser.add_argument('--end', type=date.fromisoformat, dest='end',
+                        default=end)
+    parser.add_argument('--dedupe', type=str2bool, dest='dedupe_records',
+                        default=dedupe_records)
+    parser.add_argument('--tier', choices=TIERS, dest='tier', default=tier)
+    parser.add_argument('--correlate', dest='correlate', default=correlate)
+    return parser
+
+
+def main():
+    """ Collect and list measurement statistics, as directed by
+    the command line
+    """
+    args = get_parser().parse_args()    # or die "Illegal options"
+    data_dir = args.data_dir
+    who = args.who
+    summary = args.summary
+    list_input= args.list_input
+    trace = args.trace
+    jobs = args.jobs
+    no_cache = args.no_cache
+    rebuild_cache = args.rebuild_cache
+    cache_dir = args.cache_dir
+    archive = args.archive
+    save_archive = args.save_archive
+    db = args.db
+    excursions = args.excursions
+    profile = args.profile
+    profile_json = args.profile_json
+    cprofile = args.cprofile
+    tracemalloc = args.tracemalloc
+    stream = args.stream
+    input_files = args.input_files
+    mtypes = args.mtypes
+    if mtypes is not None:
+        mtypes = mtypes.split(",")
+    start = args.start
+    end = args.end
+    dedupe_records = args.dedupe_records
+    tier = args.tier
+    correlate = args.correlate
+    if correlate is not None:
+        correlate = correlate.split(",")
+    if trace:
+        SlTrace.setFlags(trace)
+    if stream and save_archive is not None:
+        raise SelectError("--stream keeps no measurements for --save_archive")
+    if stream and db is not None:
+        raise SelectError("--stream keeps no measurements for --db")
+
+    if summary:
+        MeasSubjects(data_dir, use_cache=not no_cache).list_summary(jobs=jobs)
+        return
+
+    meas_prof = None
+    if profile or profile_json is not None or cprofile or tracemalloc:
+        meas_prof = MeasProfile(cprofile=cprofile, memory=tracemalloc)
+        meas_prof.start()
+
+    if stream:
+        smeas = Smeasures(store=MeasStatsStore())
+    elif db is not None:
+        smeas = Smeasures(store=MeasSqliteStore(db))
+    else:
+        smeas = Smeasures()
+    smeas.add_std_plot_attrs()      # Limits, for out of range counts
+    if stream:
+        if input_files is None:
+            meas_subjects = MeasSubjects(data_dir)
+            input_files = meas_subjects.get_files(meas_subjects.find(who))
+        records = select(read_files(input_files,
+                                    MeasParser(list_input=list_input)),
+                         mtypes=mtypes, start=start, end=end)
+        if dedupe_records:
+            records = dedupe(records)
+        if tier is not None:
+            limits = {mtype: (smeas.get_limit_low(mtype),
+                              smeas.get_limit_high(mtype))
+                      for mtype in smeas.plot_attrs}
+            for bucket, bucket_summary in aggregate(records, tier,
+                                                    limits=limits):
+                line = (f"{bucket} {bucket_summary.mtype:6}"
+                        f" low: {bucket_summary.min:3}"
+                        f"   high: {bucket_summary.max:3}"
+                        f"   avg: {bucket_summary.mean:5.1f}"
+                        f"   count: {bucket_summary.count}")
+                if bucket_summary.in_range is not None:
+                    line += f"   in range: {bucket_summary.in_range:5.1f}%"
+                SlTrace.lg(line)
+        else:
+            smeas.add_records(records)
+    elif archive is not None:
+        smeas.import_archive(archive)
+    else:
+        meas_subjects = MeasSubjects(data_dir)
+        subject = meas_subjects.find(who)
+        data_dir = meas_subjects.get_dir(subject)
+        data_files = meas_subjects.get_files(subject)
+        meas_cache = None
+        if not no_cache:
+            if cache_dir is None:
+                cache_dir = os.path.join(data_dir, ".meas_cache")
+            meas_cache = MeasCache(cache_dir, rebuild=rebuild_cache)
+        collect_files(data_files, smeas, MeasParser(list_input=list_input),
+                      jobs=jobs, cache=meas_cache)
+    if save_archive is not None:
+        smeas.export_archive(save_archive)
+    if not stream or tier is None:
+        smeas.list_stats()
+    if excursions is not None:
+        smeas.list_excursions(min_len=excursions)
+    if correlate is not None:
+        smeas.list_correlations(correlate)
+    smeas.close()
+    if meas_prof is not None:
+        meas_prof.stop()
+        meas_prof.list_profile()
+        if profile_json is not None:
+            meas_prof.write_json(profile_json)
+
+
+if __name__ == "__main__":
+    main()
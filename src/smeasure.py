@@ -1,14 +1,35 @@
 #smeasure.py
 """ Generalized measurement
+Compact record: slotted (no per instance __dict__), mtype interned
+so all records of a type share one string.  Dates are shared by
+the creators (one date object per day).
 """
+import sys
+
 from select_trace import SlTrace
 
 class Smeasure:
+    __slots__ = ("date", "mtype", "value")
+
     def __init__(self, date=None,
                mtype=None,
-               value=None):
+               value=None,
+               trace=None):
+        """ Setup measurement
+        :trace: True -> trace, False -> no trace
+                default: trace if "meas" trace flag is set
+        """
         self.date = date    # string ddmmmyyyy
+        if type(mtype) is str:
+            mtype = sys.intern(mtype)
         self.mtype = mtype    # 'm'- morning, 'e'-evening
         self.value = value
-        SlTrace.lg(f"Smeasure: mtype: {mtype}  value: {value} date: {date}",
-                   "meas")
+        if trace is None:
+            trace = SlTrace.trace("meas")
+        if trace:
+            SlTrace.lg(f"Smeasure: mtype: {mtype}  value: {value} date: {date}",
+                       "meas")
+
+    def __repr__(self):
+        return (f"Smeasure(date={self.date!r}, mtype={self.mtype!r},"
+                f" value={self.value!r})")
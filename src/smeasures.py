@@ -1,16 +1,28 @@
 #smeasures.py    27Sep2020  crs, moved from measure_plotting.py
 """ Colecting and processing measurements
+matplotlib is imported on first plotting use so statistics and
+export need only the parser and data store.
 """
 from select_trace import SlTrace
-import statistics
-from _datetime import date
-from matplotlib import pyplot as plt
-import matplotlib.dates as mdates
+from _datetime import date, timedelta
+import numpy as np
 
 from select_error import SelectError
 
 from smeasure import Smeasure
 from plot_attr import PlotAttr
+from meas_store import MeasStore, get_data_columns
+from meas_date import get_date, get_month, get_ordinal
+from meas_archive import read_archive, write_archive
+from meas_lod import grid_downsample
+from meas_rolling import rolling
+from meas_range import RANGE_IN, get_excursions, classify
+from meas_pyramid import TIERS, choose_tier
+from meas_stream import get_blocks
+from meas_join import DERIVED_SERIES, join_days, correlate
+import meas_profile
+
+EPOCH_ORD = date(1970, 1, 1).toordinal()    # datetime64[D] zero
         
 class Smeasures:
     """ Measurement database
@@ -19,21 +31,85 @@ class Smeasures:
     sg_mtypes = ["sg_m", "sg_e"]
     bp_mtypes = ["bp_hi", "bp_low", "pl"]
     
-    def __init__(self):
+    def __init__(self, store=None):
+        """ Setup measurement database
+        :store: measurement store e.g. MeasSqliteStore
+                default: in memory MeasStore
+        """
+        if store is None:
+            store = MeasStore()
         self.plot_attrs = {}        # Plotting attributes
-        self.measurements = []      # List of Smeasure
+        self.store = store          # Measurements
         self.horz_label = ""
         self.vert_label = ""
-        myFmt = mdates.DateFormatter('%b %d')
-        self.figure = plt.figure()
-        subplot = self.figure.add_subplot(111)
-        subplot.xaxis.set_major_formatter(myFmt)
+        self.plot_artists = {}      # mtype: {"ib", "ob", "low", "high": artist}
+        self.plot_ord0 = {}         # mtype: ordinal of day number 1
+        self.plot_date_axis = False
+        self.plot_nmeas = 0         # Measurements included in plot
+        self.plot_background = None # Saved for blitting
+        self.plot_batches = []      # (mtype, "ib"/"ob", artist) points
+                                    #   added by update_plots since
+                                    #   the last full draw
+        self.plot_overlays = False  # Rolling overlays plotted
+        self.plot_lod = True        # Downsample in bounds points to
+                                    # axes pixel grid, out of bounds
+                                    # points are always all plotted
+        self.plot_lod_cell = 2      # Downsample grid cell size, pixels
+        self.plot_ib_data = {}      # mtype: (x, y) all in bounds points,
+                                    #   axes units, for rebucketing
+        self.plot_lod_cids = None   # x/ylim_changed callback ids
+        self.figure = None          # Created on first plot, get_figure
+        self.pct_axes = None        # Percent axes, for in_range overlays
+        self.derived = dict(DERIVED_SERIES)     # name: (mtypes, function)
 
         self.add_plot_attr(
             PlotAttr("DEFAULT", ib_marker='.', ib_label='in', ib_color='blue',
                     ob_marker='x', ob_label='out', ob_color='pink',
                     ms_low=80, ms_high=120))
 
+    def add_std_plot_attrs(self):
+        """ Setup default measurement plotting attributes
+        for the known measurement types
+        """
+        self.add_plot_attr(
+            PlotAttr("sg_m", ib_marker='*', ib_label='morning in', ib_color='green',
+                    ob_marker='^', ob_label='morning out', ob_color='pink',
+                    ms_low=80, ms_high=120))
+        self.add_plot_attr( 
+            PlotAttr("sg_e",ib_marker='.', ib_label='evening in', ib_color='blue',
+                    ob_marker='x', ob_label='evening out', ob_color='red',
+                    ms_low=80, ms_high=150))
+
+        self.add_plot_attr(
+            PlotAttr("bp_low", ib_marker='v', ib_label='BP low', ib_color='blue',
+                    ob_marker='x', ob_label='bp_low out', ob_color='pink',
+                    ms_low=None, ms_high=None))
+
+        self.add_plot_attr(
+            PlotAttr("bp_hi", ib_marker='^', ib_label='BP high', ib_color='blue',
+                    ob_marker='x', ob_label='bp_hi out', ob_color='pink',
+                    ms_low=None, ms_high=None))
+
+        self.add_plot_attr(
+            PlotAttr("pl", ib_marker='+', ib_label='pulse', ib_color='green',
+                    ob_marker='x', ob_label='pl out', ob_color='pink',
+                    ms_low=None, ms_high=None))
+
+        self.add_plot_attr(
+            PlotAttr("sg_delta", ib_marker='d', ib_label='evening - morning',
+                    ib_color='orange', ob_marker='x', ob_label='sg_delta out',
+                    ob_color='red', ms_low=None, ms_high=None))
+
+        self.add_plot_attr(
+            PlotAttr("bp_pp", ib_marker='s', ib_label='pulse pressure',
+                    ib_color='brown', ob_marker='x', ob_label='bp_pp out',
+                    ob_color='pink', ms_low=None, ms_high=None))
+
+        self.add_plot_attr(
+            PlotAttr("bp_map", ib_marker='o', ib_label='mean arterial',
+                    ib_color='purple', ob_marker='x', ob_label='bp_map out',
+                    ob_color='pink', ms_low=None, ms_high=None))
+
     def add_datas(self, data_type, datas=None,
                    month_str=None, day_str=None, year_str=None):
         """ Add data line measurements
@@ -43,32 +119,126 @@ class Smeasures:
         :day_str: day of month
         :year_str: year
         """
-        meas_date = self.set_date(month_str=month_str,
-                                 day_str=day_str, year_str=year_str)
+        ordinal = get_ordinal(month_str, day_str, year_str)
         if not isinstance(datas,(list,set)):
             datas = [datas]     # List of one
+        if meas_profile.profile is not None:
+            meas_profile.profile.count("add_datas", len(datas))
+        mtypes = self.get_data_mtypes(data_type)
+        trace = SlTrace.trace("meas")
+        for i,data in enumerate(datas):
+            if data == "?":
+                continue            # No data
+            value = int(data)
+            if trace:
+                SlTrace.lg(f"Smeasure: mtype: {mtypes[i]}  value: {value}"
+                           f" date: {date.fromordinal(ordinal)}", "meas")
+            self.store.append(ordinal, mtypes[i], value)
+
+    def add_columns(self, data_type, ordinals, datas):
+        """ Add a block of data lines, checked and appended in one
+        vectorized step
+        :data_type: type of data: "sg" sugar meas, "bp" blood preasure,pulse
+        :ordinals: date ordinal of each line
+        :datas: measurement strings of each line ? - no data, or
+                integers, one column per data_type mtype
+        """
+        columns = get_data_columns(self.get_data_mtypes(data_type), ordinals,
+                                   datas, val_dtype=self.store.VAL_DTYPE)
+        nval = len(columns[3])
+        if meas_profile.profile is not None:
+            meas_profile.profile.count("add_columns", nval)
+        if SlTrace.trace("meas"):
+            SlTrace.lg(f"Smeasures: {data_type} {len(ordinals)} lines"
+                       f" {nval} values", "meas")
+        self.store.extend_mapped(*columns)
+
+    def get_data_mtypes(self, data_type):
+        """ Get mtypes of a data line's values
+        :data_type: type of data: "sg" sugar meas, "bp" blood preasure,pulse
+        """
         if data_type == "sg":
-            for i,data in enumerate(datas):
-                if data == "?":
-                    continue            # No data
-                sm = Smeasure(date=meas_date, mtype=self.sg_mtypes[i],
-                              value=int(data))
-                self.add_meas(sm)
-        elif data_type == "bp":
-            for i,data in enumerate(datas):
-                if data == "?":
-                    continue            # No data
-                sm = Smeasure(date=meas_date, mtype=self.bp_mtypes[i],
-                              value=int(data))
-                self.add_meas(sm)
-        else:
-            raise SelectError(f"Unrecognized data type:{data_type}")
+            return self.sg_mtypes
+        if data_type == "bp":
+            return self.bp_mtypes
+        raise SelectError(f"Unrecognized data type:{data_type}")
 
     def add_meas(self, meas):
         """ Add measurement
         :meas: measurement(Smeasure) to add
         """
-        self.measurements.append(meas)
+        self.store.append(meas.date.toordinal(), meas.mtype, meas.value)
+
+    def add_batch(self, batch):
+        """ Add block of parsed measurements
+        :batch: MeasBatch, resolved, in file order
+        """
+        self.store.extend_mapped(batch.mtype_names, *batch.get_arrays())
+
+    def add_records(self, records):
+        """ Add a stream of records, a block at a time
+        :records: iterable of MeasRecord (meas_stream) e.g. pipeline
+        """
+        for block in get_blocks(records):
+            self.store.extend_mapped(*block)
+
+    def set_file(self, file_name, year_str=None):
+        """ Note data file whose measurements are added next,
+        for stores which track their source files
+        :file_name: data file, None - no file
+        :year_str: year in effect at the start of the file
+        """
+        self.store.set_file(file_name, year_str)
+
+    def get_resume(self, file_names, file_years=None):
+        """ Find where loading data files can resume, for stores
+        holding measurements between runs
+        :file_names: data files, in load order
+        :file_years: dict to receive file_name: year_str at the start
+                    of each stored file
+        :returns: (number of files already stored,
+                    year_str at the end of them, None - none stored)
+        """
+        return self.store.get_resume(file_names, file_years=file_years)
+
+    def close(self):
+        """ Write any buffered measurements and release the store
+        """
+        self.store.close()
+
+    def export_archive(self, file_name):
+        """ Write measurements to binary archive
+        :file_name: archive file path
+        """
+        if not self.store.KEEPS_MEAS:
+            raise SelectError(f"Store keeps no measurements"
+                              f" to archive to {file_name}")
+        with meas_profile.phase("archive_write", self.store.nmeas):
+            write_archive(file_name, self.store)
+
+    def import_archive(self, file_name):
+        """ Add measurements from binary archive
+        If we have no measurements yet, the archive columns are
+        used memory mapped, in place, else they are copied in.
+        :file_name: archive file path
+        """
+        with meas_profile.phase("archive_read"):
+            archive_store = read_archive(file_name)
+        if (self.store.nmeas == 0 and not self.store.PERSISTENT
+                and self.store.KEEPS_MEAS):
+            self.store = archive_store
+            for mtype in self.plot_attrs:
+                self.set_store_limits(mtype)
+            return
+        
+        self.store.extend_mapped(archive_store.mtype_names, archive_store.ords,
+                                 archive_store.codes, archive_store.vals)
+
+    @property
+    def measurements(self):
+        """ List of Smeasure, in order added
+        """
+        return self.get_meas(self.get_mtypes(), date_sorted=False)
                     
     def add_plot_attr(self, plot_attr):
         """ Add / modify ploting attributes for mtype
@@ -82,6 +252,14 @@ class Smeasures:
                 setattr(pattr, att)
         else:
             self.plot_attrs[mtype] = plot_attr
+        self.set_store_limits(mtype)
+
+    def set_store_limits(self, mtype):
+        """ Pass mtype's limits to the store, which classifies
+        measurements in or out of range as they are added
+        """
+        self.store.set_limits(mtype, self.get_limit_low(mtype),
+                              self.get_limit_high(mtype))
 
     def get_limit_high(self, mtype):
         """ Get high limit, for mtype, if any
@@ -102,23 +280,71 @@ class Smeasures:
         return None     # No high limit
 
 
-    def get_meas(self, mtypes=None, date_sorted=True):
-        """ Return measurements for types
+    def get_mtype_list(self, mtypes=None):
+        """ Normalize mtypes argument to a list
         :mtypes: one, list of mtypes
-                :default: all types
-        :date_sorted: True -->sorted by ascending date
+                default: all types
         """
         if mtypes is None:
-            mtypes is self.get_mtypes()
+            mtypes = self.get_mtypes()
         if not isinstance(mtypes, (set,list)):
             mtypes = [mtypes]
+        return mtypes
+
+    def get_meas_arrays(self, mtypes=None, date_sorted=True,
+                        start=None, end=None):
+        """ Return measurement columns for types
+        :mtypes: one, list of mtypes
+                :default: all types
+        :date_sorted: True -->sorted by ascending date
+        :start: earliest date default: no limit
+        :end: latest date default: no limit
+        :returns: (date ordinals, values) arrays
+        """
+        ords, _, vals = self.get_meas_columns(mtypes, date_sorted=date_sorted,
+                                              start=start, end=end)
+        return ords, vals
+
+    def get_meas_columns(self, mtypes=None, date_sorted=True,
+                         start=None, end=None):
+        """ Get measurement columns, date range by store index
+        :mtypes: one, list of mtypes
+                :default: all types
+        :date_sorted: True -->sorted by ascending date
+        :start: earliest date default: no limit
+        :end: latest date default: no limit
+        :returns: (date ordinals, store mtype codes, values) arrays
+        """
+        with meas_profile.phase("get_meas") as timer:
+            columns = self.store.get_columns(
+                        self.get_mtype_list(mtypes), date_sorted=date_sorted,
+                        start=None if start is None else start.toordinal(),
+                        end=None if end is None else end.toordinal())
+            if timer is not None:
+                timer.items = len(columns[0])
+        return columns
+
+    def get_meas(self, mtypes=None, date_sorted=True, start=None, end=None):
+        """ Return measurements for types
+        :mtypes: one, list of mtypes
+                :default: all types
+        :date_sorted: True -->sorted by ascending date
+        :start: earliest date default: no limit
+        :end: latest date default: no limit
+        """
+        ords, codes, vals = self.get_meas_columns(mtypes,
+                                                  date_sorted=date_sorted,
+                                                  start=start, end=end)
+        names = self.store.mtype_names
+        dates = {}                  # Share date objects
         measurements = []
-        for measurement in self.measurements:
-            for mtype in mtypes:
-                if mtype == measurement.mtype:
-                    measurements.append(measurement)
-        if date_sorted:
-            measurements.sort(key=lambda meas : meas.date)
+        for ordinal, code, value in zip(ords.tolist(), codes.tolist(),
+                                        vals.tolist()):
+            meas_date = dates.get(ordinal)
+            if meas_date is None:
+                meas_date = dates[ordinal] = date.fromordinal(ordinal)
+            measurements.append(Smeasure(date=meas_date, mtype=names[code],
+                                         value=value, trace=False))
         return measurements
 
     def get_meas_vals(self, mtypes=None, date_sorted=True):
@@ -128,25 +354,18 @@ class Smeasures:
         :returns: list of values
         :date_sorted: True -->sorted by ascending date
         """
-        measurements = self.get_meas(mtypes=mtypes, date_sorted=date_sorted)
-        vals = [meas.value for meas in measurements]
-        return vals
+        _, vals = self.get_meas_arrays(mtypes=mtypes, date_sorted=date_sorted)
+        return vals.tolist()
     
     def get_mtypes(self):
         """ Return set of mtypes encountered in measurement list
         """
-        mtypes = set()
-        for measurement in self.measurements:
-            mtypes.add(measurement.mtype)
-        return mtypes
+        return self.store.get_mtypes()
         
     def get_nday(self):
         """ Get number of days measured
         """
-        days = set()
-        for measurement in self.measurements:
-            days.add(measurement.date)
-        return len(days)
+        return self.store.get_nday()
 
     def get_plot_attr(self, mtype):
         """ Get plotting attribute for this mtype
@@ -183,91 +402,758 @@ class Smeasures:
         plot_attr = self.get_plot_attr(mtype)
         return plot_attr.ob_color
             
-    def list_stats(self):
+    def list_stats(self, start=None, end=None):
         """ List stats for each measurement type (mtype)
+        :start: earliest date default: no limit
+        :end: latest date default: no limit
+                with start or end, statistics are from the day, week,
+                month aggregates - no median, percentiles
+        """
+        with meas_profile.phase("list_stats"):
+            if start is not None or end is not None:
+                SlTrace.lg(f"From: {'first' if start is None else start}"
+                           f"  to: {'last' if end is None else end}")
+                for mtype in sorted(self.get_mtypes()):
+                    self.list_summary(mtype, start=start, end=end)
+                return
+
+            nday = self.get_nday()
+            SlTrace.lg(f"Number of days: {nday}")
+            
+            mtypes = self.get_mtypes()
+            for mtype in mtypes:
+                self.list_stat(mtype)
+
+    def list_summary(self, mtype, start=None, end=None):
+        """ List date range statistics, from aggregates
+        :mtype: one measurement type
+        :start: earliest date default: no limit
+        :end: latest date default: no limit
         """
-        nday = self.get_nday()
-        SlTrace.lg(f"Number of days: {nday}")
+        summary = self.get_summary(mtype, start=start, end=end)
+        if summary is None or summary.count == 0:
+            return          # No values
         
-        mtypes = self.get_mtypes()
-        for mtype in mtypes:
-            self.list_stat(mtype)
+        line = (f"{mtype:6} low: {summary.min:3}   high: {summary.max:3}"
+                f"   avg: {summary.mean:5.1f}   stdev: {summary.stdev:5.1f}"
+                f"   count: {summary.count}")
+        if summary.in_range is not None:
+            line += f"   in range: {summary.in_range:5.1f}%"
+        SlTrace.lg(line)
     
     def list_stat(self, mtype):
         """ List statistics for given measurement type
         :mtype: one measurement type
         """
-        m_vals = self.get_meas_vals(mtype)
-        nmeas = len(m_vals)
-        if nmeas == 0:
+        stat = self.get_stat(mtype)
+        if stat is None or stat.count == 0:
             return          # No values
         
-        m_low = min(m_vals)
-        m_high = max(m_vals)
-        m_avg = sum(m_vals)/nmeas
-        m_median = statistics.median(m_vals)
-        SlTrace.lg(f"{mtype:6} low: {m_low:3}   high: {m_high:3}"
-                   f"   avg: {m_avg:5.1f}   median: {m_median:5.1f}")
-
-    def add_plot(self, mtype, date_axis=False):
+        SlTrace.lg(f"{mtype:6} low: {stat.min:3}   high: {stat.max:3}"
+                   f"   avg: {stat.mean:5.1f}   median: {stat.median:5.1f}"
+                   f"   stdev: {stat.stdev:5.1f}"
+                   f"   p10: {stat.percentile(10):5.1f}"
+                   f"   p90: {stat.percentile(90):5.1f}")
+
+    def get_rolling(self, mtype, window, stat="mean", start=None, end=None):
+        """ Rolling aggregate over calendar day windows
+        :mtype: one measurement type
+        :window: window length, days e.g. 7, 30, 90
+        :stat: "mean", "min", "max",
+                "in_range" - percent within the mtype's ms_low..ms_high
+        :start: earliest date default: no limit
+                windows at start include the preceding days
+        :end: latest date default: no limit
+        :returns: (day ordinals, values) arrays, one per measured day
+        """
+        lookback = None if start is None else start - timedelta(days=window-1)
+        if mtype in self.derived:
+            ords, vals = self.get_derived(mtype, start=lookback, end=end)
+        else:
+            ords, vals = self.get_meas_arrays(mtype, start=lookback, end=end)
+        days, result = rolling(ords, vals, window, stat,
+                               ms_low=self.get_limit_low(mtype),
+                               ms_high=self.get_limit_high(mtype))
+        if start is not None:
+            in_range = days >= start.toordinal()
+            days, result = days[in_range], result[in_range]
+        return days, result
+
+    def get_range_columns(self, mtype, date_sorted=True,
+                          start=None, end=None):
+        """ Get measurements of mtype with their range classes,
+        as classified when added
+        :mtype: one measurement type
+        :date_sorted: True -->sorted by ascending date
+        :start: earliest date default: no limit
+        :end: latest date default: no limit
+        :returns: (date ordinals, values, range classes) arrays
+                derived series: per day, classified now
+        """
+        if mtype in self.derived:
+            days, vals = self.get_derived(mtype, start=start, end=end)
+            return days, vals, classify(vals, self.get_limit_low(mtype),
+                                        self.get_limit_high(mtype))
+
+        with meas_profile.phase("get_meas") as timer:
+            columns = self.store.get_range_columns(
+                        mtype, date_sorted=date_sorted,
+                        start=None if start is None else start.toordinal(),
+                        end=None if end is None else end.toordinal())
+            if timer is not None:
+                timer.items = len(columns[0])
+        return columns
+
+    def get_range(self, mtype):
+        """ Get out of range counts and streaks for mtype
+        :mtype: one measurement type
+        :returns: MeasRange, None if no such mtype
+        """
+        return self.store.get_range(mtype)
+
+    def get_excursions(self, mtype, min_len=1, start=None, end=None):
+        """ Get out of range streaks, in reading order
+        :mtype: one measurement type
+        :min_len: fewest consecutive out of range readings reported
+        :start: earliest date default: no limit
+        :end: latest date default: no limit
+        :returns: list of (first date, last date, number of readings)
+        """
+        ords, _, classes = self.get_range_columns(mtype, date_sorted=False,
+                                                  start=start, end=end)
+        return [(date.fromordinal(first), date.fromordinal(last), nread)
+                for first, last, nread in get_excursions(ords, classes,
+                                                         min_len=min_len)]
+
+    def list_excursions(self, min_len=1, start=None, end=None):
+        """ List out of range counts and longest streak, over all
+        readings, and streaks of at least min_len readings within
+        start..end, if the store keeps measurements, for each mtype
+        with limits
+        :min_len: fewest consecutive out of range readings listed
+        :start: earliest date default: no limit
+        :end: latest date default: no limit
+        """
+        for mtype in sorted(self.get_mtypes()):
+            meas_range = self.get_range(mtype)
+            if meas_range is None or not meas_range.has_limits():
+                continue
+            pct = meas_range.nout/meas_range.count*100
+            line = (f"{mtype:6} out of range: {meas_range.nout}"
+                    f" ({pct:.1f}%)  low: {meas_range.nlow}"
+                    f"  high: {meas_range.nhigh}"
+                    f"  longest streak: {meas_range.longest}")
+            if meas_range.longest > 0:
+                line += (f" {date.fromordinal(meas_range.longest_start)}"
+                         f" to {date.fromordinal(meas_range.longest_end)}")
+            SlTrace.lg(line)
+            if not self.store.KEEPS_MEAS:
+                continue
+            for first, last, nread in self.get_excursions(
+                    mtype, min_len=min_len, start=start, end=end):
+                SlTrace.lg(f"    {first} to {last}: {nread} readings")
+
+    def get_tier(self, mtype, tier, start=None, end=None):
+        """ Get day, week or month aggregates
+        :mtype: one measurement type
+        :tier: "day", "week", "month"
+        :start: earliest date default: no limit
+        :end: latest date default: no limit
+        :returns: (bucket ordinals, counts, lows, highs, means,
+                    in range percents) arrays, None if no such mtype
+        """
+        return self.store.get_tier(
+                    mtype, tier,
+                    start=None if start is None else start.toordinal(),
+                    end=None if end is None else end.toordinal())
+
+    def get_summary(self, mtype, start=None, end=None):
+        """ Get statistics over a date range, from aggregates
+        :mtype: one measurement type
+        :start: earliest date default: no limit
+        :end: latest date default: no limit
+        :returns: MeasSummary, None if no such mtype
+        """
+        return self.store.get_summary(
+                    mtype,
+                    start=None if start is None else start.toordinal(),
+                    end=None if end is None else end.toordinal())
+
+    def add_derived(self, name, mtypes, function):
+        """ Add / replace derived series, usable as an mtype by
+        get_derived, join, get_correlation, add_plots
+        :name: series name
+        :mtypes: input mtypes (or derived series)
+        :function: function of the mtypes' day arrays, vectorized
+                e.g. lambda sg_m, sg_e: sg_e - sg_m
+        """
+        self.derived[name] = (list(mtypes), function)
+
+    def get_day_series(self, mtype, start=None, end=None):
+        """ Get one value per measured day - the day mean
+        :mtype: measurement type or derived series
+        :start: earliest date default: no limit
+        :end: latest date default: no limit
+        :returns: (day ordinals, values) arrays, ascending date
+        """
+        if mtype in self.derived:
+            return self.get_derived(mtype, start=start, end=end)
+
+        tier_arrays = self.get_tier(mtype, "day", start=start, end=end)
+        if tier_arrays is None:
+            return np.empty(0, dtype=np.int64), np.empty(0)
+        return tier_arrays[0], tier_arrays[4]
+
+    def get_derived(self, name, start=None, end=None):
+        """ Get derived series, on days with all its inputs
+        :name: derived series name
+        :start: earliest date default: no limit
+        :end: latest date default: no limit
+        :returns: (day ordinals, values) arrays, ascending date
+        """
+        derived = self.derived.get(name)
+        if derived is None:
+            raise SelectError(f"Unrecognized derived series:{name}")
+        mtypes, function = derived
+        days, table = self.join(mtypes, start=start, end=end)
+        return days, np.asarray(function(*table.T), dtype=float)
+
+    def join(self, mtypes, start=None, end=None, how="inner"):
+        """ Align mtypes by date, one row per day
+        :mtypes: list of measurement types or derived series
+        :start: earliest date default: no limit
+        :end: latest date default: no limit
+        :how: "inner" - days with every mtype, "outer" - days with any
+        :returns: (day ordinals, table) arrays, table[:, i] day means
+                of mtypes[i], NaN if none that day
+        """
+        with meas_profile.phase("join"):
+            return join_days([self.get_day_series(mtype, start=start, end=end)
+                              for mtype in mtypes], how=how)
+
+    def get_correlation(self, mtype_x, mtype_y, start=None, end=None):
+        """ Correlation of day means of two mtypes
+        :mtype_x, mtype_y: measurement types or derived series
+        :start: earliest date default: no limit
+        :end: latest date default: no limit
+        :returns: (number of days, Pearson r, slope, intercept of
+                least squares line y = slope*x + intercept)
+        """
+        _, table = self.join([mtype_x, mtype_y], start=start, end=end)
+        return correlate(table[:, 0], table[:, 1])
+
+    def list_correlations(self, mtypes, start=None, end=None):
+        """ List correlation of each pair of mtypes
+        :mtypes: list of measurement types or derived series
+        :start: earliest date default: no limit
+        :end: latest date default: no limit
+        """
+        for i, mtype_x in enumerate(mtypes):
+            for mtype_y in mtypes[i+1:]:
+                nday, r, slope, intercept = self.get_correlation(
+                                mtype_x, mtype_y, start=start, end=end)
+                SlTrace.lg(f"{mtype_x:8} {mtype_y:8} days: {nday:5}"
+                           f"   r: {r:6.3f}   {mtype_y} = {slope:.3f}"
+                           f" * {mtype_x} {intercept:+.1f}")
+
+    def get_stat(self, mtype):
+        """ Get running statistics for mtype
+        :mtype: one measurement type
+        :returns: MeasStat, None if no such mtype
+        """
+        return self.store.get_stat(mtype)
+
+    def get_figure(self):
+        """ Get plot figure, creating it on first use
+        """
+        if self.figure is None:
+            from matplotlib import pyplot as plt
+            import matplotlib.dates as mdates
+            myFmt = mdates.DateFormatter('%b %d')
+            self.figure = plt.figure()
+            subplot = self.figure.add_subplot(111)
+            subplot.xaxis.set_major_formatter(myFmt)
+        return self.figure
+
+    def get_axes(self):
+        """ Get plot axes, creating figure on first use
+        """
+        return self.get_figure().axes[0]
+
+    def add_plot(self, mtype, date_axis=False, start=None, end=None):
         """ add measurements of mtype to plot
         :mtype: type to add
         :date_axis: True -> show date on x axis
+        :start: earliest date default: no limit
+        :end: latest date default: no limit
         """
-        mes = self.get_meas(mtype)
-        if date_axis:
-            me_dates = self.get_meas_dates(mtype)
-        else:
-            me_dates = self.get_meas_days(mtype)
+        ax = self.get_axes()
+        me_ords, me_vals, me_classes = self.get_range_columns(mtype,
+                                                    start=start, end=end)
+        if len(me_ords) == 0:
+            return
+        ord0 = int(me_ords[0])
+        me_dates = self.get_plot_x(me_ords, ord0, date_axis)
         ms_hi = self.get_limit_high(mtype)
         ms_low = self.get_limit_low(mtype)
-        ms_ob = []  # values
-        ms_ob_dates = []  # days/dates
-        ms_ib = []  # values
-        ms_ib_dates = []  # days/dates
-        for me, me_date in zip(mes, me_dates):
-            me_val = me.value
-            if (ms_hi is not None and me_val > ms_hi 
-                    or ms_low is not None and me_val < ms_low):
-                ms_ob.append(me_val)
-                ms_ob_dates.append(me_date)
-            else:
-                ms_ib.append(me_val)
-                ms_ib_dates.append(me_date)
+        ib = me_classes == RANGE_IN
+        ob = ~ib
+        artists = {}
         if ms_low is not None:
-            plt.plot(me_dates, len(me_dates)*[ms_low], c='gray')
+            artists["low"] = ax.axhline(ms_low, c='gray')
         if ms_hi is not None:
-            plt.plot(me_dates, len(me_dates)*[ms_hi], c='gray')
-        plt.scatter(ms_ib_dates, ms_ib,
+            artists["high"] = ax.axhline(ms_hi, c='gray')
+        ib_dates = me_dates[ib]
+        ib_vals = me_vals[ib]
+        if self.plot_lod:
+            ib_ords = me_ords[ib]
+            self.plot_ib_data[mtype] = (
+                self.get_axes_x(ib_ords, ord0, date_axis), ib_vals)
+            nx, ny = self.get_lod_grid()
+            keep = grid_downsample(ib_ords, ib_vals, nx, ny,
+                                   y_low=me_vals.min(), y_high=me_vals.max())
+            ib_dates = ib_dates[keep]
+            ib_vals = ib_vals[keep]
+        artists["ib"] = ax.scatter(ib_dates, ib_vals,
                     marker=self.get_ib_marker(mtype),
                     label=self.get_ib_label(mtype),
                      c=self.get_ib_color(mtype))
         if ms_low is not None or ms_hi is not None:
-            plt.scatter(ms_ob_dates, ms_ob,
+            artists["ob"] = ax.scatter(me_dates[ob], me_vals[ob],
                         marker=self.get_ob_marker(mtype),
                         label=self.get_ob_label(mtype),
                          c=self.get_ob_color(mtype))
+        self.plot_artists[mtype] = artists
+        self.plot_ord0[mtype] = ord0
+
+    def get_plot_tier(self, mtype, resolution, start=None, end=None):
+        """ Get aggregate tier to plot
+        :mtype: measurement type
+        :resolution: None, "raw", "day", "week", "month", "auto"
+        :start: earliest date default: no limit
+        :end: latest date default: no limit
+        :returns: tier, None - plot measurements
+        """
+        if resolution is None or resolution == "raw" or mtype in self.derived:
+            return None         # derived series are already per day
+        if resolution != "auto":
+            if resolution not in TIERS:
+                raise SelectError(f"Unrecognized resolution:{resolution}")
+            return resolution
+        tier_arrays = self.get_tier(mtype, "day", start=start, end=end)
+        if tier_arrays is None or len(tier_arrays[0]) < 2:
+            return None
+        days = tier_arrays[0]
+        width = self.get_axes().bbox.width      # pixels
+        return choose_tier((days[-1] - days[0] + 1)/max(width, 1))
+
+    def add_tier_plot(self, mtype, tier, date_axis=False, start=None,
+                      end=None):
+        """ Add aggregates of mtype to plot: mean line, min..max band
+        :mtype: type to add
+        :tier: "day", "week", "month"
+        :date_axis: True -> show date on x axis
+        :start: earliest date default: no limit
+        :end: latest date default: no limit
+        """
+        ax = self.get_axes()
+        buckets, _, lows, highs, means, _ = self.get_tier(mtype, tier,
+                                                          start=start, end=end)
+        if len(buckets) == 0:
+            return
+        ord0 = int(buckets[0])
+        x = self.get_plot_x(buckets, ord0, date_axis)
+        ms_hi = self.get_limit_high(mtype)
+        ms_low = self.get_limit_low(mtype)
+        artists = {}
+        if ms_low is not None:
+            artists["low"] = ax.axhline(ms_low, c='gray')
+        if ms_hi is not None:
+            artists["high"] = ax.axhline(ms_hi, c='gray')
+        artists["band"] = ax.fill_between(x, lows, highs, alpha=.25,
+                                          color=self.get_ib_color(mtype),
+                                          linewidth=0)
+        artists["mean"], = ax.plot(x, means, linewidth=1,
+                    marker=self.get_ib_marker(mtype),
+                    label=f"{mtype} {tier} mean",
+                    c=self.get_ib_color(mtype))
+        self.plot_artists[mtype] = artists
+        self.plot_ord0[mtype] = ord0
+
+    def add_rolling_plot(self, mtype, window, stat="mean", date_axis=False,
+                         start=None, end=None):
+        """ Add rolling aggregate line for mtype
+        in_range percentages are plotted against a right hand % axis
+        :mtype: measurement type
+        :window: window length, days
+        :stat: "mean", "min", "max", "in_range"
+        :date_axis: True -> show date on x axis
+        :start: earliest date default: no limit
+        :end: latest date default: no limit
+        """
+        days, result = self.get_rolling(mtype, window, stat=stat,
+                                        start=start, end=end)
+        if len(days) == 0:
+            return
+        ord0 = self.plot_ord0.get(mtype, int(days[0]))
+        if stat == "in_range":
+            ax = self.get_pct_axes()
+            linestyle = '--'
+        else:
+            ax = self.get_axes()
+            linestyle = '-'
+        ax.plot(self.get_plot_x(days, ord0, date_axis), result,
+                label=f"{mtype} {window}d {stat}", linewidth=1,
+                linestyle=linestyle)
+        self.plot_overlays = True
+
+    def get_pct_axes(self):
+        """ Get percent (right hand) axes, creating on first use
+        """
+        if self.pct_axes is None:
+            self.pct_axes = self.get_axes().twinx()
+            self.pct_axes.set_ylim(0, 100)
+            self.pct_axes.set_ylabel("% in range")
+        return self.pct_axes
+
+    def get_ob_mask(self, mtype, vals):
+        """ Get out of bounds mask
+        :mtype: measurement type
+        :vals: array of values
+        :returns: bool array True - out of bounds
+        """
+        ms_hi = self.get_limit_high(mtype)
+        ms_low = self.get_limit_low(mtype)
+        ob = np.zeros(len(vals), dtype=bool)
+        if ms_hi is not None:
+            ob |= vals > ms_hi
+        if ms_low is not None:
+            ob |= vals < ms_low
+        return ob
+
+    def get_plot_x(self, ords, ord0, date_axis):
+        """ Get x axis values
+        :ords: date ordinals
+        :ord0: ordinal of day number 1
+        :date_axis: True -> dates, else day numbers
+        """
+        if date_axis:
+            return self.ords_to_datetime64(ords)
+        return ords - ord0 + 1
+
+    def get_axes_x(self, ords, ord0, date_axis):
+        """ Get x values in axes (plotted offset) units
+        :ords: date ordinals
+        :ord0: ordinal of day number 1
+        :date_axis: True -> dates, else day numbers
+        """
+        x = self.get_plot_x(ords, ord0, date_axis)
+        if date_axis:
+            import matplotlib.dates as mdates
+            x = mdates.date2num(x)
+        return np.asarray(x, dtype=np.float64)
+
+    def get_lod_grid(self):
+        """ Downsampling grid size - axes size in cells
+        :returns: ncolumn, nrow
+        """
+        bbox = self.get_axes().get_window_extent()
+        return (max(int(bbox.width/self.plot_lod_cell), 1),
+                max(int(bbox.height/self.plot_lod_cell), 1))
+
+    def on_plot_lim(self, ax):
+        """ Axes limits changed (zoom, pan) - rebucket visible
+        in bounds points
+        """
+        self.merge_plot_batches()
+        x_low, x_high = ax.get_xlim()
+        y_low, y_high = ax.get_ylim()
+        nx, ny = self.get_lod_grid()
+        for mtype, (x, y) in self.plot_ib_data.items():
+            collection = self.plot_artists[mtype]["ib"]
+            visible = ((x >= x_low) & (x <= x_high)
+                       & (y >= y_low) & (y <= y_high))
+            x_vis = x[visible]
+            y_vis = y[visible]
+            keep = grid_downsample(x_vis, y_vis, nx, ny,
+                                   x_low, x_high, y_low, y_high)
+            collection.set_offsets(np.column_stack([x_vis[keep], y_vis[keep]]))
         
-    def add_plots(self, mtypes=None, date_axis=False):
+    def add_plots(self, mtypes=None, date_axis=False, start=None, end=None,
+                  overlays=None, resolution=None):
         """ Add plot for mtypes
            :mtypes: type/list of types to add
+           :start: earliest date default: no limit
+           :end: latest date default: no limit
+           :overlays: list of (stat, window days) rolling overlays
+                    e.g. [("mean", 7), ("in_range", 30)] default: none
+           :resolution: "day", "week", "month" - plot aggregates,
+                    "auto" - coarsest aggregate no longer than the
+                    days per axes pixel default: measurements
         """
         if mtypes is None:
             mtypes = self.get_mtypes()
         if not isinstance(mtypes, (list,set)):
             mtypes = [mtypes]
+        self.plot_ib_data = {}      # Not left from an earlier add_plots
+        if self.plot_lod_cids is not None:
+            callbacks = self.get_axes().callbacks
+            for cid in self.plot_lod_cids:
+                callbacks.disconnect(cid)
+            self.plot_lod_cids = None
         for mtype in mtypes:
-            self.add_plot(mtype, date_axis=date_axis)
+            tier = self.get_plot_tier(mtype, resolution, start=start, end=end)
+            with meas_profile.phase(f"add_plot {mtype}"):
+                if tier is None:
+                    self.add_plot(mtype, date_axis=date_axis, start=start,
+                                  end=end)
+                else:
+                    self.add_tier_plot(mtype, tier, date_axis=date_axis,
+                                       start=start, end=end)
+            if overlays is not None:
+                for stat, window in overlays:
+                    with meas_profile.phase(f"rolling {mtype}"):
+                        self.add_rolling_plot(mtype, window, stat=stat,
+                                              date_axis=date_axis,
+                                              start=start, end=end)
+        self.plot_date_axis = date_axis
+        if self.plot_lod and self.plot_lod_cids is None:
+            callbacks = self.get_axes().callbacks
+            self.plot_lod_cids = [callbacks.connect(signal, self.on_plot_lim)
+                            for signal in ("xlim_changed", "ylim_changed")]
+        self.plot_nmeas = self.store.nmeas
+
+    def follow_plots(self):
+        """ Prepare shown plots for in place update via update_plots
+        Only measurement plots are updated, so aggregate (resolution),
+        rolling overlay and derived series plots are refused.
+        Measurement artists are animated, drawn over a saved
+        background, which is recaptured on every full draw.
+        Axes limits are fixed after this draw, see extend_plot_limits.
+        """
+        for mtype, artists in self.plot_artists.items():
+            if mtype in self.derived:
+                raise SelectError(f"Can't follow derived series plot:{mtype}")
+            if "mean" in artists:
+                raise SelectError(f"Can't follow aggregate plot:{mtype}")
+        if self.plot_overlays:
+            raise SelectError("Can't follow rolling overlay plots")
+        for artist in self.get_plot_artist_list():
+            artist.set_animated(True)
+        canvas = self.figure.canvas
+        canvas.mpl_connect("draw_event", self.on_plot_draw)
+        canvas.draw()
+        self.get_axes().set_autoscale_on(False)
+
+    def get_plot_artist_list(self):
+        """ Get list of measurement artists in plot
+        """
+        return ([artist for artists in self.plot_artists.values()
+                    for artist in artists.values()]
+                + [artist for _, _, artist in self.plot_batches])
+
+    def on_plot_draw(self, event):
+        """ Full draw done - draw measurements, save as background
+        """
+        canvas = self.figure.canvas
+        for artist in self.get_plot_artist_list():
+            self.figure.draw_artist(artist)
+        self.plot_background = canvas.copy_from_bbox(self.figure.bbox)
+
+    def update_plots(self):
+        """ Add measurements added since the last update to the plot
+        in place
+        The new points of each mtype and range class go into a scatter
+        artist of their own, which alone is drawn over the saved
+        background, and the background is then recaptured, so the cost
+        is that of the new points, not of the history.  A full draw,
+        after merging these artists into the plots' scatter artists,
+        is done only if a new mtype appears or data outgrows the axes
+        limits, which are then extended with headroom.
+        """
+        store = self.store
+        new_ords, new_codes, new_vals = store.get_added(self.plot_nmeas)
+        self.plot_nmeas = store.nmeas
+        date_axis = self.plot_date_axis
+        ax = self.get_axes()
+        full_draw = False
+        xs = []
+        ys = []
+        new_artists = []
+        for code in np.unique(new_codes).tolist():
+            mtype = store.mtype_names[code]
+            sel = new_codes == code
+            ords = new_ords[sel]
+            vals = new_vals[sel]
+            artists = self.plot_artists.get(mtype)
+            if (artists is not None and not date_axis
+                    and ords.min() < self.plot_ord0[mtype]):
+                for artist in artists.values():
+                    artist.remove()     # Day numbers shift, replot
+                self.remove_plot_batches(mtype)
+                artists = None
+            if artists is None:
+                self.add_plot(mtype, date_axis=date_axis)
+                for artist in self.plot_artists[mtype].values():
+                    artist.set_animated(True)
+                full_draw = True
+            x = self.get_axes_x(ords, self.plot_ord0[mtype], date_axis)
+            xs.append(x)
+            ys.append(vals)
+            if artists is None:
+                continue
+            
+            ob = self.get_ob_mask(mtype, vals)
+            for key, mask, marker in (("ib", ~ob, self.get_ib_marker(mtype)),
+                                      ("ob", ob, self.get_ob_marker(mtype))):
+                collection = artists.get(key)
+                if collection is None or not mask.any():
+                    continue
+                artist = ax.scatter(x[mask], vals[mask], marker=marker,
+                                    c=collection.get_facecolor(),
+                                    animated=True)
+                self.plot_batches.append((mtype, key, artist))
+                new_artists.append(artist)
+        if len(xs) > 0 and self.extend_plot_limits(np.concatenate(xs),
+                                                   np.concatenate(ys)):
+            full_draw = True
+        canvas = self.figure.canvas
+        if full_draw or self.plot_background is None:
+            self.merge_plot_batches()
+            if self.plot_lod:
+                self.on_plot_lim(ax)        # Rebucket merged points
+            canvas.draw_idle()
+            return
+        
+        if len(new_artists) == 0:
+            return
+        
+        canvas.restore_region(self.plot_background)
+        for artist in new_artists:
+            self.figure.draw_artist(artist)
+        canvas.blit(self.figure.bbox)
+        self.plot_background = canvas.copy_from_bbox(self.figure.bbox)
+        canvas.flush_events()
+
+    def merge_plot_batches(self):
+        """ Merge update_plots' points into their plots' scatter
+        artists, with one concatenate per artist, before a full draw
+        With downsampling, in bounds points are added to plot_ib_data,
+        for on_plot_lim to rebucket.
+        """
+        if len(self.plot_batches) == 0:
+            return
+        
+        batch_offsets = {}
+        for mtype, key, artist in self.plot_batches:
+            batch_offsets.setdefault((mtype, key), []).append(
+                            np.asarray(artist.get_offsets()).reshape(-1, 2))
+            artist.remove()
+        self.plot_batches = []
+        for (mtype, key), offsets_list in batch_offsets.items():
+            if key == "ib" and mtype in self.plot_ib_data:
+                offsets = np.concatenate(offsets_list)
+                ib_x, ib_y = self.plot_ib_data[mtype]
+                self.plot_ib_data[mtype] = (
+                    np.concatenate([ib_x, offsets[:, 0]]),
+                    np.concatenate([ib_y, offsets[:, 1]]))
+                continue
+            
+            collection = self.plot_artists[mtype][key]
+            offsets = np.asarray(collection.get_offsets()).reshape(-1, 2)
+            collection.set_offsets(np.concatenate([offsets] + offsets_list))
+
+    def remove_plot_batches(self, mtype):
+        """ Remove update_plots' points of mtype, which is replotted
+        :mtype: measurement type
+        """
+        batches = []
+        for batch in self.plot_batches:
+            if batch[0] == mtype:
+                batch[2].remove()
+            else:
+                batches.append(batch)
+        self.plot_batches = batches
+
+    def extend_plot_limits(self, x, y):
+        """ Extend axes limits, with headroom, to include points
+        :x, y: new point coordinates, axes units
+        :returns: True if limits changed
+        """
+        ax = self.get_axes()
+        changed = False
+        for vals, get_lim, set_lim in ((x, ax.get_xlim, ax.set_xlim),
+                                       (y, ax.get_ylim, ax.set_ylim)):
+            lim_low, lim_high = get_lim()
+            v_low, v_high = float(np.min(vals)), float(np.max(vals))
+            if v_low >= lim_low and v_high <= lim_high:
+                continue
+            headroom = max(.1*(lim_high-lim_low), 1)
+            set_lim(min(lim_low, v_low - headroom),
+                    max(lim_high, v_high + headroom))
+            changed = True
+        return changed
 
-    def show_plots(self, date_axis=False):
+    def plot_pause(self, interval):
+        """ Run plot event loop for interval, without redrawing
+        :interval: seconds
+        :returns: False if plot window has been closed
+        """
+        if self.figure is None:
+            return False
+        from matplotlib import pyplot as plt
+        if not plt.fignum_exists(self.figure.number):
+            return False
+        self.figure.canvas.start_event_loop(interval)
+        return True
+
+    def show_plots(self, date_axis=False, block=True):
         """ Show plots added via add_plots
+        :block: False -> return with plot shown e.g. for update_plots
         """
+        from matplotlib import pyplot as plt
+        self.label_plots()
+        with meas_profile.phase("show"):
+            plt.show(block=block)
+
+    def save_plots(self, file_name):
+        """ Save plots added via add_plots to file, no display
+        :file_name: output file, format from extension e.g. .png .svg .pdf
+        """
+        self.label_plots()
+        with meas_profile.phase("render"):
+            self.get_figure().savefig(file_name)
+
+    def close_plots(self):
+        """ Release plot figure
+        """
+        if self.figure is not None:
+            from matplotlib import pyplot as plt
+            plt.close(self.figure)
+            self.figure = None
+            self.pct_axes = None
+            self.plot_artists = {}
+            self.plot_ord0 = {}
+            self.plot_ib_data = {}
+            self.plot_lod_cids = None
+            self.plot_background = None
+            self.plot_batches = []
+            self.plot_overlays = False
+
+    def label_plots(self):
+        """ Add axis labels and legend
+        """
+        ax = self.get_axes()
         if self.horz_label is not None:
-            plt.xlabel(self.horz_label)
+            ax.set_xlabel(self.horz_label)
         if self.vert_label is not None:
-            plt.ylabel(self.vert_label)
-        plt.legend()    
-        plt.show()
+            ax.set_ylabel(self.vert_label)
+        handles, labels = ax.get_legend_handles_labels()
+        if self.pct_axes is not None:
+            pct_handles, pct_labels = self.pct_axes.get_legend_handles_labels()
+            handles += pct_handles
+            labels += pct_labels
+        ax.legend(handles, labels)
         
     def get_meas_dates(self, mtypes):
         """ Returns list of dates of
@@ -275,18 +1161,9 @@ class Smeasures:
         :mtype: measurement type(s) single, list
                     defalt: all types
         """
-        if mtypes is None:
-            mtypes = self.get_mtypes()
-        if not isinstance(mtypes, (list,set)):
-            mtypes = [mtypes]
-        m_type_dates = set()
-        for measurement in self.measurements:
-            for mtype in mtypes:
-                if measurement.mtype == mtype:
-                    m_type_dates.add(measurement.date)
-        dates = list(m_type_dates)
-        dates.sort()
-        return dates    
+        me_ords, _ = self.get_meas_arrays(mtypes, date_sorted=False)
+        return [date.fromordinal(ordinal)
+                for ordinal in np.unique(me_ords).tolist()]
         
     def get_meas_days(self, mtypes):
         """ Returns list of integers 1..number of days of
@@ -294,23 +1171,20 @@ class Smeasures:
         :mtype: measurement type(s) single, list
                     defalt: all types
         """
-        if mtypes is None:
-            mtypes = self.get_mtypes()
-        if not isinstance(mtypes, (list,set)):
-            mtypes = [mtypes]
-        m_type_dates = set()
-        for measurement in self.measurements:
-            for mtype in mtypes:
-                if measurement.mtype == mtype:
-                    m_type_dates.add(measurement.date)
-        dates = list(m_type_dates)
-        dates.sort()
-        day_nos = []
-        date_start = dates[0]
-        for date in dates:
-            delta = date-date_start
-            day_nos.append(delta.days+1)
-        return day_nos    
+        me_ords, _ = self.get_meas_arrays(mtypes, date_sorted=False)
+        day_ords = np.unique(me_ords)
+        if len(day_ords) == 0:
+            return []
+        return (day_ords - day_ords[0] + 1).tolist()
+
+    @staticmethod
+    def ords_to_datetime64(ords):
+        """ Convert date ordinals to numpy datetime64 array,
+        which matplotlib plots as dates
+        :ords: array of date ordinals
+        """
+        return (np.asarray(ords, dtype=np.int64)
+                - EPOCH_ORD).astype("datetime64[D]")
 
     def set_date(self, month_str=None,
                     day_str=None, year_str=None):
@@ -320,24 +1194,14 @@ class Smeasures:
         :year_str:  year string if < 20 add "2000"
         :returns: date object
         """
-        month = self.set_date_month(month_str)
-        day = int(day_str)
-        year = int(year_str)
-        if year <= 20:
-            year += 2000
-        return date(year=year, month=month, day=day)
+        return get_date(month_str=month_str, day_str=day_str,
+                        year_str=year_str)
     
     def set_date_month(self, month_str):
         """ Returns month number 1-12, guess
         :month_str: month string e.g jan, Jan, January
         """
-        import calendar
-        for n in range(1,12+1):
-            abbr = calendar.month_abbr[n]
-            if month_str[:len(abbr)].lower() == abbr.lower():
-                return n 
-        
-        return 0    
+        return get_month(month_str)
 
     def set_horz_label(self, label):
         self.horz_label = label
@@ -0,0 +1,130 @@
+#test_follow.py    18Oct2026
+""" Follow mode - MeasFollower picks up appended lines of the files
+it follows, and only those, and update_plots draws only the new
+points, matching a full redraw
+"""
+import os
+
+import matplotlib
+matplotlib.use("Agg")
+
+import numpy as np
+import pytest
+
+from select_error import SelectError
+
+from smeasures import Smeasures
+from meas_parser import MeasParser
+from meas_ingest import collect_files
+from meas_follow import MeasFollower
+from plot_attr import PlotAttr
+
+
+def write_file(file_name, lines, mode="w"):
+    with open(file_name, mode) as fout:
+        fout.writelines(line + "\n" for line in lines)
+
+
+@pytest.fixture
+def data_files(tmp_path):
+    """ Two followed files, January 2021, and an unlisted one
+    """
+    file_names = [os.path.join(tmp_path, name)
+                  for name in ("a.data", "b.data", "other.data")]
+    lines = [f"{day} Jan {90 + day} {100 + 3*day}" for day in range(1, 29)]
+    write_file(file_names[0], ["2021"] + lines[:19])
+    write_file(file_names[1], lines[19:])
+    write_file(file_names[2], ["2021", "1 Jan 500 500"])
+    return file_names
+
+
+def follow(file_names, data_pattern=None, lod=False):
+    """ Load and plot files, ready to follow
+    :returns: Smeasures, MeasFollower
+    """
+    smeas = Smeasures()
+    smeas.plot_lod = lod
+    smeas.add_plot_attr(PlotAttr("sg_m", ms_low=80, ms_high=120,
+                                 ib_marker="*", ob_marker="x"))
+    meas_parser = MeasParser()
+    meas_follower = MeasFollower(file_names, smeas, meas_parser,
+                                 data_pattern=data_pattern)
+    collect_files(file_names, smeas, meas_parser,
+                  file_years=meas_follower.file_years)
+    return smeas, meas_follower
+
+
+def test_poll(data_files):
+    smeas, meas_follower = follow(data_files[:2])
+    assert smeas.store.nmeas == 56
+    assert meas_follower.poll() == 0
+    with open(data_files[1], "a") as fout:
+        fout.write("29 Jan 95 150\n30 Ja")
+    write_file(data_files[2], ["2 Jan 501 501"], mode="a")      # Unlisted
+    write_file(os.path.join(os.path.dirname(data_files[0]), "new.data"),
+               ["3 Jan 502 502"])
+    assert meas_follower.poll() == 2
+    write_file(data_files[1], ["n 96 151"], mode="a")   # Line completed
+    write_file(data_files[0], ["night 152"], mode="a")
+    assert meas_follower.poll() == 3
+    assert smeas.get_stat("sg_m").max < 500
+    assert smeas.get_meas_dates("sg_e")[-1].isoformat() == "2021-01-30"
+
+
+def test_new_files(data_files):
+    data_dir = os.path.dirname(data_files[0])
+    data_pattern = os.path.join(data_dir, "*.data")
+    smeas, meas_follower = follow(data_files[:2], data_pattern=data_pattern)
+    write_file(os.path.join(data_dir, "new.data"), ["3 Feb 102 202"])
+    assert meas_follower.poll() == 4        # other.data and new.data
+    assert smeas.get_meas_dates("sg_m")[-1].isoformat() == "2021-02-03"
+
+
+@pytest.mark.parametrize("lod", [False, True])
+@pytest.mark.parametrize("date_axis", [False, True])
+def test_update_plots(data_files, lod, date_axis):
+    smeas, meas_follower = follow(data_files[:2], lod=lod)
+    smeas.add_plots(date_axis=date_axis)
+    smeas.show_plots(date_axis=date_axis, block=False)
+    smeas.follow_plots()
+    figure = smeas.figure
+    drawn = []
+    draw_artist = figure.draw_artist
+    figure.draw_artist = lambda artist: (drawn.append(artist),
+                                         draw_artist(artist))
+    for i in range(5):
+        write_file(data_files[1], [f"{10 + i} Jan {95 + i} {150 + i}"],
+                   mode="a")
+        assert meas_follower.poll() == 2
+        drawn.clear()
+        smeas.update_plots()
+        assert len(drawn) == 2                  # sg_m, sg_e new points
+        assert [len(artist.get_offsets()) for artist in drawn] == [1, 1]
+    assert len(smeas.plot_batches) == 10
+    blitted = np.asarray(figure.canvas.buffer_rgba()).copy()
+
+    smeas.merge_plot_batches()
+    if lod:
+        smeas.on_plot_lim(smeas.get_axes())
+    assert smeas.plot_batches == []
+    figure.canvas.draw()
+    assert np.array_equal(blitted, np.asarray(figure.canvas.buffer_rgba()))
+
+    write_file(data_files[1], ["20 Feb 300 400"], mode="a")
+    meas_follower.poll()
+    smeas.update_plots()                        # Limits extended
+    assert smeas.plot_batches == []
+    assert smeas.get_axes().get_ylim()[1] > 400
+    assert len(smeas.plot_artists["sg_m"]["ob"].get_offsets()) == 1
+    smeas.close_plots()
+
+
+@pytest.mark.parametrize("kwargs", [dict(resolution="week"),
+                                    dict(overlays=[("mean", 7)]),
+                                    dict(mtypes=["sg_m", "sg_delta"])])
+def test_follow_refused(data_files, kwargs):
+    smeas, _ = follow(data_files[:2])
+    smeas.add_plots(**kwargs)
+    with pytest.raises(SelectError):
+        smeas.follow_plots()
+    smeas.close_plots()
@@ -0,0 +1,65 @@
+#test_gen.py    18Oct2026
+""" meas_gen smoke test - generated files parse back to the
+readings written, per line form
+"""
+from collections import Counter
+
+from smeasures import Smeasures
+from meas_parser import MeasParser
+from meas_ingest import collect_files
+from meas_files import glob_data_files, open_lines
+from meas_gen import (write_data, make_data_lines, make_readings,
+                      LINE_FORMS)
+
+
+def test_write_data(tmp_path):
+    counts = Counter()
+    subject_dirs = write_data(str(tmp_path), years=2, subjects=2, readings=3,
+                              counts=counts)
+    assert len(subject_dirs) == 2
+    assert all(counts[form, "lines"] > 0 for form in LINE_FORMS)
+
+    nread = Counter()
+    nmeas = Counter()
+    for subject_dir in subject_dirs:
+        file_names = glob_data_files(subject_dir)
+        assert len(file_names) == 2
+        meas_parser = MeasParser()
+        for file_name in file_names:
+            meas_parser.start_file()
+            with open_lines(file_name) as lines:
+                for data_type, datas, month_str, _, _ in (
+                        meas_parser.parse_lines(lines)):
+                    assert data_type == "sg"
+                    form = "dd Mon" if month_str[0].isupper() else "ddmon"
+                    nread[form, "lines"] += 1
+                    for mtype, data in zip(["sg_m", "sg_e"], datas):
+                        nread[form, mtype] += data != "?"
+        smeas = Smeasures()
+        collect_files(file_names, smeas, MeasParser())
+        for mtype in smeas.get_mtypes():
+            nmeas[mtype] += smeas.get_stat(mtype).count
+
+    for form in ("dd Mon", "ddmon"):
+        for item in ("lines", "sg_m", "sg_e"):
+            assert nread[form, item] == counts[form, item]
+    for mtype in ("sg_m", "sg_e"):
+        assert nmeas[mtype] == sum(counts[form, mtype]
+                                   for form in ("dd Mon", "ddmon"))
+    # Blood pressure lines are read as dates (tests/test_parser.py)
+    for mtype in ("bp_hi", "bp_low", "pl"):
+        assert nmeas[mtype] == 0
+
+
+def test_make_data_lines():
+    lines = make_data_lines(5000)
+    assert len(lines) >= 5000
+    assert lines == make_data_lines(5000)
+    assert lines != make_data_lines(5000, seed=2)
+
+
+def test_make_readings():
+    readings = make_readings(1000)
+    assert len(readings) == 1000
+    assert len(set(mtype for _, mtype, _ in readings)) == 5
+    assert readings[-1][0] - readings[0][0] == 199
@@ -0,0 +1,43 @@
+#test_import_time.py    18Oct2026
+""" Fast-start import graph: measure_stats and the statistics
+modules never load matplotlib (or other plotting modules).
+The import time budget, bench_import.BUDGET_MS, depends on the
+machine, so it is only checked with MEAS_BENCH set in the
+environment, e.g. MEAS_BENCH=1 python -m pytest tests
+"""
+import os
+
+import pytest
+
+from bench_import import (import_times, get_plotting, get_total_ms,
+                          stats_modules, BUDGET_MS)
+
+NTRY = 3            # Import runs, first may compile .pyc files
+BENCH = bool(os.environ.get("MEAS_BENCH"))
+
+
+def check_imports(args):
+    times = import_times(args)
+    assert get_plotting(times) == []
+    if not BENCH:
+        return
+
+    best_ms = get_total_ms(times)
+    for _ in range(NTRY - 1):
+        if best_ms <= BUDGET_MS:
+            break
+        best_ms = min(best_ms, get_total_ms(import_times(args)))
+    assert best_ms <= BUDGET_MS
+
+
+def test_measure_stats_import():
+    check_imports(["-c", "import measure_stats"])
+
+
+def test_measure_stats_help():
+    check_imports(["measure_stats.py", "--help"])
+
+
+@pytest.mark.parametrize("module", stats_modules)
+def test_stats_module_import(module):
+    check_imports(["-c", f"import {module}"])
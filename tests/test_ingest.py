@@ -0,0 +1,103 @@
+#test_ingest.py    18Oct2026
+""" collect_files - parallel and cached runs match the serial run
+Files have records before their first year line, which take the
+year carried from the end of the previous file, and files with no
+year line at all.
+"""
+from datetime import date
+import os
+import random
+
+import numpy as np
+import pytest
+
+from smeasures import Smeasures
+from meas_parser import MeasParser
+from meas_ingest import collect_files
+from meas_cache import MeasCache
+from meas_gen import make_year_lines, make_drifts
+
+file_lines = [
+    ["17 Aug 1 2", "2015", "18 Aug 3 4", "Sep 3, 2015", "?/95/80"],
+    ["19 Aug 5 6", "?/96/81", "2016", "20 Aug 7 8"],
+    ["21 Aug 9 10", "Dec 31, 17", "? 11"],
+    ["1 Jan 12 13", "2 jan night 14"],          # No year line
+]
+
+
+@pytest.fixture
+def data_files(tmp_path):
+    """ Small files and generated years with the year lines removed,
+    more records than a parse block, before any year in their file
+    """
+    rand = random.Random(1)
+    drifts = make_drifts(rand)
+    lines_list = [[line + "\n" for line in lines] for lines in file_lines]
+    for year in (2018, 2019):
+        lines = make_year_lines(year, 4, rand, drifts)
+        lines_list.append([line for line in lines if line != f"{year}\n"])
+    file_names = []
+    for i, lines in enumerate(lines_list):
+        file_name = os.path.join(tmp_path, f"meas_{i:02}.data")
+        with open(file_name, "w") as fout:
+            fout.writelines(lines)
+        file_names.append(file_name)
+    return file_names
+
+
+def collect(file_names, jobs=1, cache=None):
+    """ Collect files into new Smeasures
+    :returns: (mtypes, ords, vals) in insertion order,
+            year at end, file_years
+    """
+    smeas = Smeasures()
+    meas_parser = MeasParser()
+    file_years = {}
+    collect_files(file_names, smeas, meas_parser, jobs=jobs, cache=cache,
+                  file_years=file_years)
+    store = smeas.store
+    mtypes = np.array(store.mtype_names)[store.codes]
+    return (mtypes, store.ords.copy(), store.vals.copy(),
+            meas_parser.year_str, file_years)
+
+
+def check_same(result, expected):
+    for got, want in zip(result[:3], expected[:3]):
+        assert np.array_equal(got, want)
+    assert result[3:] == expected[3:]
+
+
+def test_serial_years(data_files):
+    mtypes, ords, vals, year_str, file_years = collect(data_files[:4])
+    assert year_str == "17"
+    assert [file_years[file_name] for file_name in data_files[:4]] == \
+                ["2020", "2015", "2016", "17"]
+    years = {val: date.fromordinal(ordinal).year
+             for ordinal, val in zip(ords.tolist(), vals.tolist())}
+    assert years[1] == 2020 and years[5] == 2015 and years[81] == 2015
+    assert years[9] == 2016 and years[11] == 2017 and years[12] == 2017
+
+
+@pytest.mark.parametrize("jobs", [2, 4])
+def test_parallel_matches_serial(data_files, jobs):
+    check_same(collect(data_files, jobs=jobs), collect(data_files))
+
+
+@pytest.mark.parametrize("jobs", [1, 3])
+def test_cached_matches_serial(data_files, tmp_path, jobs):
+    serial = collect(data_files)
+    cache_dir = os.path.join(tmp_path, ".meas_cache")
+    cache = MeasCache(cache_dir)
+    check_same(collect(data_files, jobs=jobs, cache=cache), serial)
+    assert cache.nmiss == len(data_files)
+
+    cache = MeasCache(cache_dir)            # All loaded
+    check_same(collect(data_files, jobs=jobs, cache=cache), serial)
+    assert cache.nhit == len(data_files)
+
+    with open(data_files[2], "a") as fout:  # One reparsed
+        fout.write("22 Aug 15 16\n")
+    cache = MeasCache(cache_dir)
+    check_same(collect(data_files, jobs=jobs, cache=cache),
+               collect(data_files))
+    assert cache.nmiss == 1
@@ -0,0 +1,116 @@
+#test_parser.py    18Oct2026
+""" MeasParser against the original per line re.match sequence
+Each case is parsed by MeasParser and by meas_legacy's
+legacy_parse_lines, the original collect_file line handling, and
+the records must be identical; the quirks are also pinned down
+with the records expected.
+"""
+import random
+
+import pytest
+
+from select_error import SelectError
+
+from meas_parser import MeasParser
+from meas_gen import make_year_lines, make_drifts
+from meas_legacy import legacy_parse_lines
+
+
+def parse(lines, year_str="2020"):
+    return list(MeasParser(year_str=year_str).parse_lines(lines))
+
+
+def check_legacy(lines, year_str="2020"):
+    """ Parse with both, assert equal
+    :returns: records
+    """
+    records = parse(lines, year_str=year_str)
+    assert records == legacy_parse_lines(lines, year_str=year_str)
+    return records
+
+
+@pytest.mark.parametrize("lines, expected", [
+    # Comment is stripped from the last #, then only one trailing
+    # white space char: "2019 # was 2018" is not a year line but
+    # day 201 month "9"
+    (["17 Aug 110 149 # a # b"], 
+     [("sg", ["110", "149"], "Aug", "17", "2020")]),
+    (["17 Aug 110 # 149"], []),
+    (["17 Aug 110 149#x"], 
+     [("sg", ["110", "149"], "Aug", "17", "2020")]),
+    (["2019 # was 2018 #", "? 5"], 
+     [("sg", ["?", "5"], "9", "201", "2020")]),
+    (["#only", "   ", "", "# 17 Aug 1 2"], []),
+    # White space
+    (["17 Aug 110 149  \t"], 
+     [("sg", ["110", "149"], "Aug", "17", "2020")]),
+    (["   \t17aug  90   100   "], 
+     [("sg", ["90", "100"], "aug", "17", "2020")]),
+    # ? and night
+    (["17 Aug night 149", "17 Aug ? ?", "18 Aug 110 ?"],
+     [("sg", ["?", "149"], "Aug", "17", "2020"),
+      ("sg", ["?", "?"], "Aug", "17", "2020"),
+      ("sg", ["110", "?"], "Aug", "18", "2020")]),
+    # Pulse: rewritten to /, only for bp
+    (["17 Aug", "?/95 Pulse: 80", "?/95; pulse 81", "?/95pulse:82", "?/?/?",
+      "? pulse ? 90"],
+     [("bp", ["?", "95", "80"], "Aug", "17", "2020"),
+      ("bp", ["?", "95", "81"], "Aug", "17", "2020"),
+      ("bp", ["?", "95", "82"], "Aug", "17", "2020"),
+      ("bp", ["?", "?", "?"], "Aug", "17", "2020")]),
+    # Year lines and "Month d, yyyy" carry over to later lines
+    (["2019", "17 Aug 1 2", "Sep 16, 18", "17 Aug 3 4", "19", "17 Aug 5 6"],
+     [("sg", ["1", "2"], "Aug", "17", "2019"),
+      ("sg", ["3", "4"], "Aug", "17", "18"),
+      ("sg", ["5", "6"], "Aug", "17", "19")]),
+    # Leading bp digits are taken as day and month - "145/95" is
+    # day 14 month "5" - so digit led bp lines add nothing and move
+    # the date; later undated lines get that date
+    (["September 16, 2020", "145/95 pulse: 80", "46/96/85", "? 149",
+      "?/95/80"],
+     [("sg", ["?", "149"], "6", "4", "2020"),
+      ("bp", ["?", "95", "80"], "6", "4", "2020")]),
+])
+def test_cases(lines, expected):
+    assert check_legacy(lines) == expected
+
+
+def test_newlines():
+    lines = ["2019\n", "17 Aug 110 149   # note\n", "\n", "18 Aug ? 150\n"]
+    assert check_legacy(lines) == check_legacy([line.rstrip("\n")
+                                                for line in lines])
+
+
+def test_year_carried_between_files():
+    meas_parser = MeasParser()
+    file1 = ["17 Aug 1 2", "2018", "18 Aug 3 4"]
+    file2 = ["19 Aug 5 6"]
+    records = list(meas_parser.parse_lines(file1))
+    meas_parser.start_file()
+    records += list(meas_parser.parse_lines(file2))
+    assert records == (legacy_parse_lines(file1)
+                       + legacy_parse_lines(file2, year_str="2018"))
+    assert [record[4] for record in records] == ["2020", "2018", "2018"]
+
+
+def test_day_month_reset_between_files():
+    meas_parser = MeasParser()
+    list(meas_parser.parse_lines(["17 Aug 1 2"]))
+    meas_parser.start_file()
+    with pytest.raises(SelectError):
+        list(meas_parser.parse_lines(["? 5"]))     # data before date
+
+
+def test_resume_appended_lines():
+    lines = ["2019", "17 Aug 1 2", "? 3", "18 Aug 4 5", "?/6/7"]
+    meas_parser = MeasParser()
+    records = list(meas_parser.parse_lines(lines[:2]))
+    records += list(meas_parser.parse_lines(lines[2:]))
+    assert records == check_legacy(lines)
+
+
+@pytest.mark.parametrize("seed", [1, 2, 3])
+def test_generated_year(seed):
+    rand = random.Random(seed)
+    lines = make_year_lines(2016, 3, rand, make_drifts(rand))
+    assert len(check_legacy(lines)) > 0
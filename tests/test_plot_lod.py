@@ -0,0 +1,46 @@
+#test_plot_lod.py    18Oct2026
+""" Downsampled plots - zooming rebuckets the in bounds points of
+the latest add_plots only, after re-plotting at another resolution
+"""
+import matplotlib
+matplotlib.use("Agg")
+
+import pytest
+
+from smeasures import Smeasures
+from meas_gen import make_readings
+
+
+@pytest.fixture
+def smeas():
+    smeas = Smeasures()
+    smeas.add_std_plot_attrs()
+    for ordinal, mtype, value in make_readings(3000):
+        smeas.store.append(ordinal, mtype, value)
+    yield smeas
+    smeas.close_plots()
+
+
+def zoom(smeas):
+    """ Zoom in on the middle of the x axis
+    :returns: number of in bounds points shown, per mtype
+    """
+    ax = smeas.get_axes()
+    x_low, x_high = ax.get_xlim()
+    third = (x_high - x_low)/3
+    ax.set_xlim(x_low + third, x_high - third)
+    return {mtype: len(artists["ib"].get_offsets())
+            for mtype, artists in smeas.plot_artists.items()
+            if "ib" in artists}
+
+
+def test_replot_resolution(smeas):
+    smeas.add_plots(mtypes=["sg_m"])
+    assert set(smeas.plot_ib_data) == {"sg_m"}
+    assert zoom(smeas)["sg_m"] > 0
+    smeas.add_plots(mtypes=["sg_m"], resolution="week")
+    assert smeas.plot_ib_data == {}
+    zoom(smeas)                         # Tier plot left alone
+    assert len(smeas.plot_lod_cids) == 2
+    assert len(smeas.get_axes().callbacks.callbacks["xlim_changed"]) == 1
+
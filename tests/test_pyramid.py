@@ -0,0 +1,206 @@
+#test_pyramid.py    18Oct2026
+""" MeasPyramid aggregates against brute force over the raw
+measurements, through MeasStore and MeasSqliteStore, and their
+invalidation as measurements and limits change
+"""
+from datetime import date
+import math
+import os
+
+import numpy as np
+import pytest
+
+from meas_store import MeasStore
+from meas_sqlite import MeasSqliteStore
+from meas_pyramid import TIERS
+from meas_gen import make_readings
+
+LIMITS = {"sg_m": (80, 130), "bp_hi": (None, 140)}
+
+
+def make_store(store_cls, readings, limits=LIMITS):
+    """ Store with limits, first half of readings added one at a time,
+    second half as a block
+    """
+    store = MeasStore() if store_cls is MeasStore else MeasSqliteStore(
+                                                                ":memory:")
+    for mtype, (low, high) in limits.items():
+        store.set_limits(mtype, low, high)
+    add_readings(store, readings)
+    return store
+
+
+def add_readings(store, readings):
+    half = len(readings)//2
+    for ordinal, mtype, value in readings[:half]:
+        store.append(ordinal, mtype, value)
+    mtype_names = sorted(set(mtype for _, mtype, _ in readings))
+    block = readings[half:]
+    store.extend_mapped(mtype_names,
+                        np.array([reading[0] for reading in block]),
+                        np.array([mtype_names.index(reading[1])
+                                  for reading in block]),
+                        np.array([reading[2] for reading in block]))
+
+
+def get_bucket(tier, ordinal):
+    day = date.fromordinal(ordinal)
+    if tier == "day":
+        return ordinal
+    if tier == "week":
+        return ordinal - day.weekday()
+    return day.replace(day=1).toordinal()
+
+
+def is_in(value, limits):
+    low, high = limits
+    return (low is None or value >= low) and (high is None or value <= high)
+
+
+def brute_tier(readings, mtype, tier, limits):
+    """ (buckets, counts, lows, highs, means, in range percents) """
+    buckets = {}
+    for ordinal, rmtype, value in readings:
+        if rmtype == mtype:
+            buckets.setdefault(get_bucket(tier, ordinal), []).append(value)
+    keys = sorted(buckets)
+    limits = limits.get(mtype, (None, None))
+    in_range = [sum(is_in(value, limits) for value in buckets[key])
+                *100./len(buckets[key]) if limits != (None, None) else np.nan
+                for key in keys]
+    return (keys, [len(buckets[key]) for key in keys],
+            [min(buckets[key]) for key in keys],
+            [max(buckets[key]) for key in keys],
+            [sum(buckets[key])/len(buckets[key]) for key in keys], in_range)
+
+
+def check_tiers(store, readings, limits=LIMITS):
+    for mtype in sorted(store.get_mtypes()):
+        for tier in TIERS:
+            got = store.get_tier(mtype, tier)
+            want = brute_tier(readings, mtype, tier, limits)
+            for got_col, want_col in zip(got[:4], want[:4]):
+                assert got_col.tolist() == want_col
+            np.testing.assert_allclose(got[4], want[4])
+            np.testing.assert_allclose(got[5], want[5])
+
+
+def check_summary(store, readings, mtype, start, end, limits=LIMITS):
+    summary = store.get_summary(mtype, start=start, end=end)
+    vals = [value for ordinal, rmtype, value in readings
+            if rmtype == mtype and (start is None or ordinal >= start)
+            and (end is None or ordinal <= end)]
+    assert summary.count == len(vals)
+    assert summary.min == min(vals) and summary.max == max(vals)
+    assert summary.mean == pytest.approx(sum(vals)/len(vals))
+    mean = sum(vals)/len(vals)
+    assert summary.stdev == pytest.approx(math.sqrt(
+                sum((value - mean)**2 for value in vals)/(len(vals) - 1)))
+    mtype_limits = limits.get(mtype, (None, None))
+    if mtype_limits == (None, None):
+        assert summary.in_range is None
+    else:
+        assert summary.in_range == pytest.approx(
+            sum(is_in(value, mtype_limits) for value in vals)*100./len(vals))
+
+
+@pytest.fixture
+def readings():
+    return make_readings(3000)          # 600 days, 5 mtypes
+
+
+RANGES = [(None, None),
+          (date(2015, 2, 14).toordinal(), date(2015, 11, 3).toordinal()),
+          (date(2015, 3, 1).toordinal(), date(2015, 6, 30).toordinal()),
+          (date(2015, 5, 5).toordinal(), date(2015, 5, 20).toordinal()),
+          (date(2016, 1, 31).toordinal(), None),
+          (None, date(2015, 1, 31).toordinal())]
+
+
+@pytest.mark.parametrize("store_cls", [MeasStore, MeasSqliteStore])
+def test_tiers(store_cls, readings):
+    check_tiers(make_store(store_cls, readings), readings)
+
+
+@pytest.mark.parametrize("store_cls", [MeasStore, MeasSqliteStore])
+@pytest.mark.parametrize("start, end", RANGES)
+def test_summary(store_cls, readings, start, end):
+    store = make_store(store_cls, readings)
+    for mtype in ("sg_m", "sg_e", "bp_hi"):
+        check_summary(store, readings, mtype, start, end)
+
+
+def test_tier_range(readings):
+    store = make_store(MeasStore, readings)
+    start, end = RANGES[1]
+    buckets = store.get_tier("sg_m", "month", start=start, end=end)[0]
+    assert buckets[0] == date(2015, 2, 1).toordinal()   # Overlapping start
+    assert buckets[-1] == date(2015, 11, 1).toordinal()
+
+
+@pytest.mark.parametrize("store_cls", [MeasStore, MeasSqliteStore])
+def test_added_after_query(store_cls, readings):
+    store = make_store(store_cls, readings[:1000])
+    check_tiers(store, readings[:1000])
+    add_readings(store, readings[1000:])
+    check_tiers(store, readings)
+    check_summary(store, readings, "sg_m", *RANGES[1])
+
+
+@pytest.mark.parametrize("store_cls", [MeasStore, MeasSqliteStore])
+def test_limits_changed_after_query(store_cls, readings):
+    store = make_store(store_cls, readings)
+    check_tiers(store, readings)
+    limits = dict(LIMITS, sg_m=(100, 120), sg_e=(None, 150))
+    for mtype, (low, high) in limits.items():
+        store.set_limits(mtype, low, high)
+    check_tiers(store, readings, limits=limits)
+    check_summary(store, readings, "sg_e", *RANGES[1], limits=limits)
+
+
+def test_saved_aggregates(readings, tmp_path):
+    db_file = os.path.join(tmp_path, "meas.db")
+    store = MeasSqliteStore(db_file)
+    for mtype, (low, high) in LIMITS.items():
+        store.set_limits(mtype, low, high)
+    store.set_file(None)
+    add_readings(store, readings[:2000])
+    check_tiers(store, readings[:2000])
+    store.close()                       # Aggregates saved
+
+    store = MeasSqliteStore(db_file)
+    for mtype, (low, high) in LIMITS.items():
+        store.set_limits(mtype, low, high)
+    check_tiers(store, readings[:2000])
+    assert not store.pyramid.changed    # Loaded, not rebuilt
+    add_readings(store, readings[2000:])
+    check_tiers(store, readings)
+    store.close()
+
+    store = MeasSqliteStore(db_file)    # Other limits - rebuilt
+    check_tiers(store, readings, limits={})
+    store.close()
+
+
+def test_rows_replaced(readings, tmp_path):
+    """ Measurements dropped on resume and replaced by as many others
+    """
+    db_file = os.path.join(tmp_path, "meas.db")
+    store = MeasSqliteStore(db_file)
+    add_readings(store, readings)       # Not from a data file
+    check_summary(store, readings, "sg_m", *RANGES[1], limits={})
+    store.close()
+
+    store = MeasSqliteStore(db_file)
+    assert store.get_resume([]) == (0, None)
+    assert store.nmeas == 0
+    replaced = [(ordinal, mtype, value + 7)
+                for ordinal, mtype, value in readings]
+    add_readings(store, replaced)
+    check_summary(store, replaced, "sg_m", *RANGES[1], limits={})
+    store.close()
+
+    store = MeasSqliteStore(db_file)
+    check_tiers(store, replaced, limits={})
+    check_summary(store, replaced, "sg_m", *RANGES[1], limits={})
+    store.close()
@@ -0,0 +1,87 @@
+#test_server.py    18Oct2026
+""" MeasServer - accepted and rejected lines, per connection date
+state and concurrent clients, on a local port
+"""
+import asyncio
+from datetime import date
+import os
+
+from smeasures import Smeasures
+from meas_server import MeasServer, send_lines
+
+
+def serve_lines(data_dir, *clients):
+    """ Start a server, send each client's lines on its own
+    connection, concurrently, stop the server
+    :clients: lists of lines
+    :returns: (list of responses per client, MeasServer)
+    """
+    async def run():
+        meas_server = MeasServer(data_dir, meas=Smeasures(),
+                                 year_str="2021")
+        port = await meas_server.start(port=0)
+        try:
+            responses = await asyncio.gather(
+                *[send_lines(lines, port=port) for lines in clients])
+        finally:
+            await meas_server.stop()
+        return responses, meas_server
+
+    return asyncio.run(run())
+
+
+def read_file(data_dir, name):
+    with open(os.path.join(data_dir, name)) as finp:
+        return finp.read().splitlines()
+
+
+def test_accepted(tmp_path):
+    data_dir = str(tmp_path)
+    (responses,), meas_server = serve_lines(data_dir,
+                        ["26 July 109 231", "night 140", "# note", "hello",
+                         "?/95/80"])
+    assert responses == ["ok 2", "ok 1", "ok 0", "error not a date or"
+                         " measurement line: hello", "ok 2"]
+    assert read_file(data_dir, "meas_2021_07.data") == [
+                    "July 26, 2021", "26 July 109 231", "night 140",
+                    "?/95/80"]
+    smeas = meas_server.meas
+    assert smeas.get_meas_dates("sg_e") == [date(2021, 7, 26)]
+    assert smeas.get_stat("sg_e").mean == (231 + 140)/2
+    assert smeas.get_stat("bp_low").count == 1
+    assert meas_server.nline == 3 and meas_server.nerror == 1
+
+
+def test_bad_date_rejected(tmp_path):
+    data_dir = str(tmp_path)
+    (responses,), meas_server = serve_lines(data_dir,
+                        ["Sep 31, 2021", "? 5", "Sep 30, 2021", "31 feb 1 2",
+                         "? 6", "2020", "? 7"])
+    assert responses[0] == "error day is out of range for month"
+    assert responses[1].startswith("error")     # No date yet
+    assert responses[2:] == ["ok 0", "error day is out of range for month",
+                             "ok 1", "ok 0", "ok 1"]
+    assert read_file(data_dir, "meas_2021_09.data") == [
+                    "September 30, 2021", "? 6"]
+    assert read_file(data_dir, "meas_2020_09.data") == [
+                    "September 30, 2020", "? 7"]
+    assert meas_server.nerror == 3
+
+
+def test_concurrent_clients(tmp_path):
+    data_dir = str(tmp_path)
+    client1 = ["2020", "1 Mar 100 110"] + [f"? {200 + i}" for i in range(50)]
+    client2 = ["1 Mar 120 130"] + [f"? {300 + i}" for i in range(50)]
+    responses, meas_server = serve_lines(data_dir, client1, client2)
+    assert responses[0] == ["ok 0", "ok 2"] + ["ok 1"]*50
+    assert responses[1] == ["ok 2"] + ["ok 1"]*50
+    lines_2020 = read_file(data_dir, "meas_2020_03.data")
+    lines_2021 = read_file(data_dir, "meas_2021_03.data")
+    assert [line for line in lines_2020 if not line.startswith("March")] \
+        == client1[1:]                  # Each client's year kept
+    assert [line for line in lines_2021 if not line.startswith("March")] \
+        == client2
+    smeas = meas_server.meas
+    assert smeas.get_stat("sg_e").count == 102
+    assert smeas.get_stat("sg_m").count == 2
+    assert smeas.get_meas_dates("sg_e")[-1] == date(2021, 3, 1)
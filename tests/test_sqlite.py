@@ -0,0 +1,149 @@
+#test_sqlite.py    18Oct2026
+""" MeasSqliteStore - a reloaded database matches an in memory
+ingest, and resume after editing a file replaces only the rows
+from that file on
+"""
+from datetime import date
+import os
+import random
+
+import pytest
+
+from smeasures import Smeasures
+from meas_parser import MeasParser
+from meas_ingest import collect_files
+from meas_sqlite import MeasSqliteStore
+from meas_gen import make_year_lines, make_drifts
+
+
+@pytest.fixture
+def data_files(tmp_path):
+    """ Two generated years and a small last file
+    """
+    rand = random.Random(1)
+    drifts = make_drifts(rand)
+    lines_list = [make_year_lines(year, 2, rand, drifts)
+                  for year in (2018, 2019)]
+    lines_list.append(["2020\n", "1 Jan 100 110\n", "2 Jan 120 130\n"])
+    file_names = []
+    for i, lines in enumerate(lines_list):
+        file_name = os.path.join(tmp_path, f"meas_{i:02}.data")
+        with open(file_name, "w") as fout:
+            fout.writelines(lines)
+        file_names.append(file_name)
+    return file_names
+
+
+def load(file_names, db_file=None):
+    """ Collect files into new Smeasures, with standard limits
+    :db_file: database file default: in memory store
+    """
+    store = None if db_file is None else MeasSqliteStore(db_file)
+    smeas = Smeasures(store=store)
+    smeas.add_std_plot_attrs()
+    collect_files(file_names, smeas, MeasParser())
+    return smeas
+
+
+def get_results(smeas):
+    """ Statistics, summaries and columns of each mtype
+    """
+    results = {}
+    for mtype in sorted(smeas.get_mtypes()):
+        stat = smeas.get_stat(mtype)
+        summary = smeas.get_summary(mtype, start=date(2019, 3, 10))
+        meas_range = smeas.store.get_range(mtype)
+        ords, vals, classes = smeas.get_range_columns(mtype)
+        results[mtype] = ((stat.count, stat.min, stat.max, stat.sum,
+                           stat.sumsq),
+                          (summary.count, summary.min, summary.max,
+                           summary.mean, summary.in_range),
+                          (meas_range.nlow, meas_range.nhigh,
+                           meas_range.longest),
+                          ords.tolist(), vals.tolist(), classes.tolist())
+    return results, smeas.get_nday()
+
+
+def rewrite(file_name, old, new):
+    """ Replace text in file, same size, newer modification time
+    """
+    with open(file_name) as finp:
+        text = finp.read()
+    assert old in text and len(old) == len(new)
+    with open(file_name, "w") as fout:
+        fout.write(text.replace(old, new))
+    st = os.stat(file_name)
+    os.utime(file_name, ns=(st.st_atime_ns, st.st_mtime_ns + 10**9))
+
+
+def get_file_rows(db_file):
+    """ (id, file, date, code, value) rows of the database
+    """
+    store = MeasSqliteStore(db_file)
+    rows = store.conn.execute(
+        "SELECT id, file, date, code, value FROM meas ORDER BY id").fetchall()
+    store.close()
+    return rows
+
+
+def test_reload_matches_memory(data_files, tmp_path):
+    db_file = os.path.join(tmp_path, "meas.db")
+    expected = get_results(load(data_files))
+    smeas = load(data_files, db_file)
+    assert get_results(smeas) == expected
+    smeas.close()
+
+    smeas = Smeasures(store=MeasSqliteStore(db_file))     # Reload only
+    smeas.add_std_plot_attrs()
+    assert get_results(smeas) == expected
+    smeas.close()
+
+    smeas = load(data_files, db_file)       # Resume, nothing to load
+    assert get_results(smeas) == expected
+    smeas.close()
+
+
+def test_values_kept(tmp_path):
+    db_file = os.path.join(tmp_path, "meas.db")
+    smeas = Smeasures(store=MeasSqliteStore(db_file))
+    smeas.add_columns("sg", [date(2021, 1, 1).toordinal()],
+                      [["5000000000", "7"]])
+    smeas.close()
+    store = MeasSqliteStore(db_file)
+    assert store.vals.tolist() == [5000000000, 7]
+    assert store.vals.dtype == MeasSqliteStore.VAL_DTYPE
+    store.close()
+
+
+@pytest.mark.parametrize("ifile", [1, 2])
+def test_resume_after_edit(data_files, tmp_path, ifile):
+    db_file = os.path.join(tmp_path, "meas.db")
+    smeas = load(data_files, db_file)
+    get_results(smeas)                      # Aggregates saved on close
+    smeas.close()
+    rows = get_file_rows(db_file)
+
+    if ifile == 2:
+        rewrite(data_files[2], "1 Jan 100 110", "1 Jan 200 210")
+    else:
+        rewrite(data_files[1], "2019\n", "2019\n")     # Touched only
+    expected = get_results(load(data_files))
+    smeas = load(data_files, db_file)
+    assert get_results(smeas) == expected
+    smeas.close()
+
+    new_rows = get_file_rows(db_file)
+    assert len(new_rows) == len(rows)
+    first_seq = sorted(set(row[1] for row in rows))[ifile]
+    kept = [row for row in rows if row[1] < first_seq]
+    assert len(kept) > 0
+    assert new_rows[:len(kept)] == kept     # Earlier files untouched
+    if ifile == 2:
+        assert [row[4] for row in new_rows[-4:]] == [200, 210, 120, 130]
+    else:
+        assert new_rows == rows             # Reparsed the same
+
+    smeas = Smeasures(store=MeasSqliteStore(db_file))     # Saved again
+    smeas.add_std_plot_attrs()
+    assert get_results(smeas) == expected
+    smeas.close()
@@ -0,0 +1,94 @@
+#test_stream.py    18Oct2026
+""" Streaming pipeline - MeasStatsStore statistics match MeasStore's
+for the same files, and queries needing measurements are refused
+"""
+from datetime import date
+import os
+import random
+
+import pytest
+
+from select_error import SelectError
+
+from smeasures import Smeasures
+from meas_parser import MeasParser
+from meas_ingest import collect_files
+from meas_stream import MeasStatsStore, read_files, select, dedupe
+from meas_gen import make_year_lines, make_drifts
+
+
+@pytest.fixture
+def data_files(tmp_path):
+    rand = random.Random(2)
+    drifts = make_drifts(rand)
+    file_names = []
+    for year in (2018, 2019, 2020):
+        file_name = os.path.join(tmp_path, f"meas_{year}.data")
+        with open(file_name, "w") as fout:
+            fout.writelines(make_year_lines(year, 3, rand, drifts))
+        file_names.append(file_name)
+    return file_names
+
+
+def get_results(smeas):
+    """ Statistics, out of range counts and summaries of each mtype
+    """
+    results = {}
+    for mtype in sorted(smeas.get_mtypes()):
+        stat = smeas.get_stat(mtype)
+        meas_range = smeas.store.get_range(mtype)
+        summary = smeas.get_summary(mtype, start=date(2019, 2, 11))
+        week_tier = smeas.get_tier(mtype, "week")
+        results[mtype] = ((stat.count, stat.min, stat.max, stat.sum,
+                           stat.sumsq, stat.percentile(50)),
+                          (meas_range.nlow, meas_range.nhigh,
+                           meas_range.longest, meas_range.longest_start),
+                          (summary.count, summary.mean, summary.in_range),
+                          [column.tolist() for column in week_tier])
+    return results, smeas.get_nday()
+
+
+def stream(file_names, **kwargs):
+    smeas = Smeasures(store=MeasStatsStore())
+    smeas.add_std_plot_attrs()
+    smeas.add_records(select(read_files(file_names), **kwargs))
+    return smeas
+
+
+def test_stats_match_store(data_files):
+    smeas = Smeasures()
+    smeas.add_std_plot_attrs()
+    collect_files(data_files, smeas, MeasParser())
+    expected = get_results(smeas)
+    assert get_results(stream(data_files)) == expected
+
+
+def test_select_dedupe(data_files):
+    start = date(2019, 5, 1)
+    smeas = Smeasures()
+    smeas.add_std_plot_attrs()
+    collect_files(data_files[1:], smeas, MeasParser(year_str="2019"))
+    ords, _, vals = smeas.store.get_columns(["sg_m"], start=start.toordinal())
+
+    stats_smeas = Smeasures(store=MeasStatsStore())
+    stats_smeas.add_records(dedupe(select(
+                    read_files(data_files + data_files[1:]),   # repeated
+                    mtypes=["sg_m"], start=start)))
+    stat = stats_smeas.get_stat("sg_m")
+    assert stats_smeas.get_mtypes() == {"sg_m"}
+    assert (stat.count, stat.sum) == (len(vals), int(vals.sum()))
+    assert stats_smeas.get_nday() == len(set(ords.tolist()))
+
+
+def test_unsupported(data_files, tmp_path):
+    smeas = stream(data_files[:1])
+    with pytest.raises(SelectError):
+        smeas.export_archive(os.path.join(tmp_path, "meas.arc"))
+    assert not os.path.exists(os.path.join(tmp_path, "meas.arc"))
+    for name in ("ords", "codes", "vals", "classes"):
+        with pytest.raises(SelectError):
+            getattr(smeas.store, name)
+    with pytest.raises(SelectError):
+        smeas.get_range_columns("sg_m")
+    with pytest.raises(SelectError):
+        smeas.store.set_limits("sg_m", 1, 2)    # After its measurements
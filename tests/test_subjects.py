@@ -0,0 +1,88 @@
+#test_subjects.py    18Oct2026
+""" MeasSubjects - subject discovery, manifest and --who choice,
+including the original "dad" default and jenifer layout
+"""
+import os
+
+import pytest
+
+from select_error import SelectError
+
+from meas_subjects import MeasSubjects, DEFAULT_SUBJECT
+
+
+def write_file(file_name, text="2019\n17 Aug 1 2\n"):
+    os.makedirs(os.path.dirname(file_name), exist_ok=True)
+    with open(file_name, "w") as fout:
+        fout.write(text)
+
+
+@pytest.fixture
+def data_dir(tmp_path):
+    """ Original layout: own files, jen/bp_*.data, plus a subject
+    """
+    data_dir = str(tmp_path)
+    write_file(os.path.join(data_dir, "sugar_01.data"))
+    for name in ("bp_1", "bp_2", "bp_3"):
+        write_file(os.path.join(data_dir, "jen", name + ".data"))
+    write_file(os.path.join(data_dir, "mom", "meas_2019.data"))
+    return data_dir
+
+
+def test_default_is_own_files(data_dir):
+    meas_subjects = MeasSubjects(data_dir)
+    for who in (None, DEFAULT_SUBJECT):
+        subject = meas_subjects.find(who)
+        assert meas_subjects.get_dir(subject) == data_dir
+        assert meas_subjects.get_files(subject) == [
+                                os.path.join(data_dir, "sugar_01.data")]
+
+
+@pytest.mark.parametrize("who", ["jenifer", "jen", "J"])
+def test_jenifer(data_dir, who):
+    meas_subjects = MeasSubjects(data_dir)
+    subject = meas_subjects.find(who)
+    assert subject == "jenifer"
+    assert [os.path.basename(file_name) for file_name in
+            meas_subjects.get_files(subject)] == ["bp_1.data", "bp_2.data"]
+
+
+def test_subjects(data_dir):
+    meas_subjects = MeasSubjects(data_dir)
+    assert sorted(meas_subjects.get_subjects()) == sorted(
+                    ["jenifer", "mom", os.path.basename(data_dir)])
+    assert meas_subjects.find("mo") == "mom"
+    with pytest.raises(SelectError):
+        meas_subjects.find("x")
+
+
+def test_default_without_own_files(tmp_path):
+    data_dir = str(tmp_path)
+    write_file(os.path.join(data_dir, "a", "meas.data"))
+    assert MeasSubjects(data_dir).find() == "a"     # Only subject
+
+    write_file(os.path.join(data_dir, "b", "meas.data"))
+    meas_subjects = MeasSubjects(data_dir)
+    subject = meas_subjects.find()
+    assert meas_subjects.get_dir(subject) == data_dir
+    assert meas_subjects.get_files(subject) == []
+
+
+def test_manifest_files(data_dir):
+    with open(os.path.join(data_dir, "subjects.txt"), "w") as fout:
+        fout.write("jen  jen  bp_3.data bp_1.data   # chosen files\n"
+                   "mom  mom\n")
+    meas_subjects = MeasSubjects(data_dir)
+    assert meas_subjects.get_subjects() == ["jen", "mom"]
+    assert [os.path.basename(file_name) for file_name in
+            meas_subjects.get_files("jen")] == ["bp_3.data", "bp_1.data"]
+    summaries = meas_subjects.summarize(jobs=2)
+    assert [summary.subject for summary in summaries] == ["jen", "mom"]
+    assert summaries[0].stats[0].count == 2
+
+
+def test_listed_file_missing(data_dir):
+    os.remove(os.path.join(data_dir, "jen", "bp_2.data"))
+    meas_subjects = MeasSubjects(data_dir)
+    with pytest.raises(SelectError):
+        meas_subjects.get_files("jenifer")